@@ -0,0 +1,39 @@
+"""
+Benchmark: per-row generation loop vs. generate_batch
+
+Usage: python benchmarks/bench_batch.py [count]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import BATCH_GENERATORS, generate_batch, generate_by_type, np
+
+
+def best_of(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    if np is None:
+        print("numpy is not installed; generate_batch falls back to the per-row loop")
+        return
+
+    print(f"{'type':<14}{'per-row (s)':>14}{'batch (s)':>12}{'speedup':>10}")
+    for type_id in BATCH_GENERATORS:
+        per_row = best_of(lambda: [generate_by_type(type_id, {}) for _ in range(count)])
+        batch = best_of(lambda: generate_batch(type_id, count, {}))
+        print(f"{type_id:<14}{per_row:>14.3f}{batch:>12.3f}{per_row / batch:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
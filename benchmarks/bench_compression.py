@@ -0,0 +1,57 @@
+"""
+Benchmark: bytes on the wire vs. CPU for /api/generate response compression
+
+For each type, encodes count generated values as the JSON array /api/generate
+sends, then compresses it with each coding and level: once as a whole
+(buffered responses) and chunk by chunk with a flush per chunk (streamed
+responses). Reports the compressed size as a percentage of the raw JSON and
+the compression throughput.
+
+Usage: python benchmarks/bench_compression.py [count] [type ...]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import compression
+from main import DATA_TYPES, GeneratorSpec, STREAM_CHUNK_SIZE, generate_json_array, iter_value_chunks, ndjson_lines
+
+LEVELS = {"gzip": (1, 6, 9), "zstd": (1, 3, 10)}
+
+
+def best_of(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    types = sys.argv[2:] or [t["type"] for t in DATA_TYPES]
+    codecs = [(coding, level) for coding in compression.CODINGS for level in LEVELS[coding]]
+    if "zstd" not in compression.CODINGS:
+        print("zstandard is not installed; only gzip is measured\n")
+
+    print(f"{'type':<14}{'raw MB':>8}{'codec':>9}{'buffered':>10}{'MB/s':>8}{'streamed':>10}{'MB/s':>8}")
+    for type_id in types:
+        spec = GeneratorSpec(type_id, {}, seed=1)
+        body = generate_json_array(spec, 0, count)[0]
+        lines = list(ndjson_lines(iter_value_chunks(spec, 0, count, STREAM_CHUNK_SIZE)))
+        raw_stream = sum(map(len, lines))
+        for coding, level in codecs:
+            buffered, packed = best_of(lambda: compression.compress(body, coding, level))
+            streamed, pieces = best_of(lambda: list(compression.compress_stream(lines, coding, level)))
+            print(f"{type_id:<14}{len(body) / 1e6:>8.2f}{f'{coding}-{level}':>9}"
+                  f"{len(packed) / len(body):>10.1%}{len(body) / buffered / 1e6:>8.0f}"
+                  f"{sum(map(len, pieces)) / raw_stream:>10.1%}{raw_stream / streamed / 1e6:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
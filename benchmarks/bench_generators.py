@@ -0,0 +1,169 @@
+"""
+Benchmark: every generator in DATA_TYPES, with regression checks
+
+Each type is timed with its default options and with each option varied one
+at a time (the first few select/radio values, each checkbox flipped, the
+number range ends), at several batch sizes. Values are generated through
+resolve_request and bind_generator exactly as the API does, so batch sizes
+from BATCH_THRESHOLD up take the NumPy path. For every case the suite
+reports values/sec (best of several runs) and peak traced bytes per value.
+
+Baselines are machine-specific: record one with --save, then later runs
+compare against it and exit with status 1 if any case got slower, or uses
+more memory per value, by more than --threshold. Timings on busy or shared
+machines can swing by 20-30% between runs; raise --threshold there.
+
+Usage: python benchmarks/bench_generators.py [--sizes 10,1000,20000]
+           [--types uuid,email] [--baseline FILE] [--save] [--threshold 0.2]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+
+from main import DATA_TYPES, GenerateRequest, bind_generator, resolve_request
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_generators.json")
+
+# Non-default values tried per select option (country lists have ~50)
+MAX_SELECT_VALUES = 4
+
+# Sample values for free-text options
+TEXT_SAMPLES = {
+    "prefix": "user_",
+    "starts_with": "Ma",
+    "ends_with": "n",
+    "domain": "acme",
+    "extension": "io",
+}
+
+
+def option_cases(data_type):
+    """Default options first, then each option varied on its own"""
+    cases = [{}]
+    for option in data_type["options"]:
+        key, kind = option["key"], option["type"]
+        if kind in ("select", "radio"):
+            values = [value for value, _ in option["values"] if value != option.get("default")]
+            cases += [{key: value} for value in values[:MAX_SELECT_VALUES]]
+        elif kind == "checkbox":
+            cases.append({key: not option.get("default", False)})
+        elif kind == "number":
+            cases += [{key: option[end]} for end in ("min", "max") if end in option and option[end] != option.get("default")]
+        elif kind == "text" and key in TEXT_SAMPLES:
+            cases.append({key: TEXT_SAMPLES[key]})
+    if data_type["supports_prefix_suffix"]:
+        cases.append({"prefix": "ab12", "suffix": "cd34"})
+    return cases
+
+
+def case_name(type_id, options, size):
+    opts = ",".join(f"{k}={v}" for k, v in options.items())
+    return f"{type_id}[{opts}]@{size}"
+
+
+def measure(type_id, options, size, min_time=0.5, repeat=5):
+    """(values/sec, peak bytes/value) for generating size values"""
+    spec = resolve_request(GenerateRequest(type=type_id, **options))
+    run = lambda: bind_generator(*spec)(size)
+    run()  # warm caches outside the timed runs
+
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / repeat:
+            break
+        loops *= 2
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    values = run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del values
+    return loops * size / best, (peak - base) / size
+
+
+def compare(name, result, baseline, threshold):
+    """Regression messages for one case, if it is in the baseline"""
+    old = baseline.get(name)
+    if old is None:
+        return []
+    problems = []
+    if result["values_per_sec"] < old["values_per_sec"] * (1 - threshold):
+        problems.append(f"{name}: {result['values_per_sec']:,.0f} values/s, baseline {old['values_per_sec']:,.0f}")
+    if result["bytes_per_value"] > old["bytes_per_value"] * (1 + threshold) + 8:
+        problems.append(f"{name}: {result['bytes_per_value']:,.0f} B/value, baseline {old['bytes_per_value']:,.0f}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10,1000,20000", help="comma-separated batch sizes")
+    parser.add_argument("--types", help="comma-separated types (default: all of DATA_TYPES)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown / growth, as a fraction")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    types = set(args.types.split(",")) if args.types else None
+    baseline = {}
+    if not args.save and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["cases"]
+
+    results = {}
+    problems = []
+    print(f"{'case':<60}{'values/s':>14}{'B/value':>10}{'vs base':>10}")
+    for data_type in DATA_TYPES:
+        if types and data_type["type"] not in types:
+            continue
+        for options in option_cases(data_type):
+            try:
+                resolve_request(GenerateRequest(type=data_type["type"], **options))
+            except HTTPException as e:
+                print(f"{case_name(data_type['type'], options, '*'):<60}  skipped: {e.detail}")
+                continue
+            for size in sizes:
+                name = case_name(data_type["type"], options, size)
+                rate, per_value = measure(data_type["type"], options, size)
+                results[name] = {"values_per_sec": round(rate, 1), "bytes_per_value": round(per_value, 1)}
+                old = baseline.get(name)
+                change = f"{rate / old['values_per_sec'] - 1:+.0%}" if old else ""
+                print(f"{name:<60}{rate:>14,.0f}{per_value:>10,.0f}{change:>10}")
+                problems += compare(name, results[name], baseline, args.threshold)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "cases": results}, f, indent=1, sort_keys=True)
+        print(f"\nBaseline written to {args.baseline}")
+    elif not baseline:
+        print(f"\nNo baseline at {args.baseline}; run with --save to record one")
+    if problems:
+        print(f"\n{len(problems)} regression(s) beyond {args.threshold:.0%}:")
+        for problem in problems:
+            print("  " + problem)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: /api/generate response serialization
+
+Compares response bytes/sec for the old path (a dict run through FastAPI's
+jsonable_encoder and Starlette's JSONResponse) against json_bytes (orjson when
+installed) on the same generated values, and reports the end-to-end time of
+generate_json_array, which encodes each chunk as soon as it is generated.
+
+Usage: python benchmarks/bench_json.py [type] [count]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+import main as server
+from main import GeneratorSpec, as_list, generate_json_array, generate_values, json_bytes, json_envelope
+
+
+def best_of(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    type_id = sys.argv[1] if len(sys.argv) > 1 else "uuid"
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    spec = GeneratorSpec(type_id, {}, seed=1)
+    data = as_list(generate_values(spec, 0, count))
+    content = {"success": True, "message": "done", "data": data}
+
+    serializers = {
+        "jsonable_encoder + JSONResponse": lambda: JSONResponse(jsonable_encoder(content)).body,
+        "JSONResponse": lambda: JSONResponse(content).body,
+        f"json_bytes ({'orjson' if server.orjson else 'json'})": lambda: json_envelope(json_bytes(data)),
+    }
+    print(f"{type_id} x {count:,}\n")
+    print(f"{'serializer':<36}{'seconds':>10}{'MB/s':>10}{'speedup':>10}")
+    baseline = None
+    for name, serialize in serializers.items():
+        elapsed, body = best_of(serialize)
+        baseline = baseline or elapsed
+        print(f"{name:<36}{elapsed:>10.3f}{len(body) / elapsed / 1e6:>10.1f}{baseline / elapsed:>9.1f}x")
+
+    generate, _ = best_of(lambda: generate_values(spec, 0, count), repeat=3)
+    encode = best_of(lambda: JSONResponse(jsonable_encoder({**content, "data": as_list(generate_values(spec, 0, count))})).body, repeat=3)[0]
+    chunked = best_of(lambda: json_envelope(generate_json_array(spec, 0, count)[0]), repeat=3)[0]
+    print(f"\n{'generate only':<36}{generate:>10.3f}")
+    print(f"{'generate + old serialization':<36}{encode:>10.3f}")
+    print(f"{'generate_json_array':<36}{chunked:>10.3f}{'':>10}{encode / chunked:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Benchmark: process-pool throughput by worker count
+
+Usage: python benchmarks/bench_parallel.py [type] [count]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as server
+from main import GeneratorSpec, generate_values, shutdown_process_pool
+
+
+def main():
+    type_id = sys.argv[1] if len(sys.argv) > 1 else "paragraph"
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 500_000
+    spec = GeneratorSpec(type_id, {})
+    server.PARALLEL_THRESHOLD = 0
+
+    print(f"{'workers':<10}{'seconds':>10}{'rows/s':>14}{'scaling':>10}")
+    baseline = None
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        server.PROCESS_POOL_WORKERS = workers
+        shutdown_process_pool()
+        generate_values(spec, 0, 1000)  # start the workers outside the timed run
+        start = time.perf_counter()
+        generate_values(spec, 0, count)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:<10}{elapsed:>10.2f}{count / elapsed:>14,.0f}{baseline / elapsed:>9.1f}x")
+    shutdown_process_pool()
+
+
+if __name__ == "__main__":
+    main()
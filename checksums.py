@@ -0,0 +1,63 @@
+"""
+Check digits - Luhn (cards, IMEI), GS1 (EAN-13, UPC-A, ISBN-13) and ISBN-10
+
+Scalar functions take the payload as a digit string (check digit not
+included) and return the check digit as an int. The *_check_digits variants
+take an (n, width) integer matrix of digits and return an array of n check
+digits, for batch generation. Both are driven by lookup tables instead of
+per-digit arithmetic.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the batch functions need it
+    np = None
+
+# Digit sum of 2 * d, the Luhn "doubling" step
+LUHN_DOUBLED = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+ISBN10_WEIGHTS = (10, 9, 8, 7, 6, 5, 4, 3, 2)
+
+_DIGIT = {str(d): d for d in range(10)}
+_LUHN_DOUBLED_DIGIT = {str(d): LUHN_DOUBLED[d] for d in range(10)}
+_GS1_TRIPLED_DIGIT = {str(d): 3 * d for d in range(10)}
+_NP_LUHN_DOUBLED = np.array(LUHN_DOUBLED) if np is not None else None
+
+
+def luhn_check_digit(payload):
+    """Luhn: every second digit, starting from the rightmost payload digit, is doubled"""
+    total = sum(map(_LUHN_DOUBLED_DIGIT.__getitem__, payload[-1::-2])) + sum(map(_DIGIT.__getitem__, payload[-2::-2]))
+    return -total % 10
+
+
+def gs1_check_digit(payload):
+    """GS1 mod 10 (EAN-8/13, UPC-A, ISBN-13): weights 3, 1, 3, ... from the rightmost payload digit"""
+    total = sum(map(_GS1_TRIPLED_DIGIT.__getitem__, payload[-1::-2])) + sum(map(_DIGIT.__getitem__, payload[-2::-2]))
+    return -total % 10
+
+
+def isbn10_check_char(payload):
+    """ISBN-10 mod 11 check character ('X' for 10) for a 9-digit payload"""
+    check = -sum(w * _DIGIT[c] for w, c in zip(ISBN10_WEIGHTS, payload)) % 11
+    return "X" if check == 10 else str(check)
+
+
+def wrong_check_digit(check):
+    """A check digit guaranteed not to validate; works on ints and arrays"""
+    return (check + 1) % 10
+
+
+# The batch variants accept any integer dtype, unsigned included, so they never negate a total
+
+def luhn_check_digits(digits):
+    total = _NP_LUHN_DOUBLED[digits[:, -1::-2]].sum(axis=1) + digits[:, -2::-2].sum(axis=1, dtype=np.int64)
+    return (10 - total % 10) % 10
+
+
+def gs1_check_digits(digits):
+    total = 3 * digits[:, -1::-2].sum(axis=1, dtype=np.int64) + digits[:, -2::-2].sum(axis=1, dtype=np.int64)
+    return (10 - total % 10) % 10
+
+
+def isbn10_check_digits(digits):
+    """ISBN-10 check values 0-10 for an (n, 9) digit matrix; 10 is written as 'X'"""
+    return (11 - digits.astype(np.int64) @ np.array(ISBN10_WEIGHTS) % 11) % 11
@@ -0,0 +1,238 @@
+"""
+Columnar string results - many values in a few NumPy buffers
+
+Batch generators return these instead of lists of str. A StringColumn uses
+Arrow's string layout, one UTF-8 byte buffer plus n + 1 offsets; a
+DictionaryColumn holds int32 codes into a small StringColumn of distinct
+values, for low-cardinality types. Both behave as read-only sequences of str,
+so code that just iterates keeps working, while the JSON, CSV and Parquet
+writers frame the byte buffers directly instead of creating one Python object
+per value.
+
+Framing and gathering use int64 index arrays as long as the byte buffer, so
+columns are meant to be chunk-sized (tens of thousands of values).
+
+Only the NumPy batch generators create columns, so this module imports without
+NumPy; concat and as_list then just see lists.
+"""
+
+from collections.abc import Sequence
+from itertools import chain
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; without it no columns are ever created
+    np = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is optional; only to_arrow needs it
+    pa = None
+
+# Bytes that JSON strings must escape, and bytes that make CSV fields need quoting
+if np is not None:
+    _JSON_UNSAFE = np.zeros(256, dtype=bool)
+    _JSON_UNSAFE[:32] = True
+    _JSON_UNSAFE[[ord('"'), ord("\\")]] = True
+    _CSV_UNSAFE = np.zeros(256, dtype=bool)
+    _CSV_UNSAFE[[ord(","), ord('"'), ord("\n"), ord("\r")]] = True
+
+
+class StringColumn(Sequence):
+    """n strings as one UTF-8 buffer (uint8) and n + 1 int64 offsets into it"""
+
+    def __init__(self, data, offsets, width=None):
+        self.data = data
+        self.offsets = offsets
+        # Bytes per value when every value has the same length
+        self.width = width
+
+    @classmethod
+    def from_fixed_width(cls, matrix):
+        """One value per row of an (n, width) uint8 matrix of ASCII bytes"""
+        n, width = matrix.shape
+        return cls(np.ascontiguousarray(matrix).reshape(-1), np.arange(0, n * width + 1, width, dtype=np.int64), width)
+
+    @classmethod
+    def from_masked(cls, matrix, mask):
+        """One value per row of a uint8 matrix, keeping only the bytes where mask is True"""
+        return cls(matrix[mask], np.concatenate([[0], np.cumsum(mask.sum(axis=1), dtype=np.int64)]))
+
+    @classmethod
+    def from_strings(cls, values):
+        encoded = [value.encode() for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return self.take(np.arange(start, stop, step))
+            stop = max(start, stop)
+            offsets = self.offsets[start:stop + 1]
+            return StringColumn(self.data[offsets[0]:offsets[-1]], offsets - offsets[0], self.width)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("column index out of range")
+        return self.data[self.offsets[index]:self.offsets[index + 1]].tobytes().decode()
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __repr__(self):
+        return f"StringColumn({len(self)} values, {len(self.data)} bytes)"
+
+    def tolist(self):
+        if self.width:
+            return self.data.view(f"S{self.width}").astype(f"U{self.width}").tolist()
+        raw = self.data.tobytes()
+        text = raw.decode()
+        offsets = self.offsets.tolist()
+        if len(text) != len(raw):
+            return [raw[a:b].decode() for a, b in zip(offsets, offsets[1:])]
+        return [text[a:b] for a, b in zip(offsets, offsets[1:])]
+
+    def take(self, indices):
+        """The values at indices, gathered into a new column"""
+        indices = np.asarray(indices, dtype=np.int64)
+        if self.width:
+            return StringColumn.from_fixed_width(self.data.reshape(-1, self.width)[indices])
+        starts = self.offsets[indices]
+        lengths = self.offsets[indices + 1] - starts
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1], dtype=np.int64)
+        return StringColumn(self.data[positions], offsets)
+
+    def json_safe(self):
+        return not _JSON_UNSAFE[self.data].any()
+
+    def csv_safe(self):
+        """True if no value needs CSV quoting (empty values do, when alone on a row)"""
+        return not _CSV_UNSAFE[self.data].any() and bool(np.all(np.diff(self.offsets)))
+
+    def frame(self, before=b"", after=b"", separator=b"", lead=b"", trail=b""):
+        """lead + before + v0 + after + separator + before + v1 + after ... + trail, as bytes"""
+        n = len(self)
+        if n == 0:
+            return lead + trail
+        extra = len(before) + len(after) + len(separator)
+        if self.width is not None:
+            rows = np.empty((n, self.width + extra), dtype=np.uint8)
+            rows[:, :len(before)] = np.frombuffer(before, dtype=np.uint8)
+            rows[:, len(before):len(before) + self.width] = self.data.reshape(n, self.width)
+            rows[:, len(before) + self.width:] = np.frombuffer(after + separator, dtype=np.uint8)
+            body = rows.reshape(-1)
+        else:
+            # Scatter only the framing bytes; the value bytes fill the remaining slots in order
+            body = np.empty(len(self.data) + n * extra, dtype=np.uint8)
+            is_value = np.ones(len(body), dtype=bool)
+            shift = np.arange(n, dtype=np.int64) * extra
+            for positions, frame in ((self.offsets[:-1] + shift, before), (self.offsets[1:] + shift + len(before), after + separator)):
+                for k, byte in enumerate(frame):
+                    body[positions + k] = byte
+                    is_value[positions + k] = False
+            body[is_value] = self.data
+        body = body[:len(body) - len(separator)] if separator else body
+        return lead + body.tobytes() + trail
+
+    def entries(self, encode, key=None):
+        """encode(value) for every value, cached under key (default encode); meant for small dictionaries"""
+        cache = self.__dict__.setdefault("_entries", {})
+        key = encode if key is None else key
+        if key not in cache:
+            cache[key] = [encode(value) for value in self.tolist()]
+        return cache[key]
+
+    def json_array(self, fallback):
+        """The values as an encoded JSON array; fallback(list) encodes columns that need escaping"""
+        if not self.json_safe():
+            return fallback(self.tolist())
+        return self.frame(b'"', b'"', b",", b"[", b"]")
+
+    def to_arrow(self):
+        if len(self.data) < 2 ** 31:
+            offsets, kind = self.offsets.astype(np.int32), pa.string()
+        else:
+            offsets, kind = self.offsets, pa.large_string()
+        return pa.Array.from_buffers(kind, len(self), [None, pa.py_buffer(offsets), pa.py_buffer(self.data)])
+
+
+class DictionaryColumn(Sequence):
+    """n values as int32 codes into a StringColumn of distinct values"""
+
+    def __init__(self, codes, dictionary):
+        self.codes = codes
+        self.dictionary = dictionary
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return DictionaryColumn(self.codes[index], self.dictionary)
+        return self.dictionary[int(self.codes[index])]
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __repr__(self):
+        return f"DictionaryColumn({len(self)} values, {len(self.dictionary)} distinct)"
+
+    def tolist(self):
+        # Every row shares one str object per distinct value
+        return np.array(self.dictionary.tolist(), dtype=object)[self.codes].tolist()
+
+    def decode(self):
+        """The values as a plain StringColumn"""
+        return self.dictionary.take(self.codes)
+
+    def json_safe(self):
+        return self.dictionary.json_safe()
+
+    def csv_safe(self):
+        return self.dictionary.csv_safe()
+
+    def frame(self, before=b"", after=b"", separator=b"", lead=b"", trail=b""):
+        # Each distinct value is framed once; rows just pick theirs by code
+        entries = self.dictionary.entries(lambda value: before + value.encode() + after, key=(before, after))
+        return lead + separator.join(map(entries.__getitem__, self.codes.tolist())) + trail
+
+    def json_array(self, fallback):
+        # tolist shares one str per distinct value, which encoders handle faster than any join
+        return fallback(self.tolist())
+
+    def to_arrow(self):
+        return pa.DictionaryArray.from_arrays(pa.array(self.codes, type=pa.int32()), self.dictionary.to_arrow())
+
+
+COLUMN_TYPES = (StringColumn, DictionaryColumn)
+
+
+def concat(parts):
+    """Join consecutive results; stays columnar when every part is the same kind of column"""
+    parts = list(parts)
+    if parts and all(isinstance(part, StringColumn) for part in parts):
+        widths = {part.width for part in parts}
+        offsets = [parts[0].offsets[:1]]
+        base = 0
+        for part in parts:
+            offsets.append(part.offsets[1:] + base)
+            base += len(part.data)
+        return StringColumn(np.concatenate([part.data for part in parts]), np.concatenate(offsets), widths.pop() if len(widths) == 1 else None)
+    if parts and all(isinstance(part, DictionaryColumn) and part.dictionary is parts[0].dictionary for part in parts):
+        return DictionaryColumn(np.concatenate([part.codes for part in parts]), parts[0].dictionary)
+    if len(parts) == 1:
+        return parts[0]
+    return list(chain.from_iterable(parts))
+
+
+def as_list(values):
+    """values as a list of str, for code that needs real Python objects"""
+    return values.tolist() if isinstance(values, COLUMN_TYPES) else values
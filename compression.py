@@ -0,0 +1,72 @@
+"""
+Response compression - content negotiation, one-shot and streaming gzip/zstd
+
+Generated data is highly repetitive, so even fast levels shrink it several
+times over. Streams are flushed after every chunk, so a client can decode each
+one as it arrives instead of waiting for the compressor's window to fill.
+"""
+
+import gzip
+import zlib
+from functools import partial
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional; without it only gzip is offered
+    zstandard = None
+
+# Codings we can produce, most preferred first
+CODINGS = ("zstd", "gzip") if zstandard is not None else ("gzip",)
+
+# Strongest levels worth using, for bodies compressed once and served many times
+MAX_LEVELS = {"zstd": 19, "gzip": 9}
+
+# zlib's wbits for a gzip header and trailer around the deflate stream
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def accepted_codings(header):
+    """Content-codings an Accept-Encoding header names, as (accepted, refused); q=0 refuses one"""
+    accepted, refused = set(), set()
+    for item in header.lower().split(","):
+        coding, _, params = item.partition(";")
+        weight = params.replace(" ", "")
+        refuse = False
+        if weight.startswith("q="):
+            try:
+                refuse = float(weight[2:]) == 0
+            except ValueError:
+                pass
+        (refused if refuse else accepted).add(coding.strip())
+    return accepted, refused
+
+
+def allowed_codings(header, codings=CODINGS):
+    """Those of codings an Accept-Encoding header allows, in order; * covers any it does not refuse"""
+    accepted, refused = accepted_codings(header)
+    return [c for c in codings if c in accepted or ("*" in accepted and c not in refused)]
+
+
+def negotiate(header, codings=CODINGS):
+    """The first of codings that an Accept-Encoding header allows, or None"""
+    return next(iter(allowed_codings(header, codings)), None)
+
+
+def compress(data, coding, level):
+    if coding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compress_stream(pieces, coding, level):
+    """Compress an iterable of str or bytes pieces, flushing after each one"""
+    if coding == "zstd":
+        compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        flush = partial(compressor.flush, zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, _GZIP_WBITS)
+        flush = partial(compressor.flush, zlib.Z_SYNC_FLUSH)
+    for piece in pieces:
+        data = compressor.compress(piece.encode() if isinstance(piece, str) else piece)
+        yield data + flush()
+    yield compressor.flush()
@@ -0,0 +1,233 @@
+"""
+Streaming exporters - serialize generated data chunk by chunk
+
+Every exporter takes an iterable of column chunks ({column_name: [values]},
+all lists the same length) and yields encoded pieces as it goes, so an
+export never holds more than one chunk in memory.
+"""
+
+import csv
+import io
+import json
+import os
+import sqlite3
+import tempfile
+
+from columns import COLUMN_TYPES
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; only needed for Parquet export
+    pa = None
+    pq = None
+
+# Rows per INSERT statement in SQL exports
+SQL_ROWS_PER_INSERT = 500
+
+# Rows per transaction when loading SQLite, and bytes per piece when streaming the file back
+SQLITE_ROWS_PER_TRANSACTION = 500_000
+SQLITE_READ_SIZE = 1 << 20
+
+# Bulk-load settings: no rollback journal or fsyncs (a failed load is simply discarded),
+# and a 64 MB page cache
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode = OFF",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA locking_mode = EXCLUSIVE",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+)
+
+# Rows buffered into each Parquet row group; readers and compression want large groups,
+# not one per streamed chunk
+PARQUET_ROW_GROUP_SIZE = 128 * 1024
+
+# PostgreSQL COPY text format escapes
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+EXPORT_FORMATS = {
+    "csv": {"media_type": "text/csv", "extension": "csv"},
+    "jsonl": {"media_type": "application/x-ndjson", "extension": "jsonl"},
+    "sql": {"media_type": "application/sql", "extension": "sql"},
+    # Parquet pages are compressed already, so the HTTP layer does not compress them again
+    "parquet": {"media_type": "application/vnd.apache.parquet", "extension": "parquet", "compressed": True},
+    "sqlite": {"media_type": "application/vnd.sqlite3", "extension": "db"},
+    "copy": {"media_type": "text/plain", "extension": "copy"},
+}
+
+
+def export_csv(chunks, columns):
+    """CSV with a header row"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    for chunk in chunks:
+        values = chunk[columns[0]]
+        # A single column that needs no quoting is written straight from its buffer
+        if len(columns) == 1 and isinstance(values, COLUMN_TYPES) and values.csv_safe():
+            yield buffer.getvalue().encode() + values.frame(b"", b"\n")
+            buffer.seek(0)
+            buffer.truncate()
+            continue
+        writer.writerows(zip(*[chunk[c] for c in columns]))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def export_jsonl(chunks, columns):
+    """One JSON object per line"""
+    for chunk in chunks:
+        yield "".join([
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n"
+            for row in zip(*[chunk[c] for c in columns])
+        ])
+
+
+def quote_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def quote_literal(value):
+    if value is None:
+        return "NULL"
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def export_sql(chunks, columns, table="test_data"):
+    """Batched INSERT statements, SQL_ROWS_PER_INSERT rows each"""
+    head = f"INSERT INTO {quote_identifier(table)} ({', '.join(quote_identifier(c) for c in columns)}) VALUES\n"
+    for chunk in chunks:
+        rows = ["(" + ", ".join(quote_literal(v) for v in row) + ")" for row in zip(*[chunk[c] for c in columns])]
+        yield "".join(
+            head + ",\n".join(rows[i:i + SQL_ROWS_PER_INSERT]) + ";\n"
+            for i in range(0, len(rows), SQL_ROWS_PER_INSERT)
+        )
+
+
+def copy_field(value):
+    return "\\N" if value is None else str(value).translate(COPY_ESCAPES)
+
+
+def export_copy(chunks, columns):
+    """PostgreSQL COPY text format: tab-separated, \\N for NULL, for COPY ... FROM / psql \\copy"""
+    for chunk in chunks:
+        yield "".join([
+            "\t".join(map(copy_field, row)) + "\n"
+            for row in zip(*[chunk[c] for c in columns])
+        ])
+
+
+def write_sqlite(path, chunks, columns, table="test_data"):
+    """Load chunks into table (all TEXT columns) of the SQLite database at path
+
+    Rows go in with executemany inside large transactions, with the journal and
+    fsyncs turned off; returns the number of rows written.
+    """
+    connection = sqlite3.connect(path, isolation_level=None)
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            connection.execute(pragma)
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {quote_identifier(table)} ({', '.join(quote_identifier(c) + ' TEXT' for c in columns)})")
+        insert = f"INSERT INTO {quote_identifier(table)} ({', '.join(quote_identifier(c) for c in columns)}) VALUES ({', '.join('?' * len(columns))})"
+        rows = pending = 0
+        connection.execute("BEGIN")
+        for chunk in chunks:
+            n = len(chunk[columns[0]])
+            connection.executemany(insert, zip(*[chunk[c] for c in columns]))
+            rows += n
+            pending += n
+            if pending >= SQLITE_ROWS_PER_TRANSACTION:
+                connection.execute("COMMIT")
+                connection.execute("BEGIN")
+                pending = 0
+        connection.execute("COMMIT")
+    finally:
+        connection.close()
+    return rows
+
+
+def export_sqlite(chunks, columns, table="test_data"):
+    """SQLite database file; built in a temporary file, then streamed back"""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        write_sqlite(path, chunks, columns, table)
+        with open(path, "rb") as f:
+            while piece := f.read(SQLITE_READ_SIZE):
+                yield piece
+    finally:
+        os.remove(path)
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file object whose written bytes can be taken out piecewise"""
+
+    def __init__(self):
+        self._parts = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def arrow_strings(values):
+    """A pyarrow string array; columns convert from their buffers without per-value objects"""
+    if isinstance(values, COLUMN_TYPES):
+        return values.to_arrow().cast(pa.string())
+    return pa.array(values, type=pa.string())
+
+
+def export_parquet(chunks, columns):
+    """Parquet file; chunks are buffered into row groups of PARQUET_ROW_GROUP_SIZE rows"""
+    if pa is None:
+        raise RuntimeError("Parquet export requires pyarrow")
+    schema = pa.schema([(c, pa.string()) for c in columns])
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, schema)
+    pending = []
+
+    def flush(table):
+        writer.write_table(table, row_group_size=PARQUET_ROW_GROUP_SIZE)
+        return sink.drain()
+
+    try:
+        for chunk in chunks:
+            pending.append(pa.table({c: arrow_strings(chunk[c]) for c in columns}, schema=schema))
+            if sum(t.num_rows for t in pending) >= PARQUET_ROW_GROUP_SIZE:
+                # Write whole row groups and carry the remainder into the next one
+                table = pa.concat_tables(pending)
+                full = table.num_rows - table.num_rows % PARQUET_ROW_GROUP_SIZE
+                pending = [table.slice(full)] if full < table.num_rows else []
+                yield flush(table.slice(0, full))
+        if pending:
+            yield flush(pa.concat_tables(pending))
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_stream(format, chunks, columns, table="test_data"):
+    """Dispatch to the exporter for format"""
+    if format == "csv":
+        return export_csv(chunks, columns)
+    elif format == "jsonl":
+        return export_jsonl(chunks, columns)
+    elif format == "sql":
+        return export_sql(chunks, columns, table)
+    elif format == "parquet":
+        return export_parquet(chunks, columns)
+    elif format == "sqlite":
+        return export_sqlite(chunks, columns, table)
+    elif format == "copy":
+        return export_copy(chunks, columns)
+    raise ValueError(f"Unknown export format: {format}")
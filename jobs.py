@@ -0,0 +1,148 @@
+"""
+Bulk jobs - generate large datasets into files in the background
+
+A job pulls column chunks from an iterator, encodes them with an exporter and
+writes the pieces to a temporary file (gzipped if asked), which is renamed
+into place once complete. Jobs run on a small thread pool; they report
+progress, can be cancelled between chunks, and their files are deleted once
+they have been finished for longer than the retention period.
+"""
+
+import gzip
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+FINISHED = ("done", "failed", "cancelled")
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, total, filename, path, media_type):
+        self.id = uuid.uuid4().hex
+        self.total = total
+        self.filename = filename
+        self.path = path
+        self.media_type = media_type
+        self.status = "queued"
+        self.rows_done = 0
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.cancelled = threading.Event()
+
+    def progress(self):
+        elapsed = ((self.finished or time.time()) - self.started) if self.started else 0
+        rate = self.rows_done / elapsed if elapsed > 0 else 0
+        eta = (self.total - self.rows_done) / rate if rate and self.status == "running" else None
+        return {
+            "id": self.id,
+            "status": self.status,
+            "rows_done": self.rows_done,
+            "rows_total": self.total,
+            "rows_per_sec": round(rate, 1),
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+            "bytes": self.size(),
+            "filename": self.filename,
+            "error": self.error,
+        }
+
+    def size(self):
+        """Bytes in the finished file; None until the job is done, or once its file is deleted"""
+        if self.status != "done":
+            return None
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return None
+
+
+class JobStore:
+    """In-memory job registry backed by files in directory"""
+
+    def __init__(self, directory, workers, retention_seconds):
+        self.directory = directory
+        self.retention_seconds = retention_seconds
+        self.jobs = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+
+    def submit(self, chunks, encode, total, filename, media_type, compress=False):
+        """Start writing encode(chunks) to a file; returns the queued Job
+
+        chunks yields {column: [values]} dicts and encode turns such an iterable
+        into str or bytes pieces, as the exporters do.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        if compress:
+            filename += ".gz"
+            media_type = "application/gzip"
+        job = Job(total, filename, None, media_type)
+        job.path = os.path.join(self.directory, f"{job.id}-{filename}")
+        self.jobs[job.id] = job
+        self._executor.submit(self._run, job, chunks, encode, compress)
+        return job
+
+    def _run(self, job, chunks, encode, compress):
+        if job.cancelled.is_set():
+            return
+        job.status, job.started = "running", time.time()
+        partial_path = job.path + ".part"
+        try:
+            with (gzip.open if compress else open)(partial_path, "wb") as f:
+                for piece in encode(self._counted(job, chunks)):
+                    f.write(piece.encode() if isinstance(piece, str) else piece)
+            os.replace(partial_path, job.path)
+            job.status = "done"
+        except JobCancelled:
+            job.status = "cancelled"
+        except Exception as e:
+            job.status, job.error = "failed", str(e)
+        finally:
+            job.finished = time.time()
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+    @staticmethod
+    def _counted(job, chunks):
+        for chunk in chunks:
+            if job.cancelled.is_set():
+                raise JobCancelled()
+            yield chunk
+            job.rows_done += len(next(iter(chunk.values()), ()))
+
+    def cancel(self, job):
+        """Stop a queued or running job, or delete a finished one's file"""
+        job.cancelled.set()
+        if job.status == "queued":
+            job.status, job.finished = "cancelled", time.time()
+        elif job.status in FINISHED:
+            self._remove(job)
+
+    def _remove(self, job):
+        self.jobs.pop(job.id, None)
+        if os.path.exists(job.path):
+            os.remove(job.path)
+
+    def expire(self):
+        """Delete jobs finished more than retention_seconds ago, and stray files as old"""
+        cutoff = time.time() - self.retention_seconds
+        for job in list(self.jobs.values()):
+            if job.status in FINISHED and job.finished < cutoff:
+                self._remove(job)
+        if os.path.isdir(self.directory):
+            live = {path for job in self.jobs.values() for path in (job.path, job.path + ".part")}
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                if path not in live and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+
+    def shutdown(self):
+        for job in self.jobs.values():
+            job.cancelled.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
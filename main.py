@@ -2,15 +2,73 @@
 Test Data Generator - Comprehensive Fixes
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
-from typing import Optional, List
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache, partial
+from itertools import islice
+from typing import Optional, List, NamedTuple
+import asyncio
+import cProfile
+import hashlib
+import hmac
+import json
+import math
+import os
+import pstats
 import random
+import re
+import tempfile
+import threading
+import time
 import uuid
+import weakref
 
-app = FastAPI(title="Test Data Generator")
+import compression
+import exporters
+from exporters import EXPORT_FORMATS, export_stream
+from columns import COLUMN_TYPES, DictionaryColumn, StringColumn, as_list, concat
+from checksums import (
+    gs1_check_digit, gs1_check_digits, isbn10_check_char, isbn10_check_digits,
+    luhn_check_digit, luhn_check_digits, wrong_check_digit,
+)
+from unique import FeistelPermutation, UniqueSpaceExhausted, iter_unique
+import metrics
+from jobs import JobStore
+from patterns import compile_pattern
+from sampling import AliasTable, zipf_weights
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; large requests fall back to the per-row loop
+    np = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; responses fall back to the json module
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; static responses are then precompressed without it
+    brotli = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    refill = asyncio.create_task(value_pools.run()) if VALUE_POOL_ENABLED else None
+    expiry = asyncio.create_task(expire_jobs())
+    yield
+    if refill is not None:
+        refill.cancel()
+    expiry.cancel()
+    job_store.shutdown()
+    shutdown_process_pool()
+
+app = FastAPI(title="Test Data Generator", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,13 +77,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(UniqueSpaceExhausted)
+async def unique_space_exhausted(request: Request, exc: UniqueSpaceExhausted):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
 @app.get("/")
-async def root():
-    return FileResponse("index.html")
+async def root(request: Request):
+    return precomputed_response(request, INDEX_RESPONSE)
 
 @app.get("/index.html")
-async def index():
-    return FileResponse("index.html")
+async def index(request: Request):
+    return precomputed_response(request, INDEX_RESPONSE)
 
 # Pydantic models for API
 class GenerateRequest(BaseModel):
@@ -33,6 +95,16 @@ class GenerateRequest(BaseModel):
     count: int = 5
     prefix: Optional[str] = None
     suffix: Optional[str] = None
+    # Stream rows as NDJSON instead of a single JSON document
+    stream: Optional[bool] = None
+    # Reproducible output; shard k of shards generates its slice of the same rows
+    seed: Optional[int] = None
+    shard: Optional[int] = None
+    shards: Optional[int] = None
+    # Never repeat a value within the request
+    unique: Optional[bool] = None
+    # Run under cProfile and return the hottest functions (needs X-Admin-Token)
+    profile: Optional[bool] = None
     # Allow additional configuration options
     uppercase: Optional[bool] = None
     lowercase: Optional[bool] = None
@@ -68,10 +140,38 @@ class GenerateRequest(BaseModel):
     max_value: Optional[int] = None
     seniority: Optional[str] = None
     separator: Optional[str] = None
+    template: Optional[str] = None
+    # Skew value choices: uniform, zipf or a weight pack name, plus per-value weights
+    distribution: Optional[str] = None
+    zipf_exponent: Optional[float] = None
+    weights: Optional[dict] = None
     # Include extra fields for flexibility
     class Config:
         extra = "allow"
 
+class ColumnSpec(BaseModel):
+    name: str
+    type: str
+    options: dict = {}
+
+class RecordsRequest(BaseModel):
+    count: int = 5
+    columns: List[ColumnSpec]
+    seed: Optional[int] = None
+    shard: Optional[int] = None
+    shards: Optional[int] = None
+
+class BatchSpec(BaseModel):
+    # Result key; defaults to the type, so only repeated types need one
+    key: Optional[str] = None
+    type: str
+    count: int = 5
+    options: dict = {}
+
+class BatchRequest(BaseModel):
+    specs: List[BatchSpec]
+    seed: Optional[int] = None
+
 # Countries for phone/address
 COUNTRIES = {
     "US": {"name": "United States", "code": "+1"},
@@ -141,13 +241,13 @@ IMEI_BRANDS = {
 
 # Credit Card Types
 CREDIT_CARD_TYPES = {
-    "Visa": {"prefix": "4", "length": 16},
-    "Mastercard": {"prefix": str(random.randint(51, 55)), "length": 16},
-    "American Express": {"prefix": "37", "length": 15},
-    "Discover": {"prefix": "6011", "length": 16},
-    "JCB": {"prefix": "3528", "length": 16},
-    "Diners Club": {"prefix": "36", "length": 14},
-    "UnionPay": {"prefix": "62", "length": 16},
+    "Visa": {"prefixes": ["4"], "length": 16},
+    "Mastercard": {"prefixes": ["51", "52", "53", "54", "55"], "length": 16},
+    "American Express": {"prefixes": ["37"], "length": 15},
+    "Discover": {"prefixes": ["6011"], "length": 16},
+    "JCB": {"prefixes": ["3528"], "length": 16},
+    "Diners Club": {"prefixes": ["36"], "length": 14},
+    "UnionPay": {"prefixes": ["62"], "length": 16},
 }
 
 # URL Domains
@@ -233,6 +333,9 @@ DATA_TYPES = [
         {"key": "uppercase", "label": "Uppercase", "type": "checkbox", "default": True},
         {"key": "separator", "label": "Separator", "type": "radio", "values": [(":", ":"), ("-", "-")], "default": ":"}
     ]},
+    {"type": "pattern", "name": "Pattern", "icon": "🧩", "category": "identifiers_security", "supports_prefix_suffix": False, "options": [
+        {"key": "template", "label": "Template (# digit, ? letter, @ lowercase, ^ hex, [set], (a|b), {n})", "type": "text", "placeholder": "e.g., ORD-2024-#####-??"}
+    ]},
     
     # Contact & Identity
     {"type": "name", "name": "Name", "icon": "👤", "category": "contact_identity", "supports_prefix_suffix": False, "options": [
@@ -251,10 +354,12 @@ DATA_TYPES = [
         {"key": "country", "label": "Country", "type": "select", "values": [[k, v['name']] for k, v in COUNTRIES.items()], "default": "US"}
     ]},
     {"type": "country", "name": "Country", "icon": "🌍", "category": "contact_identity", "supports_prefix_suffix": False, "options": [
-        {"key": "starts_with", "label": "Starts with", "type": "text", "placeholder": "e.g., U"}
+        {"key": "starts_with", "label": "Starts with", "type": "text", "placeholder": "e.g., U"},
+        {"key": "distribution", "label": "Distribution", "type": "select", "values": [("uniform", "Uniform"), ("zipf", "Zipfian"), ("realistic", "By population")], "default": "uniform"}
     ]},
     {"type": "city", "name": "City", "icon": "🏙️", "category": "contact_identity", "supports_prefix_suffix": False, "options": [
-        {"key": "country", "label": "Country", "type": "select", "values": [[k, v['name']] for k, v in COUNTRIES.items()], "default": None}
+        {"key": "country", "label": "Country", "type": "select", "values": [[k, v['name']] for k, v in COUNTRIES.items()], "default": None},
+        {"key": "distribution", "label": "Distribution", "type": "select", "values": [("uniform", "Uniform"), ("zipf", "Zipfian"), ("realistic", "By population")], "default": "uniform"}
     ]},
     {"type": "zipcode", "name": "ZIP Code", "icon": "📮", "category": "contact_identity", "supports_prefix_suffix": False, "options": [
         {"key": "country", "label": "Country", "type": "select", "values": [[k, v['name']] for k, v in COUNTRIES.items()], "default": "US"},
@@ -265,7 +370,8 @@ DATA_TYPES = [
     # Financial & Sensitive
     {"type": "credit_card", "name": "Credit Card", "icon": "💳", "category": "financial_sensitive", "supports_prefix_suffix": False, "options": [
         {"key": "card_type", "label": "Card variant", "type": "select", "values": [("Visa", "Visa"), ("Mastercard", "Mastercard"), ("American Express", "AmEx"), ("Random", "Random")], "default": "Random"},
-        {"key": "valid", "label": "Valid", "type": "radio", "values": [("valid", "Valid"), ("invalid", "Invalid")], "default": "valid"}
+        {"key": "valid", "label": "Valid", "type": "radio", "values": [("valid", "Valid"), ("invalid", "Invalid")], "default": "valid"},
+        {"key": "distribution", "label": "Random variant mix", "type": "select", "values": [("uniform", "Uniform"), ("zipf", "Zipfian"), ("realistic", "By market share")], "default": "uniform"}
     ]},
     {"type": "ssn", "name": "SSN", "icon": "🔢", "category": "financial_sensitive", "supports_prefix_suffix": False, "options": [
         {"key": "country", "label": "Country", "type": "select", "values": [("US", "US"), ("UK", "UK"), ("Random", "Random")], "default": "US"}
@@ -316,7 +422,8 @@ DATA_TYPES = [
         {"key": "starts_with", "label": "Starts with", "type": "text", "placeholder": "e.g., Tech"}
     ]},
     {"type": "job", "name": "Job Title", "icon": "💼", "category": "work_org", "supports_prefix_suffix": False, "options": [
-        {"key": "seniority", "label": "Seniority", "type": "select", "values": [("any", "Any"), ("junior", "Junior"), ("senior", "Senior"), ("lead", "Lead")], "default": "any"}
+        {"key": "seniority", "label": "Seniority", "type": "select", "values": [("any", "Any"), ("junior", "Junior"), ("senior", "Senior"), ("lead", "Lead")], "default": "any"},
+        {"key": "distribution", "label": "Distribution", "type": "select", "values": [("uniform", "Uniform"), ("zipf", "Zipfian")], "default": "uniform"}
     ]},
 ]
 
@@ -326,41 +433,661 @@ FUN_MESSAGES = [
     "🔥 Hot fresh data!", "🌟 Shining bright!", "💥 Pow!", "🎊 Party time!"
 ]
 
+# Requests with at least this many rows are generated with generate_batch
+BATCH_THRESHOLD = 1000
+
+# Rows generated per chunk when streaming
+STREAM_CHUNK_SIZE = 1000
+
+# Values generated and encoded per chunk when building a JSON response
+JSON_CHUNK_SIZE = 16 * 1024
+
+# Rows per independently seeded block in seeded generation
+SEED_BLOCK_SIZE = 1024
+
+# Admission control: largest count per request, concurrent large generations, and the
+# estimated output, in bytes, up to which requests are cheap enough to run directly on
+# the event loop (INLINE_MAX_COUNT values of a type whose size no option sets)
+MAX_COUNT = int(os.environ.get("TDG_MAX_COUNT", 10_000_000))
+MAX_CONCURRENT_GENERATIONS = int(os.environ.get("TDG_MAX_CONCURRENT", 4))
+INLINE_MAX_COUNT = 100
+DEFAULT_VALUE_BYTES = 40
+INLINE_MAX_BYTES = INLINE_MAX_COUNT * DEFAULT_VALUE_BYTES
+
+# Most specs accepted by one /api/generate/batch request
+MAX_BATCH_SPECS = 100
+
+# Consecutive duplicates tolerated before a unique request gives up
+UNIQUE_MAX_RETRIES = int(os.environ.get("TDG_UNIQUE_MAX_RETRIES", 10000))
+
+# Pre-generated values for small unseeded requests: values kept per (type, options),
+# how many (type, options) keys to keep, and how long an unused key survives
+VALUE_POOL_ENABLED = os.environ.get("TDG_VALUE_POOL", "1") != "0"
+VALUE_POOL_SIZE = int(os.environ.get("TDG_VALUE_POOL_SIZE", 1000))
+VALUE_POOL_MAX_KEYS = int(os.environ.get("TDG_VALUE_POOL_KEYS", 256))
+VALUE_POOL_IDLE_SECONDS = int(os.environ.get("TDG_VALUE_POOL_IDLE", 600))
+
+# Prometheus metrics at /metrics; TDG_METRICS=0 turns off both the endpoint and collection
+METRICS_ENABLED = os.environ.get("TDG_METRICS", "1") != "0"
+
+# Background jobs: output directory, jobs run at once, seconds a finished job's file is kept,
+# and the largest count a job may ask for
+JOB_DIR = os.environ.get("TDG_JOB_DIR", os.path.join(tempfile.gettempdir(), "tdg-jobs"))
+JOB_WORKERS = int(os.environ.get("TDG_JOB_WORKERS", 1))
+JOB_RETENTION_SECONDS = int(os.environ.get("TDG_JOB_RETENTION", 3600))
+JOB_MAX_COUNT = int(os.environ.get("TDG_JOB_MAX_COUNT", 100_000_000))
+# Rows per chunk written by a job, and seconds between sweeps for expired jobs
+JOB_CHUNK_SIZE = 64 * SEED_BLOCK_SIZE
+JOB_SWEEP_SECONDS = 60
+
+# Request profiling: profile=true needs X-Admin-Token to match TDG_ADMIN_TOKEN (unset disables
+# it). Profiles are also saved as .pstats files to TDG_PROFILE_DIR, if set, where 1 in
+# TDG_PROFILE_SAMPLE requests (0 = none) is profiled automatically
+ADMIN_TOKEN = os.environ.get("TDG_ADMIN_TOKEN", "")
+PROFILE_DIR = os.environ.get("TDG_PROFILE_DIR", "")
+PROFILE_SAMPLE_RATE = int(os.environ.get("TDG_PROFILE_SAMPLE", 0))
+PROFILE_TOP = 25
+
+# Seconds browsers may reuse index.html without revalidating; metadata responses are always
+# revalidated, which costs a 304 while the server is unchanged
+INDEX_MAX_AGE = int(os.environ.get("TDG_INDEX_MAX_AGE", 86400))
+
+# Response compression (gzip, or zstd with the zstandard package) for clients that accept it:
+# TDG_COMPRESSION=0 turns it off, TDG_GZIP_LEVEL and TDG_ZSTD_LEVEL set the levels, and
+# bodies smaller than TDG_COMPRESS_MIN_SIZE bytes are sent as they are
+COMPRESSION_ENABLED = os.environ.get("TDG_COMPRESSION", "1") != "0"
+COMPRESSION_LEVELS = {
+    "gzip": int(os.environ.get("TDG_GZIP_LEVEL", 1)),
+    "zstd": int(os.environ.get("TDG_ZSTD_LEVEL", 1)),
+}
+COMPRESS_MIN_SIZE = int(os.environ.get("TDG_COMPRESS_MIN_SIZE", 1024))
+# Larger bodies are compressed on a worker thread
+COMPRESS_INLINE_MAX_SIZE = 256 * 1024
+
+# Process pool for large requests; set TDG_POOL_WORKERS=1 to disable it
+PROCESS_POOL_WORKERS = int(os.environ.get("TDG_POOL_WORKERS", os.cpu_count() or 1))
+PARALLEL_THRESHOLD = int(os.environ.get("TDG_PARALLEL_THRESHOLD", 200000))
+# Rows per pool task; a multiple of SEED_BLOCK_SIZE so seeded blocks are not split
+PARALLEL_CHUNK_SIZE = 64 * SEED_BLOCK_SIZE
+
+# Template used by the pattern type when a request gives none
+DEFAULT_PATTERN = "ORD-####-??"
+
+# Extra weight packs for the distribution option: a JSON file of {pack: {type: {value: weight}}}
+WEIGHT_PACKS_FILE = os.environ.get("TDG_WEIGHT_PACKS", "")
+
+# Bounds on options that set how large each value is: (lowest, highest) per type and option
+OPTION_LIMITS = {
+    "password": {"length": (0, 1024)},
+    "barcode": {"length": (0, 64)},
+    "paragraph": {"min_sentences": (0, 100), "max_sentences": (0, 100)},
+}
+
+# GenerateRequest fields that are not generator options
+REQUEST_FIELDS = ["type", "count", "prefix", "suffix", "stream", "seed", "shard", "shards", "unique", "profile"]
+
+# Request fields a batch spec cannot set in its options: the spec or batch sets them, or batches ignore them
+BATCH_REJECTED_OPTIONS = ["type", "count", "stream", "shard", "shards", "profile"]
+
+# ============ Locale Data ============
+# Built once at import. A locale format is a template plus the sequence each
+# field is drawn from; integer fields are ranges, so rendering a value is one
+# rng.choice (an indexed lookup) per field.
+
+FIRST_NAMES = ("James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen", "Emma", "Olivia", "Ava", "Isabella", "Sophia", "Mia", "Charlotte", "Amelia", "Harper", "Evelyn", "Liam", "Noah", "Oliver", "Elijah")
+LAST_NAMES = ("Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin")
+
+EMAIL_NAMES = ("alex", "sam", "jordan", "taylor", "morgan", "riley", "jamie", "quinn", "casey", "dakota", "avery", "skyler")
+EMAIL_DOMAINS = ("gmail.com", "yahoo.com", "outlook.com")
+URL_PATHS = ("about", "products", "services", "blog", "contact")
+COMPANY_KINDS = ("Solutions", "Systems", "Technologies", "Labs", "Ventures", "Group", "Inc")
+
+SENTENCE_SUBJECTS = ("The quick brown fox", "A happy dog", "The clever cat", "An innovative startup", "A dedicated team", "The talented developer", "An amazing product", "A revolutionary idea")
+SENTENCE_VERBS = ("jumps over", "runs through", "explores", "discovers", "builds", "creates", "transforms", "improves")
+SENTENCE_OBJECTS = ("the lazy bear", "the tall building", "new horizons", "exciting opportunities", "powerful solutions", "beautiful designs", "complex problems", "amazing experiences")
+
+CA_POSTAL_LETTERS = ("A", "B", "C", "D", "E", "F", "G", "H", "J", "K", "L", "M", "N", "P", "R", "S", "T", "V", "W", "X", "Y")
+
+ADDRESS_FORMATS = {
+    "US": {
+        "format": "{number} {street}, {city}, {state} {postcode}",
+        "fields": {
+            "number": range(1, 10000),
+            "street": ("Main St", "Oak Ave", "Park Blvd", "First St", "Elm St", "Maple Dr", "Cedar Ln", "Pine St", "Washington St", "Lake Dr"),
+            "city": ("New York", "Los Angeles", "Chicago", "Houston", "Phoenix", "Philadelphia", "San Antonio", "San Diego", "Dallas", "San Jose"),
+            "state": ("CA", "NY", "TX", "FL", "IL", "PA", "OH", "GA", "NC", "MI"),
+            "postcode": range(10000, 100000)
+        }
+    },
+    "UK": {
+        "format": "{number} {street}, {city}, {postcode}",
+        "fields": {
+            "number": range(1, 201),
+            "street": ("High Street", "Station Road", "London Road", "Victoria Road", "Church Lane", "Manor Road", "Park Road", "Queens Road"),
+            "city": ("London", "Manchester", "Birmingham", "Edinburgh", "Glasgow", "Liverpool", "Bristol", "Leeds"),
+            "postcode": ("SW1A", "EC1A", "W1A", "M1", "B1", "EH1", "G1", "L1", "BS1", "LS1")
+        }
+    },
+    "DE": {
+        "format": "{number} {street}, {city}, {postcode}",
+        "fields": {
+            "number": range(1, 201),
+            "street": ("Hauptstraße", "Bahnhofstraße", "Schulstraße", "Gartenstraße", "Dorfstraße", "Bergstraße", "Waldstraße", "Kirchstraße"),
+            "city": ("Berlin", "Munich", "Hamburg", "Frankfurt", "Cologne", "Stuttgart", "Düsseldorf", "Dortmund"),
+            "postcode": range(10000, 100000)
+        }
+    },
+    "FR": {
+        "format": "{number} {street}, {city}, {postcode}",
+        "fields": {
+            "number": range(1, 201),
+            "street": ("Rue de la Paix", "Avenue des Champs-Élysées", "Boulevard Saint-Michel", "Rue Victor Hugo", "Rue du Commerce"),
+            "city": ("Paris", "Lyon", "Marseille", "Toulouse", "Nice", "Nantes", "Strasbourg", "Bordeaux"),
+            "postcode": range(10000, 100000)
+        }
+    },
+    "IN": {
+        "format": "{number} {street}, {city} - {postcode}",
+        "fields": {
+            "number": range(1, 1000),
+            "street": ("MG Road", "Ring Road", "Main Market", "Sector Road", "College Road", "Station Road"),
+            "city": ("Mumbai", "Delhi", "Bangalore", "Chennai", "Kolkata", "Hyderabad", "Pune", "Ahmedabad"),
+            "postcode": range(100000, 1000000)
+        }
+    },
+    "AU": {
+        "format": "{number} {street}, {city} {postcode}",
+        "fields": {
+            "number": range(1, 1000),
+            "street": ("George St", "Queen St", "King St", "Elizabeth St", "Bourke St", "Collins St"),
+            "city": ("Sydney", "Melbourne", "Brisbane", "Perth", "Adelaide", "Canberra", "Hobart", "Darwin"),
+            "postcode": range(1000, 10000)
+        }
+    },
+    "CA": {
+        "format": "{number} {street}, {city}, {fsa}{d1}{l1}{d2}{l2}{d3}",
+        "fields": {
+            "number": range(1, 1000),
+            "street": ("Yonge St", "Queen St", "King St", "Dundas St", "Bloor St", "Huntington Ave"),
+            "city": ("Toronto", "Vancouver", "Montreal", "Calgary", "Ottawa", "Edmonton", "Winnipeg", "Halifax"),
+            "fsa": ("M", "V", "H", "K", "L", "N"),
+            "d1": range(1, 10),
+            "l1": CA_POSTAL_LETTERS,
+            "d2": range(1, 10),
+            "l2": CA_POSTAL_LETTERS,
+            "d3": range(1, 10)
+        }
+    },
+    "JP": {
+        "format": "{number}-{lot} {street}, {city}, {postcode}",
+        "fields": {
+            "number": range(1, 1000),
+            "street": ("Main Street", "Cherry Blossom Ave", "Central Blvd", "Garden Road", "Temple Street"),
+            "city": ("Tokyo", "Osaka", "Kyoto", "Yokohama", "Nagoya", "Sapporo", "Fukuoka", "Kobe"),
+            "lot": range(1, 100),
+            "postcode": range(100, 1000)
+        }
+    },
+    "BR": {
+        "format": "{number} {street}, {city} - {cep}-{cep_suffix}",
+        "fields": {
+            "number": range(1, 10000),
+            "street": ("Avenida Paulista", "Rua das Flores", "Avenida Brasil", "Rua 25 de Março", "Avenida Copacabana"),
+            "city": ("São Paulo", "Rio de Janeiro", "Brasília", "Salvador", "Fortaleza", "Belo Horizonte", "Manaus", "Curitiba"),
+            "cep": range(10000, 100000),
+            "cep_suffix": range(100, 1000)
+        }
+    },
+    "IT": {
+        "format": "{number} {street}, {city}, {postcode}",
+        "fields": {
+            "number": range(1, 201),
+            "street": ("Via Roma", "Corso Italia", "Via Garibaldi", "Piazza del Duomo", "Via del Corso"),
+            "city": ("Rome", "Milan", "Naples", "Turin", "Florence", "Venice", "Bologna", "Genoa"),
+            "postcode": range(10000, 100000)
+        }
+    },
+    "ES": {
+        "format": "{number} {street}, {city}, {postcode}",
+        "fields": {
+            "number": range(1, 201),
+            "street": ("Gran Vía", "Paseo de la Castellana", "Avenida de la Constitución", "Calle Mayor", "Rambla de Barcelona"),
+            "city": ("Madrid", "Barcelona", "Valencia", "Seville", "Bilbao", "Málaga", "Murcia", "Palma"),
+            "postcode": range(10000, 53000)
+        }
+    },
+    "MX": {
+        "format": "{number} {street}, {city}, CP {postcode}",
+        "fields": {
+            "number": range(1, 10000),
+            "street": ("Paseo de la Reforma", "Avenida Insurgentes", "Calle Madero", "Avenida Chapultepec", "Gran Avenida"),
+            "city": ("Mexico City", "Guadalajara", "Monterrey", "Cancún", "Puebla", "Tijuana", "Córdoba", "Veracruz"),
+            "postcode": range(10000, 100000)
+        }
+    },
+    "CN": {
+        "format": "{number} {street}, {city}, {postcode}",
+        "fields": {
+            "number": range(1, 1000),
+            "street": ("Nanjing Road", "Beijing Road", "Shanghai Street", "Guangzhou Avenue", "Shenzhen Boulevard"),
+            "city": ("Beijing", "Shanghai", "Guangzhou", "Shenzhen", "Chengdu", "Hangzhou", "Wuhan", "Nanjing"),
+            "postcode": range(100000, 1000000)
+        }
+    },
+    "RU": {
+        "format": "{number} {street}, {city}, {postcode}",
+        "fields": {
+            "number": range(1, 201),
+            "street": ("Tverskaya Street", "Arbat Street", "Nevsky Prospect", "Lenin Street", "Gorky Street"),
+            "city": ("Moscow", "Saint Petersburg", "Novosibirsk", "Yekaterinburg", "Nizhny Novgorod", "Kazan", "Chelyabinsk", "Omsk"),
+            "postcode": range(100000, 1000000)
+        }
+    },
+    "NL": {
+        "format": "{number} {street}, {city}, {postcode}",
+        "fields": {
+            "number": range(1, 201),
+            "street": ("Damrak", "Kalverstraat", "Rokin", "Leidsestraat", "PC Hooftstraat"),
+            "city": ("Amsterdam", "Rotterdam", "The Hague", "Utrecht", "Eindhoven", "Groningen", "Tilburg", "Almere"),
+            "postcode": range(1000, 10000)
+        }
+    },
+    "SE": {
+        "format": "{number} {street}, {city}, {postcode}",
+        "fields": {
+            "number": range(1, 201),
+            "street": ("Drottninggatan", "Sveavägen", "Göta Boulevard", "Kungsgatan", "Storgatan"),
+            "city": ("Stockholm", "Gothenburg", "Malmö", "Uppsala", "Västerås", "Örebro", "Linköping", "Helsingborg"),
+            "postcode": range(11111, 100000)
+        }
+    },
+    "SG": {
+        "format": "{number} {street}, Singapore {postcode}",
+        "fields": {
+            "number": range(1, 1000),
+            "street": ("Orchard Road", "Marina Bay", "Bugis Street", "Clarke Quay", "Havelock Road"),
+            "postcode": range(100000, 1000000)
+        }
+    },
+    "AE": {
+        "format": "{number} {street}, {city}",
+        "fields": {
+            "number": range(1, 1000),
+            "street": ("Sheikh Zayed Road", "Al Diyafah Street", "Jumeirah Beach Road", "Deira Corniche", "Business Bay"),
+            "city": ("Dubai", "Abu Dhabi", "Sharjah", "Al Ain", "Ajman", "Ras Al Khaimah")
+        }
+    },
+    "ZA": {
+        "format": "{number} {street}, {city}, {postcode}",
+        "fields": {
+            "number": range(1, 1000),
+            "street": ("Sandton City", "Oxford Street", "Main Road", "Long Street", "Kloof Street"),
+            "city": ("Johannesburg", "Cape Town", "Durban", "Pretoria", "Port Elizabeth", "Bloemfontein"),
+            "postcode": range(1000, 10000)
+        }
+    },
+}
+# The UI uses ISO codes; the UK data predates that
+ADDRESS_FORMATS["GB"] = ADDRESS_FORMATS["UK"]
+# Used for countries without their own address data
+DEFAULT_ADDRESS_FORMAT = {
+    "format": "{number} {street}, {city}, {postcode}",
+    "fields": {"number": range(1, 10000), "street": tuple(US_STREETS), "city": tuple(CITIES[:10]), "postcode": range(10000, 100000)}
+}
+
+_US_PHONE_FORMAT = {"format": "({area}) {exchange}-{line}", "fields": {"area": range(200, 1000), "exchange": range(200, 1000), "line": range(1000, 10000)}}
+PHONE_FORMATS = {
+    "US": _US_PHONE_FORMAT,
+    "CA": _US_PHONE_FORMAT,
+    "IN": {"format": "{number}", "fields": {"number": range(7000000000, 10000000000)}},
+    "GB": {"format": "{area} {block} {line}", "fields": {"area": range(20, 100), "block": range(1000, 10000), "line": range(100, 1000)}},
+}
+DEFAULT_PHONE_FORMAT = {"format": "{number}", "fields": {"number": range(100000000, 1000000000)}}
+
+CITIES_BY_COUNTRY = {
+    "US": ("New York", "Los Angeles", "Chicago", "Houston", "Phoenix", "Philadelphia", "San Antonio", "San Diego", "Dallas", "San Jose", "Austin", "Jacksonville", "Fort Worth", "Columbus", "Charlotte", "San Francisco", "Indianapolis", "Seattle", "Denver", "Boston"),
+    "UK": ("London", "Manchester", "Birmingham", "Edinburgh", "Glasgow", "Liverpool", "Bristol", "Leeds", "Sheffield", "Newcastle", "Nottingham", "Southampton", "Brighton", "Oxford", "Cambridge", "York", "Cardiff", "Belfast", "Bournemouth", "Leicester"),
+    "DE": ("Berlin", "Munich", "Hamburg", "Frankfurt", "Cologne", "Stuttgart", "Düsseldorf", "Dortmund", "Leipzig", "Essen", "Dresden", "Hanover", "Nuremberg", "Duisburg", "Bochum", "Wuppertal", "Bielefeld", "Bonn", "Mannheim", "Karlsruhe"),
+    "FR": ("Paris", "Lyon", "Marseille", "Toulouse", "Nice", "Nantes", "Strasbourg", "Bordeaux", "Lille", "Rennes", "Reims", "Le Havre", "Saint-Étienne", "Toulon", "Grenoble", "Dijon", "Angers", "Nîmes", "Villeurbanne", "Clermont-Ferrand"),
+    "IN": ("Mumbai", "Delhi", "Bangalore", "Chennai", "Kolkata", "Hyderabad", "Pune", "Ahmedabad", "Surat", "Jaipur", "Lucknow", "Kanpur", "Nagpur", "Indore", "Thane", "Bhopal", "Visakhapatnam", "Pimpri", "Kalyan", "Meerut"),
+    "AU": ("Sydney", "Melbourne", "Brisbane", "Perth", "Adelaide", "Canberra", "Hobart", "Darwin", "Newcastle", "Geelong", "Townsville", "Cairns", "Toowoomba", "Ballarat", "Bendigo", "Launceston", "Mackay", "Rockhampton", "Sunshine Coast", "Gold Coast"),
+    "CA": ("Toronto", "Vancouver", "Montreal", "Calgary", "Ottawa", "Edmonton", "Winnipeg", "Halifax", "Victoria", "Brampton", "Kitchener", "London", "Oshawa", "Barrie", "Sherbrooke", "Guelph", "Moncton", "Kelowna", "Sudbury", "Trois-Rivières"),
+    "JP": ("Tokyo", "Osaka", "Kyoto", "Yokohama", "Nagoya", "Sapporo", "Fukuoka", "Kobe", "Kawasaki", "Saitama", "Hiroshima", "Sendai", "Chiba", "Sakai", "Niigata", "Hamamatsu", "Hachioji", "Higashihiroshima", "Okayama", "Kagoshima"),
+    "BR": ("São Paulo", "Rio de Janeiro", "Brasília", "Salvador", "Fortaleza", "Belo Horizonte", "Manaus", "Curitiba", "Recife", "Porto Alegre", "Belém", "Goiânia", "Guarulhos", "Campinas", "São Luís", "São Gonçalo", "Maceió", "Duque de Caxias", "Natal", "Teresina"),
+    "IT": ("Rome", "Milan", "Naples", "Turin", "Florence", "Venice", "Bologna", "Genoa", "Bari", "Palermo", "Verona", "Catania", "Syracuse", "Padua", "Taranto", "Brescia", "Prato", "Reggio Calabria", "Modena", "Cagliari"),
+    "ES": ("Madrid", "Barcelona", "Valencia", "Seville", "Bilbao", "Málaga", "Murcia", "Palma", "Las Palmas", "Zaragoza", "Alicante", "Córdoba", "Valladolid", "Vigo", "Gijón", "Hospitalet", "Vitoria", "Elche", "Terrassa", "Oviedo"),
+    "MX": ("Mexico City", "Guadalajara", "Monterrey", "Cancún", "Puebla", "Tijuana", "Ciudad Juárez", "Torreón", "Toluca", "Chihuahua", "Durango", "Saltillo", "Acapulco", "Morelia", "Veracruz", "Tampico", "Tulum", "Oaxaca", "Guadalupe", "Mazatlán"),
+    "CN": ("Beijing", "Shanghai", "Guangzhou", "Shenzhen", "Chengdu", "Hangzhou", "Wuhan", "Nanjing", "Xi'an", "Chongqing", "Suzhou", "Tianjin", "Kunming", "Qingdao", "Dalian", "Harbin", "Jinan", "Shenyang", "Changchun", "Ningbo"),
+    "NL": ("Amsterdam", "Rotterdam", "The Hague", "Utrecht", "Eindhoven", "Groningen", "Tilburg", "Almere", "Breda", "Nijmegen", "Enschede", "Haarlem", "Arnhem", "Maastricht", "Zaanstad", "Zwolle", "Leeuwarden", "Leiden", "Delft", "Alkmaar"),
+    "SG": ("Singapore",),
+    "AE": ("Dubai", "Abu Dhabi", "Sharjah", "Al Ain", "Ajman", "Ras Al Khaimah", "Fujairah", "Umm Al Quwain", "Khor Fakkan", "Jebel Ali"),
+    "ZA": ("Johannesburg", "Cape Town", "Durban", "Pretoria", "Port Elizabeth", "Bloemfontein", "East London", "Polokwane", "Pietermaritzburg", "Nelspruit", "Kimberley", "George", "Middelburg", "Rustenburg", "Worcester", "Standerton", "Bethlehem", "Mmabatho", "Klerksdorp", "Mossel Bay"),
+    "MA": ("Casablanca", "Rabat", "Marrakech", "Fes", "Tangier", "Agadir", "Meknes", "Oujda", "Kenitra", "Tetouan", "Safi", "El Jadid", "Nador", "Beni Mellal", "Errachidia", "Taza", "Ksar El Kebir", "Guercif", "Tiflet", "Ouarzazate"),
+    "PE": ("Lima", "Arequipa", "Cusco", "Trujillo", "Chiclayo", "Iquitos", "Piura", "Tacna", "Pucallpa", "Sullana"),
+    "AR": ("Buenos Aires", "Córdoba", "Rosario", "Mendoza", "La Plata", "Tucumán", "Mar del Plata", "Salta", "Santa Fe", "Corrientes", "Bahía Blanca", "Posadas", "San Juan", "Resistencia", "Neuquén", "Venado Tuerto", "Villa Lugano", "San Miguel de Tucumán", "Pilar"),
+    "CL": ("Santiago", "Valparaíso", "Concepción", "La Serena", "Antofagasta", "Viña del Mar", "Rancagua", "Temuco", "Puerto Montt", "La Reina"),
+    "CO": ("Bogotá", "Medellín", "Cali", "Barranquilla", "Cartagena", "Cúcuta", "Soacha", "Soledad", "Bucaramanga", "Pereira", "Santa Marta", "Ibagué", "Pasto", "Manizales", "Neiva", "Armenia", "Villavicencio", "Popayán", "Sincelejo", "Tunja"),
+    "TH": ("Bangkok", "Chiang Mai", "Phuket", "Pattaya", "Krabi", "Hua Hin", "Ayutthaya", "Khon Kaen", "Surat Thani", "Chonburi", "Nonthaburi", "Nakhon Ratchasima", "Udon Thani", "Sakhon Nakhon", "Phitsanulok", "Lampang", "Ubon Ratchathani", "Samut Prakan", "Ratchaburi", "Suphan Buri"),
+    "VN": ("Hanoi", "Ho Chi Minh City", "Da Nang", "Hai Phong", "Can Tho", "Bien Hoa", "Hue", "Thu Dau Mot", "Nha Trang", "Bac Ninh", "Ha Long", "Vung Tau", "Da Lat", "Quy Nhon", "Rach Gia", "Long Xuyen", "Thanh Hoa", "Thai Nguyen", "Yen Bai", "Cau River"),
+    "PH": ("Manila", "Quezon City", "Cebu City", "Davao City", "Makati", "Taguig", "Pasig", "Caloocan", "Bacoor", "Cavite City", "Iloilo City", "Bohol", "Zamboanga City", "Lapu-Lapu City", "Mandaluyong", "Malabon", "San Jose del Monte", "Batangas City", "Legazpi", "Puerto Princesa"),
+    "ID": ("Jakarta", "Surabaya", "Bandung", "Medan", "Semarang", "Tangerang", "Depok", "Palembang", "Makassar", "Bogor", "Bandar Lampung", "Padang", "Denpasar", "Samarinda", "Banjarmasin", "Malang", "Pontianak", "Yogyakarta", "Cirebon", "Bekasi"),
+    "MY": ("Kuala Lumpur", "George Town", "Johor Bahru", "Ipoh", "Shah Alam", "Petaling Jaya", "Kota Kinabalu", "Kuching", "Melaka", "Seremban", "Alor Setar", "Kuantan", "Kuala Terengganu", "Sibu", "Miri", "Sungai Petani", "Batu Pahat", "Kluang", "Tawau", "Sandakan"),
+    "NZ": ("Auckland", "Wellington", "Christchurch", "Hamilton", "Tauranga", "Napier-Hastings", "Palmerston North", "Rotorua", "New Plymouth", "Whangarei", "Dunedin", "Invercargill", "Nelson", "Hastings", "Upper Hutt", "Gisborne", "Timaru", "Blenheim", "Papakura", "Porirua"),
+    "EG": ("Cairo", "Alexandria", "Giza", "Luxor", "Aswan", "Mansoura", "Port Said", "Suez", "Tanta", "Zagazig", "Ismailia", "Faiyum", "Zagazig", "Sohag", "Qena", "Beni Suef", "Hurghada", "Marsa Alam", "Sharm El Sheikh", "Damanhur"),
+    "NG": ("Lagos", "Abuja", "Ibadan", "Kano", "Port Harcourt", "Benin City", "Maiduguri", "Zaria", "Aba", "Jos", "Ilorin", "Owerri", "Yenagoa", "Enugu", "Abuja", "Lagos Island", "Ikeja", "Surulere", "Victoria Island", "Ikoyi"),
+    "KE": ("Nairobi", "Mombasa", "Kisumu", "Nakuru", "Eldoret", "Thika", "Malindi", "Kitale", "Garissa", "Kapenguria", "Nyali", "Kisii", "Nyeri", "Meru", "Embu", "Naivasha", "Kericho", "Kakamega", "Migori", "Bungoma"),
+    "GR": ("Athens", "Thessaloniki", "Patras", "Heraklion", "Larissa", "Volos", "Ioannina", "Chania", "Kalamata", "Alexandroupoli", "Kavala", "Lamia", "Drama", "Trikala", "Serres", "Chios", "Rodos", "Kos", "Corfu", "Santorini"),
+    "TR": ("Istanbul", "Ankara", "Izmir", "Bursa", "Antalya", "Adana", "Gaziantep", "Konya", "Mersin", "Eskisehir", "Denizli", "Samsun", "Diyarbakir", "Kayseri", "Sivas", "Trabzon", "Urfa", "Malatya", "Erzurum", "Tekirdag"),
+    "RU": ("Moscow", "Saint Petersburg", "Novosibirsk", "Yekaterinburg", "Nizhny Novgorod", "Kazan", "Chelyabinsk", "Omsk", "Samara", "Rostov-on-Don", "Ufa", "Krasnoyarsk", "Voronezh", "Volgograd", "Krasnodar", "Saratov", "Tyumen", "Tolyatti", "Izhevsk", "Barnaul")
+}
+CITIES_BY_COUNTRY["GB"] = CITIES_BY_COUNTRY["UK"]
+ALL_CITIES = tuple(city for country, cities in CITIES_BY_COUNTRY.items() if country != "GB" for city in cities)
+
+# Approximate 2023 populations in millions, for the "realistic" weight pack
+COUNTRY_POPULATIONS = {
+    "US": 335, "GB": 68, "IN": 1429, "DE": 84, "FR": 68, "CA": 40, "AU": 27, "JP": 124, "BR": 216,
+    "IT": 59, "ES": 48, "MX": 128, "KR": 52, "CN": 1410, "RU": 144, "NL": 18, "SE": 10.5, "NO": 5.5,
+    "DK": 5.9, "FI": 5.6, "CH": 8.8, "AT": 9.1, "BE": 11.7, "PT": 10.4, "PL": 37, "CZ": 10.9, "HU": 9.6,
+    "GR": 10.4, "TR": 85, "ZA": 60, "NZ": 5.2, "SG": 5.9, "HK": 7.5, "AE": 9.5, "SA": 36, "IL": 9.7,
+    "TH": 72, "VN": 99, "PH": 117, "ID": 278, "MY": 34, "AR": 46, "CL": 19.6, "CO": 52, "PE": 34,
+    "EG": 113, "NG": 224, "KE": 55, "MA": 37,
+}
+
+# Card variants picked by card_type "Random", and their approximate share of card payments
+CARD_BRANDS = ("Visa", "Mastercard", "American Express")
+CARD_BRAND_SHARES = {"Visa": 61, "Mastercard": 26, "American Express": 13}
+
+def compile_locale_format(spec: dict):
+    """Turn a locale format into a %-template and its field sequences in template order"""
+    names = []
+    def field(match):
+        names.append(match.group(1))
+        return "%s"
+    template = re.sub(r"\{(\w+)\}", field, spec["format"].replace("%", "%%"))
+    return template, tuple(spec["fields"][name] for name in names)
+
+def render_locale_format(compiled, rng=random) -> str:
+    """Render a compiled locale format, drawing each field from its sequence"""
+    template, fields = compiled
+    return template % tuple(map(rng.choice, fields))
+
+ADDRESS_TEMPLATES = {country: compile_locale_format(spec) for country, spec in ADDRESS_FORMATS.items()}
+DEFAULT_ADDRESS_TEMPLATE = compile_locale_format(DEFAULT_ADDRESS_FORMAT)
+PHONE_TEMPLATES = {country: compile_locale_format(spec) for country, spec in PHONE_FORMATS.items()}
+DEFAULT_PHONE_TEMPLATE = compile_locale_format(DEFAULT_PHONE_FORMAT)
+
+
 # ============ API Endpoints ============
 
 @app.get("/api/types")
-async def get_types():
+async def get_types(request: Request):
     """Get all data types"""
-    return [{"type": t["type"], "name": t["name"], "icon": t["icon"], "category": t["category"]} for t in DATA_TYPES]
+    return precomputed_response(request, TYPES_RESPONSE)
 
 @app.get("/api/types/{type_id}")
-async def get_type_config(type_id: str):
+async def get_type_config(type_id: str, request: Request):
     """Get configuration options for a specific type"""
-    t = next((t for t in DATA_TYPES if t["type"] == type_id), None)
-    if not t:
+    resource = TYPE_CONFIG_RESPONSES.get(type_id)
+    if resource is None:
         raise HTTPException(status_code=404, detail="Type not found")
-    return {
-        "type": t["type"],
-        "name": t["name"],
-        "icon": t["icon"],
-        "category": t["category"],
-        "supports_prefix_suffix": t["supports_prefix_suffix"],
-        "options": t.get("options", [])
-    }
+    return precomputed_response(request, resource)
 
 @app.get("/api/categories")
-async def get_categories():
+async def get_categories(request: Request):
     """Get all categories with their types"""
-    result = []
-    for cat in sorted(CATEGORIES, key=lambda x: x["order"]):
-        types = [{"type": t["type"], "name": t["name"], "icon": t["icon"]} 
-                 for t in DATA_TYPES if t["category"] == cat["id"]]
-        result.append({"id": cat["id"], "name": cat["name"], "icon": cat["icon"], "types": types})
-    return result
+    return precomputed_response(request, CATEGORIES_RESPONSE)
 
 @app.post("/api/generate")
-async def generate_data(request: GenerateRequest):
+async def generate_data(request: GenerateRequest, http_request: Request):
     """Generate test data"""
+    check_count(request.count)
+    start, stop = shard_bounds(request.count, request.shard, request.shards, request.seed)
+    spec = resolve_request(request)
+    profiling = profile_requested(request, http_request)
+    parsed = time.perf_counter()
+    
+    # Stream rows as NDJSON when asked to, so memory stays flat for any count
+    if request.stream or "application/x-ndjson" in http_request.headers.get("accept", ""):
+        if profiling:
+            raise HTTPException(status_code=400, detail="Streamed requests cannot be profiled")
+        lines = ndjson_lines(LimitedStream(iter_value_chunks(spec, start, stop - start), output_size(spec, stop - start)))
+        if METRICS_ENABLED:
+            started = getattr(http_request.state, "started", parsed)
+            STAGE_SECONDS.observe((spec.type_id, "parse"), parsed - started)
+            lines = metered_stream(spec.type_id, lines, started)
+        return compressed_stream(http_request, lines, "application/x-ndjson")
+    
+    # Values are encoded chunk by chunk as they are generated, off the event loop for large counts
+    count = stop - start
+    extra = {}
+    if profiling or sample_profile():
+        profiler = cProfile.Profile()
+        array, generate_seconds = await run_generation(output_size(spec, count), profiler.runcall, generate_json_array, spec, start, count)
+        report = save_profile(profiler, spec.type_id)
+        if profiling:
+            extra["profile"] = report
+    else:
+        data = value_pools.take(spec, count) if VALUE_POOL_ENABLED else None
+        if data is None:
+            array, generate_seconds = await run_generation(output_size(spec, count), generate_json_array, spec, start, count)
+        else:
+            array, generate_seconds = json_bytes(data), 0.0
+    body = json_envelope(array, **extra)
+    serialized = time.perf_counter()
+    response = await compressed_response(http_request, body)
+    if METRICS_ENABLED:
+        started, finished = getattr(http_request.state, "started", parsed), time.perf_counter()
+        record_request(spec.type_id, count, len(body), finished - started, parse=parsed - started,
+                       generate=generate_seconds, serialize=serialized - parsed - generate_seconds,
+                       compress=finished - serialized)
+    return response
+
+@app.post("/api/generate/batch")
+async def generate_data_batch(request: BatchRequest, http_request: Request):
+    """Generate several types in one round trip; each spec gets its own data or error"""
+    if not request.specs:
+        raise HTTPException(status_code=400, detail="At least one spec is required")
+    if len(request.specs) > MAX_BATCH_SPECS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SPECS} specs are allowed per batch")
+    keys = [spec.key or spec.type for spec in request.specs]
+    if len(set(keys)) != len(keys):
+        raise HTTPException(status_code=400, detail="Spec keys must be unique; set key on specs that repeat a type")
+    check_count(sum(max(spec.count, 0) for spec in request.specs))
+    # Sized from the raw options, since specs are validated one by one inside the slot
+    size = sum(output_size(GeneratorSpec(spec.type, spec.options), spec.count) for spec in request.specs)
+    
+    # The whole batch holds one slot and generates its specs together in it
+    with generation_slot(size):
+        results = await asyncio.gather(*(generate_batch_spec(spec, key, request.seed)
+                                         for spec, key in zip(request.specs, keys)))
+    return await compressed_response(http_request, json_bytes({
+        "success": all("data" in result for result in results),
+        "message": random.choice(FUN_MESSAGES),
+        "results": dict(zip(keys, results))
+    }))
+
+async def generate_batch_spec(spec: BatchSpec, key: str, seed: Optional[int] = None) -> dict:
+    """{"data": [...]} for one batch spec, or {"error": ..., "status": ...} if it fails; runs in the batch's slot"""
+    try:
+        check_count(spec.count)
+        rejected = [name for name in BATCH_REJECTED_OPTIONS if name in spec.options]
+        if seed is not None and "seed" in spec.options:
+            rejected.append("seed")
+        if rejected:
+            return {"error": f"{rejected[0]} cannot be set in batch spec options", "status": 400}
+        fields = {**spec.options, "type": spec.type, "count": spec.count}
+        if seed is not None:
+            fields["seed"] = derive_seed(seed, key)
+        try:
+            request = GenerateRequest(**fields)
+        except ValidationError as e:
+            return {"error": e.errors(include_url=False), "status": 422}
+        resolved = resolve_request(request)
+        began = time.perf_counter()
+        data = value_pools.take(resolved, spec.count) if VALUE_POOL_ENABLED else None
+        if data is None:
+            data = await run_off_loop(output_size(resolved, spec.count), generate_values, resolved, 0, spec.count)
+        if METRICS_ENABLED:
+            elapsed = time.perf_counter() - began
+            record_request(resolved.type_id, len(data), 0, elapsed, generate=elapsed)
+        return {"data": as_list(data)}
+    except HTTPException as e:
+        return {"error": e.detail, "status": e.status_code}
+    except UniqueSpaceExhausted as e:
+        return {"error": str(e), "status": 400}
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics"""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(registry.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/api/pools")
+async def get_value_pools():
+    """Value pool hit/miss counters and sizes"""
+    return value_pools.stats()
+
+@app.post("/api/export")
+async def export_data(request: GenerateRequest, http_request: Request, format: str = "csv", table: str = "test_data"):
+    """Stream test data as a CSV, JSONL, SQL INSERT or Parquet file"""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown export format: {format}")
+    if format == "parquet" and exporters.pa is None:
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+    check_count(request.count)
+    start, stop = shard_bounds(request.count, request.shard, request.shards, request.seed)
+    spec = resolve_request(request)
+    
+    column = request.type
+    chunks = ({column: values} for values in iter_value_chunks(spec, start, stop - start))
+    file_format = EXPORT_FORMATS[format]
+    return compressed_stream(
+        http_request,
+        LimitedStream(export_stream(format, chunks, [column], table), output_size(spec, stop - start)),
+        file_format["media_type"],
+        {"Content-Disposition": f'attachment; filename="{request.type}.{file_format["extension"]}"'},
+        compressible=not file_format.get("compressed"),
+    )
+
+@app.post("/api/records")
+async def generate_records(request: RecordsRequest, http_request: Request, format: Optional[str] = None, table: str = "test_data"):
+    """Generate multi-column records, column by column"""
+    names = check_records_request(request, format)
+    check_count(request.count)
+    start, stop = shard_bounds(request.count, request.shard, request.shards, request.seed)
+    columns = [(c.name, resolve_column(c, request.seed, request.count)) for c in request.columns]
+    size = sum(output_size(spec, stop - start) for _, spec in columns)
+    
+    if format:
+        file_format = EXPORT_FORMATS[format]
+        return compressed_stream(
+            http_request,
+            LimitedStream(export_stream(format, iter_record_chunks(columns, start, stop - start), names, table), size),
+            file_format["media_type"],
+            {"Content-Disposition": f'attachment; filename="{table}.{file_format["extension"]}"'},
+            compressible=not file_format.get("compressed"),
+        )
+    
+    return await compressed_response(http_request, json_bytes({
+        "success": True,
+        "message": random.choice(FUN_MESSAGES),
+        "columns": names,
+        "data": await run_generation(size, generate_rows, columns, start, stop - start)
+    }))
+
+def check_records_request(request: RecordsRequest, format: Optional[str]) -> List[str]:
+    """Validate the columns and export format of a records request; returns the column names"""
+    if not request.columns:
+        raise HTTPException(status_code=400, detail="At least one column is required")
+    names = [c.name for c in request.columns]
+    if len(set(names)) != len(names):
+        raise HTTPException(status_code=400, detail="Column names must be unique")
+    if format is not None and format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown export format: {format}")
+    if format == "parquet" and exporters.pa is None:
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+    return names
+
+@app.post("/api/jobs", status_code=202)
+async def create_job(request: RecordsRequest, format: str = "csv", table: str = "test_data", gzip: bool = False):
+    """Generate records into a file in the background; returns the job id at once"""
+    names = check_records_request(request, format)
+    check_count(request.count, JOB_MAX_COUNT)
+    start, stop = shard_bounds(request.count, request.shard, request.shards, request.seed)
+    columns = [(c.name, resolve_column(c, request.seed, request.count)) for c in request.columns]
+    
+    file_format = EXPORT_FORMATS[format]
+    job = job_store.submit(
+        iter_record_chunks(columns, start, stop - start, JOB_CHUNK_SIZE),
+        partial(export_stream, format, columns=names, table=table),
+        stop - start, f"{table}.{file_format['extension']}", file_format["media_type"], compress=gzip,
+    )
+    return {**job.progress(), "progress_url": f"/api/jobs/{job.id}", "download_url": f"/api/jobs/{job.id}/download"}
+
+@app.get("/api/jobs")
+async def list_jobs():
+    """Progress of every job that has not expired yet"""
+    return [job.progress() for job in job_store.jobs.values()]
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Rows done, rows/sec and ETA of a job"""
+    return find_job(job_id).progress()
+
+@app.delete("/api/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job, or delete a finished job and its file"""
+    job = find_job(job_id)
+    job_store.cancel(job)
+    return job.progress()
+
+@app.get("/api/jobs/{job_id}/download")
+async def download_job(job_id: str):
+    """The finished job's file; supports Range requests for resuming"""
+    job = find_job(job_id)
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return FileResponse(job.path, media_type=job.media_type, filename=job.filename)
+
+def find_job(job_id: str):
+    job = job_store.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+def resolve_column(column: ColumnSpec, seed: Optional[int] = None, count: int = 5):
+    """Validate a schema column and resolve its options once"""
+    # Each column draws from its own sub-stream of the records seed
+    column_seed = derive_seed(seed, column.name) if seed is not None else None
+    try:
+        request = GenerateRequest(**{**column.options, "type": column.type, "seed": column_seed, "count": count})
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid options for column {column.name}: {e.errors(include_url=False)}")
+    try:
+        return resolve_request(request)
+    except HTTPException as e:
+        raise HTTPException(status_code=e.status_code, detail=f"Column {column.name}: {e.detail}")
+
+def generate_columns(columns, start: int, count: int) -> dict:
+    """Generate count values for each resolved (name, spec) column"""
+    return {name: generate_values(spec, start, count) for name, spec in columns}
+
+def generate_rows(columns, start: int, count: int) -> List[dict]:
+    """Generate columns and zip them into row dicts"""
+    data = generate_columns(columns, start, count)
+    names = [name for name, _ in columns]
+    return [dict(zip(names, row)) for row in zip(*[data[name] for name in names])]
+
+def iter_record_chunks(columns, start: int, count: int, chunk_size: int = STREAM_CHUNK_SIZE):
+    """Yield column chunks of at most chunk_size rows"""
+    generators = [(name, bind_generator(*spec, start=start)) for name, spec in columns]
+    for offset in range(0, count, chunk_size):
+        n = min(chunk_size, count - offset)
+        yield {name: generate(n) for name, generate in generators}
+
+def resolve_request(request: GenerateRequest) -> "GeneratorSpec":
+    """Validate a request and resolve its generator options once"""
     t = next((t for t in DATA_TYPES if t["type"] == request.type), None)
     if not t:
         raise HTTPException(status_code=400, detail=f"Unknown type: {request.type}")
@@ -368,9 +1095,8 @@ async def generate_data(request: GenerateRequest):
     prefix = request.prefix if t["supports_prefix_suffix"] else None
     suffix = request.suffix if t["supports_prefix_suffix"] else None
     
-    results = []
     request_dict = request.model_dump()
-    options = {k: v for k, v in request_dict.items() if k not in ["type", "count", "prefix", "suffix"] and v is not None}
+    options = {k: v for k, v in request_dict.items() if k not in REQUEST_FIELDS and v is not None}
     
     # For username, check if prefix option is sent separately
     if request.type == "username" and request.prefix:
@@ -383,139 +1109,787 @@ async def generate_data(request: GenerateRequest):
         prefix = prefix[:8]
     if suffix and len(suffix) > 12:
         suffix = suffix[:12]
+    try:
+        compile_generator(request.type, options)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    for _ in range(request.count):
-        value = generate_by_type(request.type, options)
+    seed = request.seed
+    if request.unique:
+        space = UNIQUE_SPACES.get(request.type)
+        size = space(options)[0] if space else None
+        if size is not None and request.count > size:
+            raise HTTPException(status_code=400, detail=f"Only {size} unique {request.type} values exist for these options")
+        # Every chunk of a unique request must walk the same permutation / stream
+        if seed is None:
+            seed = random.getrandbits(64)
+    return GeneratorSpec(request.type, options, prefix, suffix, seed, bool(request.unique))
+
+def derive_seed(*parts) -> int:
+    """Derive an independent 128-bit seed from a base seed and sub-stream keys"""
+    digest = hashlib.blake2b(":".join(map(str, parts)).encode(), digest_size=16).digest()
+    return int.from_bytes(digest, "big")
+
+def shard_bounds(count: int, shard: Optional[int], shards: Optional[int], seed: Optional[int]):
+    """Row range [start, stop) covered by shard k of N"""
+    if shard is None and shards is None:
+        return 0, count
+    shards = shards or 1
+    shard = shard or 0
+    if seed is None:
+        raise HTTPException(status_code=400, detail="Sharded generation requires a seed")
+    if shards < 1 or not 0 <= shard < shards:
+        raise HTTPException(status_code=400, detail="shard must be between 0 and shards - 1")
+    return count * shard // shards, count * (shard + 1) // shards
+
+def bind_generator(type_id: str, options: dict, prefix: str = None, suffix: str = None, seed: int = None, unique: bool = False, start: int = 0):
+    """Compile the per-row and batch generators for a type; returns a function producing n values
+    
+    Every bound generator owns its RNG. With a seed, rows are produced in SEED_BLOCK_SIZE blocks
+    whose RNG is seeded from (seed, block index), so row i is the same no matter how the range
+    is split up - start lets a shard pick up at any row.
+    """
+    if unique:
+        return bind_unique_generator(type_id, options, prefix, suffix, seed, start)
+    rng = random.Random()
+    generate = compile_generator(type_id, options, rng)
+    batch = compile_batch(type_id, options, rng)
+    
+    def finish(results):
         # Apply prefix/suffix by replacing parts of UUID (standard format)
-        if request.type == "uuid":
-            # Standard UUID: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx
-            # Remove all hyphens for processing
-            hex_uuid = value.replace('-', '')
-            # Replace first 8 hex chars with prefix
-            if prefix:
-                hex_uuid = prefix + hex_uuid[8:]
-            # Replace last 12 hex chars with suffix
-            if suffix:
-                hex_uuid = hex_uuid[:-12] + suffix
-            # Reconstruct standard UUID format: 8-4-4-4-12
-            value = f"{hex_uuid[:8]}-{hex_uuid[8:12]}-{hex_uuid[12:16]}-{hex_uuid[16:20]}-{hex_uuid[20:]}"
-        results.append(value)
-    
-    return {
-        "success": True,
-        "message": random.choice(FUN_MESSAGES),
-        "data": results
-    }
+        if type_id == "uuid" and (prefix or suffix):
+            results = [apply_uuid_prefix_suffix(value, prefix, suffix) for value in results]
+        return results
+    
+    if seed is None:
+        def values(n: int) -> List[str]:
+            if n >= BATCH_THRESHOLD:
+                return finish(batch(n))
+            return finish([generate() for _ in range(n)])
+        return values
+    
+    position = start
+    block_index = None
+    block_values = []
+    
+    def seeded_values(n: int) -> List[str]:
+        nonlocal position, block_index, block_values
+        pieces = []
+        end = position + n
+        while position < end:
+            index, offset = divmod(position, SEED_BLOCK_SIZE)
+            if index != block_index:
+                rng.seed(derive_seed(seed, index))
+                block_index, block_values = index, batch(SEED_BLOCK_SIZE)
+            take = min(end - position, SEED_BLOCK_SIZE - offset)
+            pieces.append(block_values[offset:offset + take])
+            position += take
+        return finish(concat(pieces))
+    return seeded_values
+
+def bind_unique_generator(type_id: str, options: dict, prefix: str, suffix: str, seed: int, start: int):
+    """Like bind_generator, but no value repeats within the request
+    
+    Types with an enumerable value space walk a seeded permutation of it, so row i is
+    computed directly. Other types filter the ordinary seeded stream from row 0, so a
+    shard starting at row k first has to skip k distinct values.
+    """
+    space = UNIQUE_SPACES.get(type_id)
+    if space is not None:
+        size, decode = space(options)
+        permutation = FeistelPermutation(size, derive_seed(seed, "unique"))
+        position = start
+        
+        def permuted_values(n: int) -> List[str]:
+            nonlocal position
+            indices = permutation.take(position, n)
+            position += n
+            return decode(indices)
+        return permuted_values
+    
+    distinct = iter_unique(bind_generator(type_id, options, prefix, suffix, seed), UNIQUE_MAX_RETRIES)
+    for _ in islice(distinct, start):
+        pass
+    return lambda n: list(islice(distinct, n))
+
+class GeneratorSpec(NamedTuple):
+    """Everything needed to rebuild a request's generator, in this process or a worker"""
+    type_id: str
+    options: dict
+    prefix: Optional[str] = None
+    suffix: Optional[str] = None
+    seed: Optional[int] = None
+    unique: bool = False
+
+def generate_values(spec: GeneratorSpec, start: int, count: int) -> List[str]:
+    """Generate count values, fanning large counts out to the process pool"""
+    if use_process_pool(spec, count):
+        return concat(iter_parallel_chunks(spec, start, count))
+    return bind_generator(*spec, start=start)(count)
+
+def iter_value_chunks(spec: GeneratorSpec, start: int, count: int, chunk_size: int = STREAM_CHUNK_SIZE):
+    """Yield generated values in order, in lists of at most chunk_size (or pool chunks)"""
+    if use_process_pool(spec, count):
+        yield from iter_parallel_chunks(spec, start, count)
+        return
+    generate = bind_generator(*spec, start=start)
+    for offset in range(0, count, chunk_size):
+        yield generate(min(chunk_size, count - offset))
+
+# ============ Value Pools ============
+# The UI asks for ~10 values every time an option changes. Those small unseeded
+# requests are served from per-(type, options) pools that a background task
+# keeps topped up, so they skip generation entirely when the pool is warm.
+
+class ValuePools:
+    """LRU map of (type, options) keys to deques of pre-generated values"""
+    
+    def __init__(self, size: int, max_keys: int, idle_seconds: float):
+        self.size = size
+        self.max_keys = max_keys
+        self.idle_seconds = idle_seconds
+        self.hits = 0
+        self.misses = 0
+        self._pools = OrderedDict()
+        self._wakeup = asyncio.Event()
+    
+    @staticmethod
+    def key(spec: GeneratorSpec) -> str:
+        return json.dumps([spec.type_id, spec.options, spec.prefix, spec.suffix], sort_keys=True, default=str)
+    
+    def take(self, spec: GeneratorSpec, count: int) -> Optional[List[str]]:
+        """Pop count pooled values; None on a miss, which also schedules a refill"""
+        if spec.seed is not None or spec.unique or count > INLINE_MAX_COUNT:
+            return None
+        key = self.key(spec)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = {"spec": spec, "values": deque()}
+            while len(self._pools) > self.max_keys:
+                self._pools.popitem(last=False)
+        else:
+            self._pools.move_to_end(key)
+        pool["last_used"] = time.monotonic()
+        
+        values = pool["values"]
+        if len(values) < count:
+            self.misses += 1
+            self._wakeup.set()
+            return None
+        self.hits += 1
+        taken = [values.popleft() for _ in range(count)]
+        if len(values) < self.size // 2:
+            self._wakeup.set()
+        return taken
+    
+    async def run(self):
+        """Refill task: top up every pool that has fallen below half its size"""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.idle_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            
+            idle_before = time.monotonic() - self.idle_seconds
+            for key, pool in list(self._pools.items()):
+                if pool["last_used"] < idle_before:
+                    del self._pools[key]
+                elif len(pool["values"]) < self.size // 2:
+                    missing = self.size - len(pool["values"])
+                    try:
+                        pool["values"].extend(await asyncio.to_thread(generate_values, pool["spec"], 0, missing))
+                    except Exception:
+                        # Let requests for this key fall back to (and report errors from) normal generation
+                        self._pools.pop(key, None)
+    
+    def stats(self) -> dict:
+        return {
+            "enabled": VALUE_POOL_ENABLED,
+            "hits": self.hits,
+            "misses": self.misses,
+            "keys": len(self._pools),
+            "values": sum(len(pool["values"]) for pool in self._pools.values()),
+        }
+
+value_pools = ValuePools(VALUE_POOL_SIZE, VALUE_POOL_MAX_KEYS, VALUE_POOL_IDLE_SECONDS)
+
+# ============ Metrics ============
+# Per-type request, row and byte counters and latency histograms for /metrics.
+# Everything is recorded once per request (once per chunk when streaming), never per row.
+
+registry = metrics.Registry()
+REQUESTS = registry.register(metrics.Counter("tdg_requests_total", "Completed /api/generate requests (each batch spec counts as one)", ["type"]))
+ROWS = registry.register(metrics.Counter("tdg_rows_generated_total", "Values returned by /api/generate and /api/generate/batch", ["type"]))
+RESPONSE_BYTES = registry.register(metrics.Counter("tdg_response_bytes_total", "Response body bytes produced by /api/generate, before compression", ["type"]))
+REQUEST_SECONDS = registry.register(metrics.Histogram("tdg_request_duration_seconds", "Time from request arrival to the last response byte", ["type"]))
+STAGE_SECONDS = registry.register(metrics.Histogram("tdg_stage_duration_seconds", "Time spent per request stage: parse, generate, serialize, compress", ["type", "stage"]))
+registry.register(metrics.Callback("tdg_value_pool_hits_total", "Requests served from a value pool", "counter", lambda: value_pools.hits))
+registry.register(metrics.Callback("tdg_value_pool_misses_total", "Pool-eligible requests that had to generate", "counter", lambda: value_pools.misses))
+registry.register(metrics.Callback("tdg_value_pool_values", "Values currently held in value pools", "gauge", lambda: value_pools.stats()["values"]))
+
+class RequestTimer:
+    """ASGI middleware that stamps each request's arrival time, so metrics include body parsing"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            scope.setdefault("state", {})["started"] = time.perf_counter()
+        await self.app(scope, receive, send)
+
+if METRICS_ENABLED:
+    app.add_middleware(RequestTimer)
+
+def record_request(type_id: str, rows: int, size: int, seconds: float, **stages):
+    labels = (type_id,)
+    REQUESTS.inc(labels)
+    ROWS.inc(labels, rows)
+    RESPONSE_BYTES.inc(labels, size)
+    REQUEST_SECONDS.observe(labels, seconds)
+    for stage, stage_seconds in stages.items():
+        STAGE_SECONDS.observe((type_id, stage), stage_seconds)
+
+def metered_stream(type_id: str, lines, started: float):
+    """Pass NDJSON chunks through, recording rows and bytes once the stream ends"""
+    rows = size = 0
+    try:
+        for chunk in lines:
+            rows += chunk.count(b"\n")
+            size += len(chunk)
+            yield chunk
+    finally:
+        record_request(type_id, rows, size, time.perf_counter() - started)
+
+# ============ Profiling ============
+# profile=true (or an X-Profile: 1 header) from an admin runs generation and
+# serialization under cProfile and returns the top functions by cumulative time.
+
+_sampled_requests = 0
+
+def profile_requested(request: GenerateRequest, http_request: Request) -> bool:
+    """Whether the request asks to be profiled; raises 403 unless it carries the admin token"""
+    if not (request.profile or http_request.headers.get("x-profile", "").lower() in ("1", "true")):
+        return False
+    token = http_request.headers.get("x-admin-token", "")
+    if not ADMIN_TOKEN or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Profiling requires a valid X-Admin-Token")
+    return True
+
+def sample_profile() -> bool:
+    """True for 1 in PROFILE_SAMPLE_RATE requests, when there is somewhere to save them"""
+    global _sampled_requests
+    if not (PROFILE_SAMPLE_RATE and PROFILE_DIR):
+        return False
+    _sampled_requests += 1
+    return _sampled_requests % PROFILE_SAMPLE_RATE == 0
+
+def save_profile(profiler: cProfile.Profile, type_id: str) -> dict:
+    """Top functions by cumulative time, after saving the stats to PROFILE_DIR if configured"""
+    stats = pstats.Stats(profiler).sort_stats("cumulative")
+    report = {"total_seconds": round(stats.total_tt, 6), "file": None, "top": []}
+    if PROFILE_DIR:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        report["file"] = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{type_id}-{uuid.uuid4().hex[:8]}.pstats")
+        stats.dump_stats(report["file"])
+    for func in stats.fcn_list[:PROFILE_TOP]:
+        primitive_calls, calls, own_time, cumulative_time, _ = stats.stats[func]
+        report["top"].append({
+            "function": pstats.func_std_string(func),
+            "calls": calls,
+            "primitive_calls": primitive_calls,
+            "own_seconds": round(own_time, 6),
+            "cumulative_seconds": round(cumulative_time, 6),
+        })
+    return report
+
+# ============ Admission Control ============
+# Generation runs in a bounded thread pool so large requests never block the event
+# loop; when every slot is busy, new work is rejected at once instead of queueing.
+
+_generation_slots = threading.BoundedSemaphore(MAX_CONCURRENT_GENERATIONS)
+_generation_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_GENERATIONS, thread_name_prefix="generate")
+
+def check_count(count: int, limit: int = MAX_COUNT):
+    if count < 0 or count > limit:
+        raise HTTPException(status_code=400, detail=f"count must be between 0 and {limit}")
+
+# Estimated bytes per value for types whose options set their size
+VALUE_SIZES = {
+    "password": lambda o: o.get("length", 16),
+    "barcode": lambda o: o.get("length", 13),
+    "paragraph": lambda o: int(o.get("max_sentences", 6)) * 60,
+    "pattern": lambda o: compile_pattern(o.get("template") or DEFAULT_PATTERN).width,
+}
+
+def output_size(spec: GeneratorSpec, count: int) -> int:
+    """Rough bytes of output for count values of spec, to decide whether it can run inline"""
+    try:
+        size = int(VALUE_SIZES[spec.type_id](spec.options)) if spec.type_id in VALUE_SIZES else 0
+    except (TypeError, ValueError, OverflowError):
+        # Malformed options are rejected when the generator is compiled
+        size = 0
+    return max(count, 0) * max(size, DEFAULT_VALUE_BYTES)
+
+def acquire_generation_slot():
+    if not _generation_slots.acquire(blocking=False):
+        raise HTTPException(status_code=503, detail="Server is busy, please retry shortly", headers={"Retry-After": "1"})
+
+@contextmanager
+def generation_slot(size: int):
+    """Hold a generation slot for the block; requests with a small output_size need none"""
+    if size <= INLINE_MAX_BYTES:
+        yield
+        return
+    acquire_generation_slot()
+    try:
+        yield
+    finally:
+        _generation_slots.release()
+
+async def run_off_loop(size: int, fn, *args):
+    """Run fn(*args) on the generation executor, or inline for small requests; the caller holds the slot"""
+    if size <= INLINE_MAX_BYTES:
+        return fn(*args)
+    return await asyncio.get_running_loop().run_in_executor(_generation_executor, partial(fn, *args))
+
+async def run_generation(size: int, fn, *args):
+    """Run fn(*args) off the event loop under a generation slot; small requests run inline"""
+    with generation_slot(size):
+        return await run_off_loop(size, fn, *args)
+
+class LimitedStream:
+    """Iterator that holds a generation slot until it is exhausted or discarded; small streams need none"""
+    
+    def __init__(self, chunks, size: int):
+        self._chunks = iter(chunks)
+        if size <= INLINE_MAX_BYTES:
+            self._release = lambda: None
+            return
+        acquire_generation_slot()
+        self._release = weakref.finalize(self, _generation_slots.release)
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        try:
+            return next(self._chunks)
+        except BaseException:
+            self._release()
+            raise
+
+# ============ Bulk Jobs ============
+# Jobs run on their own small thread pool rather than taking generation slots,
+# since a single job may run for minutes.
+
+job_store = JobStore(JOB_DIR, JOB_WORKERS, JOB_RETENTION_SECONDS)
+
+async def expire_jobs():
+    """Sweep expired job files every JOB_SWEEP_SECONDS"""
+    while True:
+        await asyncio.to_thread(job_store.expire)
+        await asyncio.sleep(JOB_SWEEP_SECONDS)
+
+# ============ Process Pool ============
+
+_process_pool = None
+# Executor threads and job threads may ask for the pool at the same time
+_process_pool_lock = threading.Lock()
+
+def use_process_pool(spec: GeneratorSpec, count: int) -> bool:
+    # Hash-filtered unique streams are sequential and cannot be split across workers
+    if spec.unique and spec.type_id not in UNIQUE_SPACES:
+        return False
+    return PROCESS_POOL_WORKERS > 1 and count >= PARALLEL_THRESHOLD
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Persistent worker pool, created on first use"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=PROCESS_POOL_WORKERS)
+        return _process_pool
+
+def shutdown_process_pool():
+    global _process_pool
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+def generate_chunk(spec: GeneratorSpec, start: int, count: int) -> List[str]:
+    """Worker entry point: generate rows [start, start + count) of a request"""
+    return bind_generator(*spec, start=start)(count)
+
+def iter_parallel_chunks(spec: GeneratorSpec, start: int, count: int):
+    """Generate PARALLEL_CHUNK_SIZE chunks across the pool, yielding them in order
+    
+    At most two chunks per worker are in flight, so memory stays bounded when the
+    consumer (e.g. a streaming response) is slower than the workers.
+    """
+    pool = get_process_pool()
+    pending = deque()
+    try:
+        for offset in range(start, start + count, PARALLEL_CHUNK_SIZE):
+            n = min(PARALLEL_CHUNK_SIZE, start + count - offset)
+            pending.append(pool.submit(generate_chunk, spec, offset, n))
+            if len(pending) >= 2 * PROCESS_POOL_WORKERS:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+def ndjson_lines(chunks):
+    """Encode chunks of values as NDJSON, one JSON string per line"""
+    for values in chunks:
+        if isinstance(values, COLUMN_TYPES) and values.json_safe():
+            yield values.frame(b'"', b'"\n')
+        elif values:
+            yield b"\n".join(map(json_value_bytes, values)) + b"\n"
+
+# ============ JSON Encoding ============
+# Generation responses are encoded with orjson when it is installed, directly to
+# bytes, skipping FastAPI's jsonable_encoder pass over every value. Output matches
+# Starlette's JSONResponse: compact separators, non-ASCII characters kept as UTF-8.
+
+if orjson is not None:
+    json_bytes = json_value_bytes = orjson.dumps
+else:
+    def json_bytes(content) -> bytes:
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+    json_value_bytes = json_bytes
+
+def generate_json_array(spec: GeneratorSpec, start: int, count: int, chunk_size: int = JSON_CHUNK_SIZE):
+    """Generate count values straight into an encoded JSON array
+    
+    Returns (array bytes, seconds spent generating); each chunk is encoded as soon as it
+    is generated, so only its bytes outlive it.
+    """
+    parts = []
+    generate_seconds = 0.0
+    chunks = iter_value_chunks(spec, start, count, chunk_size)
+    while True:
+        began = time.perf_counter()
+        values = next(chunks, None)
+        generate_seconds += time.perf_counter() - began
+        if values is None:
+            break
+        if values:
+            parts.append(encode_json_array(values)[1:-1])
+    return b"[" + b",".join(parts) + b"]", generate_seconds
+
+def encode_json_array(values) -> bytes:
+    """JSON array of a list or column of values; columns are framed without per-value objects"""
+    if isinstance(values, COLUMN_TYPES):
+        return values.json_array(json_bytes)
+    return json_bytes(values)
+
+def json_envelope(array: bytes, **extra) -> bytes:
+    """The /api/generate response body around an already encoded data array"""
+    body = b'{"success":true,"message":' + json_bytes(random.choice(FUN_MESSAGES)) + b',"data":' + array
+    for key, value in extra.items():
+        body += b"," + json_bytes(key) + b":" + json_bytes(value)
+    return body + b"}"
+
+# ============ Precomputed Responses ============
+# Metadata endpoints and index.html never change while the server runs, so their
+# bodies are encoded (and compressed) once at import. Each variant gets a strong
+# ETag, and a request whose If-None-Match matches gets an empty 304.
+
+class Precomputed(NamedTuple):
+    media_type: str
+    cache_control: str
+    # content-coding ("identity", "br", "zstd", "gzip") -> (body, ETag), in order of preference
+    variants: dict
+
+def precompute(body: bytes, media_type: str, cache_control: str) -> Precomputed:
+    encoded = {}
+    if len(body) >= COMPRESS_MIN_SIZE:
+        if brotli is not None:
+            encoded["br"] = brotli.compress(body, quality=11)
+        for coding in compression.CODINGS:
+            encoded[coding] = compression.compress(body, coding, compression.MAX_LEVELS[coding])
+    encoded["identity"] = body
+    tag = hashlib.sha256(body).hexdigest()[:32]
+    return Precomputed(media_type, cache_control, {
+        coding: (data, f'"{tag}"' if coding == "identity" else f'"{tag}-{coding}"')
+        for coding, data in encoded.items() if coding == "identity" or len(data) < len(body)
+    })
+
+def precompute_json(content) -> Precomputed:
+    return precompute(json_bytes(content), "application/json", "no-cache")
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+def precomputed_response(request: Request, resource: Precomputed) -> Response:
+    allowed = compression.allowed_codings(request.headers.get("accept-encoding", ""), resource.variants)
+    coding = next(c for c in resource.variants if c in allowed or c == "identity")
+    body, etag = resource.variants[coding]
+    headers = {"ETag": etag, "Cache-Control": resource.cache_control}
+    if len(resource.variants) > 1:
+        headers["Vary"] = "Accept-Encoding"
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if coding != "identity":
+        headers["Content-Encoding"] = coding
+    return Response(body, media_type=resource.media_type, headers=headers)
+
+TYPES_RESPONSE = precompute_json(
+    [{"type": t["type"], "name": t["name"], "icon": t["icon"], "category": t["category"]} for t in DATA_TYPES]
+)
+TYPE_CONFIG_RESPONSES = {
+    t["type"]: precompute_json({
+        "type": t["type"],
+        "name": t["name"],
+        "icon": t["icon"],
+        "category": t["category"],
+        "supports_prefix_suffix": t["supports_prefix_suffix"],
+        "options": t.get("options", []),
+    })
+    for t in DATA_TYPES
+}
+CATEGORIES_RESPONSE = precompute_json([
+    {"id": cat["id"], "name": cat["name"], "icon": cat["icon"],
+     "types": [{"type": t["type"], "name": t["name"], "icon": t["icon"]} for t in DATA_TYPES if t["category"] == cat["id"]]}
+    for cat in sorted(CATEGORIES, key=lambda x: x["order"])
+])
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "index.html"), "rb") as f:
+    INDEX_RESPONSE = precompute(f.read(), "text/html; charset=utf-8", f"public, max-age={INDEX_MAX_AGE}")
+
+# ============ Response Compression ============
+# Generated data is compressed on the fly for clients whose Accept-Encoding
+# allows it. Buffered bodies below COMPRESS_MIN_SIZE are left alone; streams
+# cannot know their size up front, so they are always compressed, chunk by chunk.
+
+def response_coding(http_request: Request) -> Optional[str]:
+    if not COMPRESSION_ENABLED:
+        return None
+    return compression.negotiate(http_request.headers.get("accept-encoding", ""))
+
+async def compressed_response(http_request: Request, body: bytes, media_type: str = "application/json") -> Response:
+    """A Response with body compressed in the negotiated coding, if it is large enough"""
+    headers = {"Vary": "Accept-Encoding"} if COMPRESSION_ENABLED else {}
+    coding = response_coding(http_request) if len(body) >= COMPRESS_MIN_SIZE else None
+    if coding is not None:
+        args = (body, coding, COMPRESSION_LEVELS[coding])
+        if len(body) <= COMPRESS_INLINE_MAX_SIZE:
+            body = compression.compress(*args)
+        else:
+            body = await asyncio.to_thread(compression.compress, *args)
+        headers["Content-Encoding"] = coding
+    return Response(body, media_type=media_type, headers=headers)
+
+def compressed_stream(http_request: Request, pieces, media_type: str, headers: dict = None,
+                      compressible: bool = True) -> StreamingResponse:
+    """A StreamingResponse of pieces, compressed chunk by chunk in the negotiated coding"""
+    headers = dict(headers or {})
+    coding = response_coding(http_request) if compressible else None
+    if COMPRESSION_ENABLED and compressible:
+        headers["Vary"] = "Accept-Encoding"
+    if coding is not None:
+        pieces = compression.compress_stream(pieces, coding, COMPRESSION_LEVELS[coding])
+        headers["Content-Encoding"] = coding
+    return StreamingResponse(pieces, media_type=media_type, headers=headers)
+
+# ============ Filter Index ============
+# starts_with/ends_with/seniority filters are resolved to their matching values
+# once per normalized filter string and cached across requests, so a filtered
+# row costs the same single rng.choice as an unfiltered one.
+
+FILTER_CACHE_SIZE = 1024
+
+def normalize_filter(value):
+    """Cache key for a starts_with/ends_with filter; None when the filter is unset"""
+    return value.strip().upper() if value else None
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def name_matches(starts_with=None, ends_with=None):
+    """Name candidates for normalized filters: (first, None) pins the first name, (None, last) the last"""
+    matches = []
+    for affix, matches_affix in ((starts_with, str.startswith), (ends_with, str.endswith)):
+        if affix is not None:
+            matches += [(f, None) for f in FIRST_NAMES if matches_affix(f.upper(), affix)]
+            matches += [(None, l) for l in LAST_NAMES if matches_affix(l.upper(), affix)]
+    return tuple(matches)
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def country_matches(starts_with):
+    return tuple(c for c in COUNTRIES_LIST if c.upper().startswith(starts_with))
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def job_matches(seniority):
+    return tuple(j for j in JOB_TITLES if seniority in j.lower())
+
+def city_choices(country=None):
+    return CITIES_BY_COUNTRY[country] if country and country in CITIES_BY_COUNTRY else ALL_CITIES
+
+def country_choices(starts_with=None):
+    return (country_matches(normalize_filter(starts_with)) if starts_with else None) or COUNTRIES_LIST
+
+def job_choices(seniority="any"):
+    return (job_matches(seniority.lower()) if seniority != "any" else None) or JOB_TITLES
+
+# ============ Weighted Sampling ============
+# The distribution option skews city, country, job and card variant choices:
+# "uniform" (the default), "zipf" over the list order with zipf_exponent, or a
+# weight pack name, whose unlisted values get weight 0. The weights option then
+# overrides single values. Each weighting is compiled once into a cached alias
+# table, so a weighted draw costs O(1) like rng.choice.
+
+def realistic_city_weights() -> dict:
+    """Each country's population spread over its cities by the rank-size rule; lists are in size order"""
+    weights = {}
+    for code, cities in CITIES_BY_COUNTRY.items():
+        if code == "GB":
+            continue
+        population = COUNTRY_POPULATIONS["GB" if code == "UK" else code]
+        harmonic = sum(1 / rank for rank in range(1, len(cities) + 1))
+        for rank, city in enumerate(cities, 1):
+            weights.setdefault(city, population / rank / harmonic)
+    return weights
+
+WEIGHT_PACKS = {
+    "realistic": {
+        "city": realistic_city_weights(),
+        "country": {COUNTRIES[code]["name"]: population for code, population in COUNTRY_POPULATIONS.items()},
+        "credit_card": CARD_BRAND_SHARES,
+    },
+}
+if WEIGHT_PACKS_FILE:
+    with open(WEIGHT_PACKS_FILE) as f:
+        for name, pack in json.load(f).items():
+            WEIGHT_PACKS.setdefault(name, {}).update(pack)
+
+def choice_table(type_id: str, values, options: dict) -> Optional[AliasTable]:
+    """Alias table for drawing from values under the distribution and weights options; None when uniform"""
+    distribution = options.get("distribution", "uniform")
+    weights = options.get("weights")
+    if distribution == "uniform" and not weights:
+        return None
+    if weights is not None and not isinstance(weights, dict):
+        raise ValueError("weights must map values to numbers")
+    unknown = sorted(set(weights or {}).difference(values))
+    if unknown:
+        raise ValueError(f"weights has keys that are not {type_id} values here: {', '.join(map(repr, unknown[:5]))}")
+    exponent = options.get("zipf_exponent", 1.0)
+    if not (isinstance(exponent, (int, float)) and math.isfinite(exponent) and exponent > 0):
+        raise ValueError("zipf_exponent must be a finite number greater than 0")
+    try:
+        overrides = tuple(sorted((weights or {}).items()))
+        return _alias_table(type_id, tuple(values), distribution, float(exponent), overrides)
+    except TypeError:
+        raise ValueError("weights must map values to numbers")
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _alias_table(type_id, values, distribution, exponent, overrides) -> AliasTable:
+    # Some city names repeat across countries; each distinct value is weighted once, at its first place
+    distinct = tuple(dict.fromkeys(values))
+    if distribution == "uniform":
+        weights = [1.0] * len(distinct)
+    elif distribution == "zipf":
+        weights = zipf_weights(len(distinct), exponent)
+    elif distribution in WEIGHT_PACKS:
+        pack = WEIGHT_PACKS[distribution].get(type_id)
+        if pack is None:
+            raise ValueError(f"Weight pack {distribution!r} has no weights for {type_id}")
+        weights = [pack.get(value, 0) for value in distinct]
+    else:
+        raise ValueError(f"Unknown distribution {distribution!r}; use uniform, zipf or one of: {', '.join(WEIGHT_PACKS)}")
+    weights = {**dict(zip(distinct, weights)), **dict(overrides)}
+    first = {value: i for i, value in reversed(list(enumerate(values)))}
+    return AliasTable([weights[value] if first[value] == i else 0 for i, value in enumerate(values)])
+
+def weighted_choice(values, table, rng):
+    return values[table.draw(rng)] if table is not None else rng.choice(values)
 
 # ============ Generator Functions ============
 
-def generate_by_type(type_id: str, options: dict) -> str:
+def generate_by_type(type_id: str, options: dict, rng=random) -> str:
     """Generate a single value of the specified type"""
+    return compile_generator(type_id, options, rng)()
+
+def compile_generator(type_id: str, options: dict, rng=random):
+    """Bind options and an RNG to a type's generator once; returns a zero-argument callable"""
     options = {k: v for k, v in options.items() if v is not None}
-    
-    if type_id == "uuid":
-        return str(uuid.uuid4())
-    elif type_id == "password":
-        return generate_password(
-            uppercase=options.get("uppercase", True),
-            lowercase=options.get("lowercase", True),
-            numbers=options.get("numbers", True),
-            special=options.get("special", False),
-            length=options.get("length", 16)
-        )
-    elif type_id == "username":
-        return generate_username(
-            prefix=options.get("prefix"),
-            style=options.get("style", "name_year")
-        )
-    elif type_id == "imei":
-        return generate_imei(
-            brand=options.get("brand", "Generic"),
-            valid_checksum=options.get("valid_checksum", True)
-        )
-    elif type_id == "mac_address":
-        return generate_mac_address(
-            uppercase=options.get("uppercase", True),
-            separator=options.get("separator", ":")
-        )
-    elif type_id == "name":
-        return generate_name(
-            starts_with=options.get("starts_with"),
-            ends_with=options.get("ends_with")
-        )
-    elif type_id == "email":
-        return generate_email(
-            domain=options.get("domain"),
-            extension=options.get("extension")
-        )
-    elif type_id == "phone":
-        return generate_phone(
-            country=options.get("country", "US"),
-            include_code=options.get("include_code", True)
-        )
-    elif type_id == "address":
-        return generate_address(country=options.get("country", "US"))
-    elif type_id == "country":
-        return generate_country(starts_with=options.get("starts_with"))
-    elif type_id == "city":
-        return generate_city(country=options.get("country"))
-    elif type_id == "zipcode":
-        return generate_zipcode(
-            country=options.get("country"),
-            zip_from=options.get("from", 10000),
-            zip_to=options.get("to", 99999)
-        )
-    elif type_id == "credit_card":
-        return generate_credit_card(
-            card_type=options.get("card_type", "Random"),
-            valid=options.get("valid", "valid") == "valid"
-        )
-    elif type_id == "ssn":
-        return generate_ssn(country=options.get("country", "US"))
-    elif type_id == "barcode":
-        return generate_barcode(
-            numeric_only=options.get("numeric_only", True),
-            length=options.get("length", 13)
-        )
-    elif type_id == "isbn":
-        return generate_isbn(format=options.get("format", "isbn13"))
-    elif type_id == "ip":
-        return generate_ip(version=options.get("version", "ipv4"))
-    elif type_id == "url":
-        return generate_url(
-            domain=options.get("domain"),
-            extension=options.get("extension", "com"),
-            protocol=options.get("protocol", "https")
-        )
-    elif type_id == "datetime":
-        return generate_datetime(
-            include_date=options.get("include_date", True),
-            include_time=options.get("include_time", True),
-            include_timezone=options.get("include_timezone", False)
-        )
-    elif type_id == "sentence":
-        return generate_sentence(grammatically_valid=options.get("grammatically_valid", True))
-    elif type_id == "paragraph":
-        return generate_paragraph(
-            min_sentences=options.get("min_sentences", 3),
-            max_sentences=options.get("max_sentences", 6)
-        )
-    elif type_id == "hex_color":
-        return generate_hex_color(uppercase=options.get("uppercase", True))
-    elif type_id == "rgb_color":
-        return generate_rgb_color(
-            min_value=options.get("min_value", 0),
-            max_value=options.get("max_value", 255)
-        )
-    elif type_id == "company":
-        return generate_company(starts_with=options.get("starts_with"))
-    elif type_id == "job":
-        return generate_job(seniority=options.get("seniority", "any"))
-    elif type_id == "street":
-        return generate_street()
-    elif type_id == "text":
-        return generate_text(length=options.get("length", 5))
-    return ""
+    factory = GENERATOR_FACTORIES.get(type_id)
+    if factory is None:
+        return lambda: ""
+    check_option_limits(type_id, options)
+    return factory(options, rng)
+
+def check_option_limits(type_id: str, options: dict):
+    """Reject size-like options outside OPTION_LIMITS, so no single row can be huge"""
+    for key, (low, high) in OPTION_LIMITS.get(type_id, {}).items():
+        value = options.get(key)
+        if value is not None and not low <= value <= high:
+            raise ValueError(f"{key} must be between {low} and {high}")
+
+def _password_factory(options, rng):
+    length = options.get("length", 16)
+    return partial(
+        generate_password,
+        uppercase=options.get("uppercase", True),
+        lowercase=options.get("lowercase", True),
+        numbers=options.get("numbers", True),
+        special=options.get("special", False),
+        length=length,
+        rng=rng
+    )
+
+def _paragraph_factory(options, rng):
+    min_sentences = options.get("min_sentences", 3)
+    max_sentences = options.get("max_sentences", 6)
+    if min_sentences > max_sentences:
+        raise ValueError("min_sentences must not exceed max_sentences")
+    return partial(generate_paragraph, min_sentences=min_sentences, max_sentences=max_sentences, rng=rng)
+
+def _rgb_color_factory(options, rng):
+    min_value = options.get("min_value", 0)
+    max_value = options.get("max_value", 255)
+    if min_value > max_value:
+        raise ValueError("min_value must not exceed max_value")
+    return partial(generate_rgb_color, min_value=min_value, max_value=max_value, rng=rng)
+
+# Maps each type id to a factory that binds request options into a generator
+GENERATOR_FACTORIES = {
+    "uuid": lambda o, rng: partial(generate_uuid, rng=rng),
+    "password": _password_factory,
+    "username": lambda o, rng: partial(generate_username, prefix=o.get("prefix"), style=o.get("style", "name_year"), rng=rng),
+    "imei": lambda o, rng: partial(generate_imei, brand=o.get("brand", "Generic"), valid_checksum=o.get("valid_checksum", True), rng=rng),
+    "mac_address": lambda o, rng: partial(generate_mac_address, uppercase=o.get("uppercase", True), separator=o.get("separator", ":"), rng=rng),
+    "pattern": lambda o, rng: partial(compile_pattern(o.get("template") or DEFAULT_PATTERN).generate, rng),
+    "name": lambda o, rng: partial(generate_name, starts_with=o.get("starts_with"), ends_with=o.get("ends_with"), rng=rng),
+    "email": lambda o, rng: partial(generate_email, domain=o.get("domain"), extension=o.get("extension"), rng=rng),
+    "phone": lambda o, rng: partial(generate_phone, country=o.get("country", "US"), include_code=o.get("include_code", True), rng=rng),
+    "address": lambda o, rng: partial(generate_address, country=o.get("country", "US"), rng=rng),
+    "country": lambda o, rng: partial(generate_country, starts_with=o.get("starts_with"), rng=rng, table=choice_table("country", country_choices(o.get("starts_with")), o)),
+    "city": lambda o, rng: partial(generate_city, country=o.get("country"), rng=rng, table=choice_table("city", city_choices(o.get("country")), o)),
+    "zipcode": lambda o, rng: partial(generate_zipcode, country=o.get("country"), zip_from=o.get("from", 10000), zip_to=o.get("to", 99999), rng=rng),
+    "credit_card": lambda o, rng: partial(generate_credit_card, card_type=o.get("card_type", "Random"), valid=o.get("valid", "valid") == "valid", rng=rng, table=choice_table("credit_card", CARD_BRANDS, o)),
+    "ssn": lambda o, rng: partial(generate_ssn, country=o.get("country", "US"), rng=rng),
+    "barcode": lambda o, rng: partial(generate_barcode, numeric_only=o.get("numeric_only", True), length=o.get("length", 13), rng=rng),
+    "isbn": lambda o, rng: partial(generate_isbn, format=o.get("format", "isbn13"), rng=rng),
+    "ip": lambda o, rng: partial(generate_ip, version=o.get("version", "ipv4"), rng=rng),
+    "url": lambda o, rng: partial(generate_url, domain=o.get("domain"), extension=o.get("extension", "com"), protocol=o.get("protocol", "https"), rng=rng),
+    "datetime": lambda o, rng: partial(generate_datetime, include_date=o.get("include_date", True), include_time=o.get("include_time", True), include_timezone=o.get("include_timezone", False), rng=rng),
+    "sentence": lambda o, rng: partial(generate_sentence, grammatically_valid=o.get("grammatically_valid", True), rng=rng),
+    "paragraph": _paragraph_factory,
+    "hex_color": lambda o, rng: partial(generate_hex_color, uppercase=o.get("uppercase", True), rng=rng),
+    "rgb_color": _rgb_color_factory,
+    "company": lambda o, rng: partial(generate_company, starts_with=o.get("starts_with"), rng=rng),
+    "job": lambda o, rng: partial(generate_job, seniority=o.get("seniority", "any"), rng=rng, table=choice_table("job", job_choices(o.get("seniority", "any")), o)),
+    "street": lambda o, rng: partial(generate_street, rng=rng),
+    "text": lambda o, rng: partial(generate_text, length=o.get("length", 5), rng=rng),
+}
 
 def apply_prefix_suffix(value: str, prefix: str = None, suffix: str = None) -> str:
     """Apply prefix and suffix to a value"""
@@ -528,292 +1902,144 @@ def apply_prefix_suffix(value: str, prefix: str = None, suffix: str = None) -> s
         return prefix + suffix
     return prefix + value[:max_len] + suffix
 
-def generate_uuid():
-    return str(uuid.uuid4())
-
-def generate_phone(country="US", include_code=True):
-    c = COUNTRIES.get(country, COUNTRIES["US"])
-    code = c["code"]
-    
-    if country in ["US", "CA"]:
-        num = f"({random.randint(200, 999)}) {random.randint(200, 999)}-{random.randint(1000, 9999)}"
-        return f"{code} {num}" if include_code else num
-    elif country == "IN":
-        num = str(random.randint(7000000000, 9999999999))
-        return f"{code} {num}" if include_code else num
-    elif country == "GB":
-        num = f"{random.randint(20, 99)} {random.randint(1000, 9999)} {random.randint(100, 999)}"
-        return f"{code} {num}" if include_code else num
-    else:
-        num = str(random.randint(100000000, 999999999))
-        return f"{code} {num}" if include_code else num
+def apply_uuid_prefix_suffix(value: str, prefix: str = None, suffix: str = None) -> str:
+    """Replace the first/last hex groups of a UUID with prefix/suffix"""
+    # Standard UUID: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx
+    # Remove all hyphens for processing
+    hex_uuid = value.replace('-', '')
+    # Replace first 8 hex chars with prefix
+    if prefix:
+        hex_uuid = prefix + hex_uuid[8:]
+    # Replace last 12 hex chars with suffix
+    if suffix:
+        hex_uuid = hex_uuid[:-12] + suffix
+    # Reconstruct standard UUID format: 8-4-4-4-12
+    return f"{hex_uuid[:8]}-{hex_uuid[8:12]}-{hex_uuid[12:16]}-{hex_uuid[16:20]}-{hex_uuid[20:]}"
 
-def generate_email(domain=None, extension=None):
-    names = ["alex", "sam", "jordan", "taylor", "morgan", "riley", "jamie", "quinn", "casey", "dakota", "avery", "skyler"]
-    
+def generate_uuid(rng=random):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+def generate_phone(country="US", include_code=True, rng=random):
+    code = COUNTRIES.get(country, COUNTRIES["US"])["code"]
+    num = render_locale_format(PHONE_TEMPLATES.get(country, DEFAULT_PHONE_TEMPLATE), rng)
+    return f"{code} {num}" if include_code else num
+
+def generate_email(domain=None, extension=None, rng=random):
     # Ensure extension has a dot prefix
     if extension and not extension.startswith('.'):
         extension = '.' + extension
     
     if domain and extension:
-        return f"{random.choice(names).lower()}{random.randint(1, 999)}@{domain}{extension}"
+        return f"{rng.choice(EMAIL_NAMES)}{rng.randint(1, 999)}@{domain}{extension}"
     elif domain:
         # If no explicit extension but domain is provided, use domain as-is (no TLD)
-        return f"{random.choice(names).lower()}{random.randint(1, 999)}@{domain}"
+        return f"{rng.choice(EMAIL_NAMES)}{rng.randint(1, 999)}@{domain}"
     elif extension:
-        return f"{random.choice(names).lower()}{random.randint(1, 999)}@example{extension}"
+        return f"{rng.choice(EMAIL_NAMES)}{rng.randint(1, 999)}@example{extension}"
     else:
-        return f"{random.choice(names).lower()}{random.randint(1, 999)}@{random.choice(['gmail.com', 'yahoo.com', 'outlook.com'])}"
+        return f"{rng.choice(EMAIL_NAMES)}{rng.randint(1, 999)}@{rng.choice(EMAIL_DOMAINS)}"
 
-def generate_address(country="US"):
-    # Street numbers and streets
-    street_num = random.randint(1, 9999)
-    
-    # Country-specific addresses
-    if country == "US":
-        streets = ["Main St", "Oak Ave", "Park Blvd", "First St", "Elm St", "Maple Dr", "Cedar Ln", "Pine St", "Washington St", "Lake Dr"]
-        cities = ["New York", "Los Angeles", "Chicago", "Houston", "Phoenix", "Philadelphia", "San Antonio", "San Diego", "Dallas", "San Jose"]
-        states = ["CA", "NY", "TX", "FL", "IL", "PA", "OH", "GA", "NC", "MI"]
-        zip_code = random.randint(10000, 99999)
-        return f"{street_num} {random.choice(streets)}, {random.choice(cities)}, {random.choice(states)} {zip_code}"
-    
-    elif country == "UK":
-        streets = ["High Street", "Station Road", "London Road", "Victoria Road", "Church Lane", "Manor Road", "Park Road", "Queens Road"]
-        cities = ["London", "Manchester", "Birmingham", "Edinburgh", "Glasgow", "Liverpool", "Bristol", "Leeds"]
-        postcodes = ["SW1A", "EC1A", "W1A", "M1", "B1", "EH1", "G1", "L1", "BS1", "LS1"]
-        return f"{random.randint(1, 200)} {random.choice(streets)}, {random.choice(cities)}, {random.choice(postcodes)}"
-    
-    elif country == "DE":
-        streets = ["Hauptstraße", "Bahnhofstraße", "Schulstraße", "Gartenstraße", "Dorfstraße", "Bergstraße", "Waldstraße", "Kirchstraße"]
-        cities = ["Berlin", "Munich", "Hamburg", "Frankfurt", "Cologne", "Stuttgart", "Düsseldorf", "Dortmund"]
-        return f"{random.randint(1, 200)} {random.choice(streets)}, {random.choice(cities)}, {random.randint(10000, 99999)}"
-    
-    elif country == "FR":
-        streets = ["Rue de la Paix", "Avenue des Champs-Élysées", "Boulevard Saint-Michel", "Rue Victor Hugo", "Rue du Commerce"]
-        cities = ["Paris", "Lyon", "Marseille", "Toulouse", "Nice", "Nantes", "Strasbourg", "Bordeaux"]
-        return f"{random.randint(1, 200)} {random.choice(streets)}, {random.choice(cities)}, {random.randint(10000, 99999)}"
-    
-    elif country == "IN":
-        streets = ["MG Road", "Ring Road", "Main Market", "Sector Road", "College Road", "Station Road"]
-        cities = ["Mumbai", "Delhi", "Bangalore", "Chennai", "Kolkata", "Hyderabad", "Pune", "Ahmedabad"]
-        pincode = random.randint(100000, 999999)
-        return f"{random.randint(1, 999)} {random.choice(streets)}, {random.choice(cities)} - {pincode}"
-    
-    elif country == "AU":
-        streets = ["George St", "Queen St", "King St", "Elizabeth St", "Bourke St", "Collins St"]
-        cities = ["Sydney", "Melbourne", "Brisbane", "Perth", "Adelaide", "Canberra", "Hobart", "Darwin"]
-        postcode = random.randint(1000, 9999)
-        return f"{random.randint(1, 999)} {random.choice(streets)}, {random.choice(cities)} {postcode}"
-    
-    elif country == "CA":
-        streets = ["Yonge St", "Queen St", "King St", "Dundas St", "Bloor St", "Huntington Ave"]
-        cities = ["Toronto", "Vancouver", "Montreal", "Calgary", "Ottawa", "Edmonton", "Winnipeg", "Halifax"]
-        postal = f"{random.choice(['M','V','H','K','L','N'])}{random.randint(1, 9)}{random.choice(['A','B','C','D','E','F','G','H','J','K','L','M','N','P','R','S','T','V','W','X','Y'])}{random.randint(1, 9)}{random.choice(['A','B','C','D','E','F','G','H','J','K','L','M','N','P','R','S','T','V','W','X','Y'])}{random.randint(1, 9)}"
-        return f"{random.randint(1, 999)} {random.choice(streets)}, {random.choice(cities)}, {postal}"
-    
-    elif country == "JP":
-        streets = ["Main Street", "Cherry Blossom Ave", "Central Blvd", "Garden Road", "Temple Street"]
-        cities = ["Tokyo", "Osaka", "Kyoto", "Yokohama", "Nagoya", "Sapporo", "Fukuoka", "Kobe"]
-        return f"{random.randint(1, 999)}-{random.randint(1, 99)} {random.choice(streets)}, {random.choice(cities)}, {random.randint(100, 999)}"
-    
-    elif country == "BR":
-        streets = ["Avenida Paulista", "Rua das Flores", "Avenida Brasil", "Rua 25 de Março", "Avenida Copacabana"]
-        cities = ["São Paulo", "Rio de Janeiro", "Brasília", "Salvador", "Fortaleza", "Belo Horizonte", "Manaus", "Curitiba"]
-        cep = f"{random.randint(10000, 99999)}-{random.randint(100, 999)}"
-        return f"{random.randint(1, 9999)} {random.choice(streets)}, {random.choice(cities)} - {cep}"
-    
-    elif country == "IT":
-        streets = ["Via Roma", "Corso Italia", "Via Garibaldi", "Piazza del Duomo", "Via del Corso"]
-        cities = ["Rome", "Milan", "Naples", "Turin", "Florence", "Venice", "Bologna", "Genoa"]
-        return f"{random.randint(1, 200)} {random.choice(streets)}, {random.choice(cities)}, {random.randint(10000, 99999)}"
-    
-    elif country == "ES":
-        streets = ["Gran Vía", "Paseo de la Castellana", "Avenida de la Constitución", "Calle Mayor", "Rambla de Barcelona"]
-        cities = ["Madrid", "Barcelona", "Valencia", "Seville", "Bilbao", "Málaga", "Murcia", "Palma"]
-        return f"{random.randint(1, 200)} {random.choice(streets)}, {random.choice(cities)}, {random.randint(10000, 52999)}"
-    
-    elif country == "MX":
-        streets = ["Paseo de la Reforma", "Avenida Insurgentes", "Calle Madero", "Avenida Chapultepec", "Gran Avenida"]
-        cities = ["Mexico City", "Guadalajara", "Monterrey", "Cancún", "Puebla", "Tijuana", "Córdoba", "Veracruz"]
-        cp = random.randint(10000, 99999)
-        return f"{random.randint(1, 9999)} {random.choice(streets)}, {random.choice(cities)}, CP {cp}"
-    
-    elif country == "CN":
-        streets = ["Nanjing Road", "Beijing Road", "Shanghai Street", "Guangzhou Avenue", "Shenzhen Boulevard"]
-        cities = ["Beijing", "Shanghai", "Guangzhou", "Shenzhen", "Chengdu", "Hangzhou", "Wuhan", "Nanjing"]
-        return f"{random.randint(1, 999)} {random.choice(streets)}, {random.choice(cities)}, {random.randint(100000, 999999)}"
-    
-    elif country == "RU":
-        streets = ["Tverskaya Street", "Arbat Street", "Nevsky Prospect", "Lenin Street", "Gorky Street"]
-        cities = ["Moscow", "Saint Petersburg", "Novosibirsk", "Yekaterinburg", "Nizhny Novgorod", "Kazan", "Chelyabinsk", "Omsk"]
-        return f"{random.randint(1, 200)} {random.choice(streets)}, {random.choice(cities)}, {random.randint(100000, 999999)}"
-    
-    elif country == "NL":
-        streets = ["Damrak", "Kalverstraat", "Rokin", "Leidsestraat", "PC Hooftstraat"]
-        cities = ["Amsterdam", "Rotterdam", "The Hague", "Utrecht", "Eindhoven", "Groningen", "Tilburg", "Almere"]
-        return f"{random.randint(1, 200)} {random.choice(streets)}, {random.choice(cities)}, {random.randint(1000, 9999)}"
-    
-    elif country == "SE":
-        streets = ["Drottninggatan", "Sveavägen", "Göta Boulevard", "Kungsgatan", "Storgatan"]
-        cities = ["Stockholm", "Gothenburg", "Malmö", "Uppsala", "Västerås", "Örebro", "Linköping", "Helsingborg"]
-        return f"{random.randint(1, 200)} {random.choice(streets)}, {random.choice(cities)}, {random.randint(11111, 99999)}"
-    
-    elif country == "SG":
-        streets = ["Orchard Road", "Marina Bay", "Bugis Street", "Clarke Quay", "Havelock Road"]
-        return f"{random.randint(1, 999)} {random.choice(streets)}, Singapore {random.randint(100000, 999999)}"
-    
-    elif country == "AE":
-        streets = ["Sheikh Zayed Road", "Al Diyafah Street", "Jumeirah Beach Road", "Deira Corniche", "Business Bay"]
-        cities = ["Dubai", "Abu Dhabi", "Sharjah", "Al Ain", "Ajman", "Ras Al Khaimah"]
-        return f"{random.randint(1, 999)} {random.choice(streets)}, {random.choice(cities)}"
-    
-    elif country == "ZA":
-        streets = ["Sandton City", "Oxford Street", "Main Road", "Long Street", "Kloof Street"]
-        cities = ["Johannesburg", "Cape Town", "Durban", "Pretoria", "Port Elizabeth", "Bloemfontein"]
-        return f"{random.randint(1, 999)} {random.choice(streets)}, {random.choice(cities)}, {random.randint(1000, 9999)}"
-    
-    else:
-        # Default US-style address for unspecified countries
-        return f"{street_num} {random.choice(US_STREETS)}, {random.choice(CITIES[:10])}, {random.randint(10000, 99999)}"
+def generate_address(country="US", rng=random):
+    return render_locale_format(ADDRESS_TEMPLATES.get(country, DEFAULT_ADDRESS_TEMPLATE), rng)
 
-def generate_name(starts_with=None, ends_with=None):
-    first_names = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen", "Emma", "Olivia", "Ava", "Isabella", "Sophia", "Mia", "Charlotte", "Amelia", "Harper", "Evelyn", "Liam", "Noah", "Oliver", "Elijah"]
-    last_names = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin"]
-    
-    candidates = []
-    
-    # Check starts_with
-    if starts_with:
-        starts_with = starts_with.strip().upper()
-        for f in first_names:
-            if f.upper().startswith(starts_with):
-                candidates.append(f"{f} {random.choice(last_names)}")
-        for l in last_names:
-            if l.upper().startswith(starts_with):
-                candidates.append(f"{random.choice(first_names)} {l}")
-    
-    # Check ends_with
-    if ends_with:
-        ends_with = ends_with.strip().upper()
-        for f in first_names:
-            if f.upper().endswith(ends_with):
-                candidates.append(f"{f} {random.choice(last_names)}")
-        for l in last_names:
-            if l.upper().endswith(ends_with):
-                candidates.append(f"{random.choice(first_names)} {l}")
-    
-    # Return from candidates if any found
-    if candidates:
-        return random.choice(candidates)
+def generate_name(starts_with=None, ends_with=None, rng=random):
+    matches = name_matches(normalize_filter(starts_with), normalize_filter(ends_with))
+    if matches:
+        first, last = rng.choice(matches)
+        return f"{first or rng.choice(FIRST_NAMES)} {last or rng.choice(LAST_NAMES)}"
     
     # Otherwise return random name
-    return f"{random.choice(first_names)} {random.choice(last_names)}"
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
 
-def generate_imei(brand="Generic", valid_checksum=True):
+def generate_imei(brand="Generic", valid_checksum=True, rng=random):
     if brand == "Generic":
-        tac = str(random.randint(35, 86))
+        tac = str(rng.randint(35, 86))
     else:
         tac = IMEI_BRANDS.get(brand, "35")
     
-    imei = tac + "".join([str(random.randint(0, 9)) for _ in range(12)])
-    
-    if not valid_checksum:
-        return imei + str((int(imei[-1]) + 1) % 10)
-    
-    total = 0
-    doubled = False
-    for digit in imei[::-1]:
-        d = int(digit) * (2 if doubled else 1)
-        total += d if d < 10 else d - 9
-        doubled = not doubled
-    check = (10 - (total % 10)) % 10
-    return imei + str(check)
+    imei = f"{tac}{rng.randint(0, 10 ** 12 - 1):012d}"
+    return imei + imei_check_digit(imei, valid_checksum)
+
+def imei_check_digit(imei: str, valid_checksum=True) -> str:
+    check = luhn_check_digit(imei)
+    return str(check if valid_checksum else wrong_check_digit(check))
 
-def generate_mac_address(uppercase=True, separator=":"):
-    parts = [f"{random.randint(0, 255):02x}" for _ in range(6)]
+def random_digits(count: int, rng=random) -> str:
+    """count random decimal digits, drawn with a single RNG call"""
+    return f"{rng.randint(0, 10 ** count - 1):0{count}d}" if count > 0 else ""
+
+def generate_mac_address(uppercase=True, separator=":", rng=random):
+    parts = [f"{rng.randint(0, 255):02x}" for _ in range(6)]
     result = separator.join(parts)
     return result.upper() if uppercase else result
 
-def generate_credit_card(card_type="Random", valid=True):
+def generate_credit_card(card_type="Random", valid=True, rng=random, table=None):
     if card_type == "Random":
-        card_type = random.choice(["Visa", "Mastercard", "American Express"])
+        card_type = weighted_choice(CARD_BRANDS, table, rng)
     
     config = CREDIT_CARD_TYPES.get(card_type, CREDIT_CARD_TYPES["Visa"])
-    prefix = config["prefix"]
+    prefix = rng.choice(config["prefixes"])
     length = config["length"]
     
-    cc = prefix
-    while len(cc) < length - 1:
-        cc += str(random.randint(0, 9))
-    
-    total = 0
-    doubled = True
-    for digit in cc[::-1]:
-        d = int(digit) * (2 if doubled else 1)
-        if d > 9: d -= 9
-        total += d
-        doubled = not doubled
-    check = (10 - (total % 10)) % 10
-    cc += str(check)
-    
-    if not valid:
-        cc = cc[:-1] + str((int(cc[-1]) + 1) % 10)
+    cc = prefix + random_digits(length - 1 - len(prefix), rng)
+    check = luhn_check_digit(cc)
+    cc += str(check if valid else wrong_check_digit(check))
     
     if card_type == "American Express":
         return f"{cc[:4]}-{cc[4:10]}-{cc[10:]}"
     else:
         return "-".join([cc[i:i+4] for i in range(0, len(cc), 4)])
 
-def generate_ssn(country="US"):
+def generate_ssn(country="US", rng=random):
     if country == "US":
-        return f"{random.randint(100, 999)}-{random.randint(10, 99)}-{random.randint(1000, 9999)}"
+        return f"{rng.randint(100, 999)}-{rng.randint(10, 99)}-{rng.randint(1000, 9999)}"
     elif country == "UK":
-        return f"{random.randint(10, 99)} {random.randint(100000, 999999)} {random.randint(100000, 999999)}"
+        return f"{rng.randint(10, 99)} {rng.randint(100000, 999999)} {rng.randint(100000, 999999)}"
     else:
-        return f"{random.randint(100, 999)}-{random.randint(10, 99)}-{random.randint(1000, 9999)}"
+        return f"{rng.randint(100, 999)}-{rng.randint(10, 99)}-{rng.randint(1000, 9999)}"
 
-def generate_barcode(numeric_only=True, length=13):
+def generate_barcode(numeric_only=True, length=13, rng=random):
     if numeric_only:
-        return "".join([str(random.randint(0, 9)) for _ in range(length)])
+        # The last digit is a GS1 check digit: EAN-13 at length 13, UPC-A at 12, EAN-8 at 8
+        if length < 2:
+            return random_digits(length, rng)
+        payload = random_digits(length - 1, rng)
+        return payload + str(gs1_check_digit(payload))
     else:
         chars = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-        return "".join([random.choice(chars) for _ in range(length)])
+        return "".join([rng.choice(chars) for _ in range(length)])
 
-def generate_isbn(format="isbn13"):
+def generate_isbn(format="isbn13", rng=random):
     if format == "isbn10":
-        digits = "".join([str(random.randint(0, 9)) for _ in range(9)])
-        total = sum((10 - i) * int(d) for i, d in enumerate(digits))
-        check = (11 - (total % 11)) % 11
-        check_char = 'X' if check == 10 else str(check)
-        return f"{digits[:1]}-{digits[1:6]}-{digits[6:10]}-{check_char}"
+        digits = random_digits(9, rng)
+        return f"{digits[:1]}-{digits[1:6]}-{digits[6:10]}-{isbn10_check_char(digits)}"
     else:
         # ISBN-13: 12 digits + check digit = 13 total
-        prefix = "978" + "".join([str(random.randint(0, 9)) for _ in range(9)])
-        total = sum((3 if i % 2 else 1) * int(d) for i, d in enumerate(prefix))
-        check = (10 - (total % 10)) % 10
+        prefix = "978" + random_digits(9, rng)
+        check = gs1_check_digit(prefix)
         return f"{prefix[:3]}-{prefix[3:5]}-{prefix[5:10]}-{prefix[10:12]}-{prefix[12:]}{check}"
 
-def generate_ip(version="ipv4"):
+def generate_ip(version="ipv4", rng=random):
     if version == "ipv6":
-        return ":".join([f"{random.randint(0, 65535):x}" for _ in range(8)])
-    return f"{random.randint(1, 255)}.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(0, 255)}"
+        return ":".join([f"{rng.randint(0, 65535):x}" for _ in range(8)])
+    return f"{rng.randint(1, 255)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}"
 
-def generate_url(domain=None, extension="com", protocol="https"):
+def generate_url(domain=None, extension="com", protocol="https", rng=random):
     if domain:
         dom = domain
     else:
-        dom = random.choice(URL_DOMAINS)
-    path = random.choice(["about", "products", "services", "blog", "contact"])
+        dom = rng.choice(URL_DOMAINS)
+    path = rng.choice(URL_PATHS)
     return f"{protocol}://{dom}.{extension}/{path}"
 
-def generate_datetime(include_date=True, include_time=True, include_timezone=False):
-    year = random.randint(2020, 2025)
-    month = random.randint(1, 12)
-    day = random.randint(1, 28)
-    hour = random.randint(0, 23)
-    minute = random.randint(0, 59)
-    second = random.randint(0, 59)
-    millisecond = random.randint(0, 999)
+def generate_datetime(include_date=True, include_time=True, include_timezone=False, rng=random):
+    year = rng.randint(2020, 2025)
+    month = rng.randint(1, 12)
+    day = rng.randint(1, 28)
+    hour = rng.randint(0, 23)
+    minute = rng.randint(0, 59)
+    second = rng.randint(0, 59)
+    millisecond = rng.randint(0, 999)
     
     # ISO 8601 format: YYYY-MM-DDThh:mm:ss.sssZ
     date_str = f"{year:04d}-{month:02d}-{day:02d}"
@@ -833,49 +2059,41 @@ def generate_datetime(include_date=True, include_time=True, include_timezone=Fal
     
     return result
 
-def generate_sentence(grammatically_valid=True):
+def generate_sentence(grammatically_valid=True, rng=random):
     if grammatically_valid:
-        subjects = ["The quick brown fox", "A happy dog", "The clever cat", "An innovative startup", "A dedicated team", "The talented developer", "An amazing product", "A revolutionary idea"]
-        verbs = ["jumps over", "runs through", "explores", "discovers", "builds", "creates", "transforms", "improves"]
-        objects = ["the lazy bear", "the tall building", "new horizons", "exciting opportunities", "powerful solutions", "beautiful designs", "complex problems", "amazing experiences"]
-        return f"{random.choice(subjects)} {random.choice(verbs)} {random.choice(objects)}."
+        return f"{rng.choice(SENTENCE_SUBJECTS)} {rng.choice(SENTENCE_VERBS)} {rng.choice(SENTENCE_OBJECTS)}."
     else:
         words = TEXT_WORDS
-        sentence = " ".join([random.choice(words) for _ in range(random.randint(5, 12))])
+        sentence = " ".join([rng.choice(words) for _ in range(rng.randint(5, 12))])
         return sentence[0].upper() + sentence[1:] + "."
 
-def generate_paragraph(min_sentences=3, max_sentences=6):
+def generate_paragraph(min_sentences=3, max_sentences=6, rng=random):
     sentences = []
-    for _ in range(random.randint(min_sentences, max_sentences)):
-        sentences.append(generate_sentence(grammatically_valid=True))
+    for _ in range(rng.randint(min_sentences, max_sentences)):
+        sentences.append(generate_sentence(grammatically_valid=True, rng=rng))
     return " ".join(sentences)
 
-def generate_hex_color(uppercase=True):
-    color = "#" + "".join([f"{random.randint(0, 255):02x}" for _ in range(3)])
-    return color.upper() if uppercase else color
+def generate_hex_color(uppercase=True, rng=random):
+    return f"#{rng.getrandbits(24):06X}" if uppercase else f"#{rng.getrandbits(24):06x}"
 
-def generate_rgb_color(min_value=0, max_value=255):
-    r = random.randint(min_value, max_value)
-    g = random.randint(min_value, max_value)
-    b = random.randint(min_value, max_value)
+def generate_rgb_color(min_value=0, max_value=255, rng=random):
+    r = rng.randint(min_value, max_value)
+    g = rng.randint(min_value, max_value)
+    b = rng.randint(min_value, max_value)
     return f"rgb({r}, {g}, {b})"
 
-def generate_company(starts_with=None):
-    name = random.choice(USERNAME_ADJ).capitalize() + " " + random.choice(["Solutions", "Systems", "Technologies", "Labs", "Ventures", "Group", "Inc"])
+def generate_company(starts_with=None, rng=random):
+    name = rng.choice(USERNAME_ADJ).capitalize() + " " + rng.choice(COMPANY_KINDS)
     if starts_with:
         if starts_with.strip().upper() in name.upper():
             return name
         return starts_with + name
     return name
 
-def generate_job(seniority="any"):
-    if seniority != "any":
-        jobs = [j for j in JOB_TITLES if seniority.lower() in j.lower()]
-        if jobs:
-            return random.choice(jobs)
-    return random.choice(JOB_TITLES)
+def generate_job(seniority="any", rng=random, table=None):
+    return weighted_choice(job_choices(seniority), table, rng)
 
-def generate_password(uppercase=True, lowercase=True, numbers=True, special=False, length=16):
+def generate_password(uppercase=True, lowercase=True, numbers=True, special=False, length=16, rng=random):
     chars = ""
     if uppercase:
         chars += "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
@@ -889,83 +2107,33 @@ def generate_password(uppercase=True, lowercase=True, numbers=True, special=Fals
     if not chars:
         chars = "abcdefghijklmnopqrstuvwxyz"
     
-    return "".join([random.choice(chars) for _ in range(length)])
+    return "".join([rng.choice(chars) for _ in range(length)])
 
-def generate_username(prefix=None, style="name_year"):
-    name = random.choice(USERNAME_NAMES)
-    adj = random.choice(USERNAME_ADJ)
-    noun = random.choice(USERNAME_NOUN)
+def generate_username(prefix=None, style="name_year", rng=random):
+    name = rng.choice(USERNAME_NAMES)
+    adj = rng.choice(USERNAME_ADJ)
+    noun = rng.choice(USERNAME_NOUN)
     
     if style == "name_year":
-        result = f"{name}{random.randint(1, 99)}"
+        result = f"{name}{rng.randint(1, 99)}"
     elif style == "adj_noun":
         result = f"{adj}_{noun}"
     elif style == "name_random":
-        result = f"{name}.{random.randint(100, 999)}"
+        result = f"{name}.{rng.randint(100, 999)}"
     else:
         result = f"mrx_{name}"
     
     return (prefix or "") + result
 
-def generate_country(starts_with=None):
-    """Generate country - unique names"""
-    if starts_with:
-        starts_with = starts_with.strip().upper()
-        candidates = list(set([c for c in COUNTRIES_LIST if c.upper().startswith(starts_with)]))
-        if candidates:
-            return random.choice(candidates)
-    # Return unique country from full list
-    return random.choice(COUNTRIES_LIST)
-
-def generate_city(country=None):
-    """Generate city based on country selection"""
-    cities_by_country = {
-        "US": ["New York", "Los Angeles", "Chicago", "Houston", "Phoenix", "Philadelphia", "San Antonio", "San Diego", "Dallas", "San Jose", "Austin", "Jacksonville", "Fort Worth", "Columbus", "Charlotte", "San Francisco", "Indianapolis", "Seattle", "Denver", "Boston"],
-        "UK": ["London", "Manchester", "Birmingham", "Edinburgh", "Glasgow", "Liverpool", "Bristol", "Leeds", "Sheffield", "Newcastle", "Nottingham", "Southampton", "Brighton", "Oxford", "Cambridge", "York", "Cardiff", "Belfast", "Bournemouth", "Leicester"],
-        "DE": ["Berlin", "Munich", "Hamburg", "Frankfurt", "Cologne", "Stuttgart", "Düsseldorf", "Dortmund", "Leipzig", "Essen", "Dresden", "Hanover", "Nuremberg", "Duisburg", "Bochum", "Wuppertal", "Bielefeld", "Bonn", "Mannheim", "Karlsruhe"],
-        "FR": ["Paris", "Lyon", "Marseille", "Toulouse", "Nice", "Nantes", "Strasbourg", "Bordeaux", "Lille", "Rennes", "Reims", "Le Havre", "Saint-Étienne", "Toulon", "Grenoble", "Dijon", "Angers", "Nîmes", "Villeurbanne", "Clermont-Ferrand"],
-        "IN": ["Mumbai", "Delhi", "Bangalore", "Chennai", "Kolkata", "Hyderabad", "Pune", "Ahmedabad", "Surat", "Jaipur", "Lucknow", "Kanpur", "Nagpur", "Indore", "Thane", "Bhopal", "Visakhapatnam", "Pimpri", "Kalyan", "Meerut"],
-        "AU": ["Sydney", "Melbourne", "Brisbane", "Perth", "Adelaide", "Canberra", "Hobart", "Darwin", "Newcastle", "Geelong", "Townsville", "Cairns", "Toowoomba", "Ballarat", "Bendigo", "Launceston", "Mackay", "Rockhampton", "Sunshine Coast", "Gold Coast"],
-        "CA": ["Toronto", "Vancouver", "Montreal", "Calgary", "Ottawa", "Edmonton", "Winnipeg", "Halifax", "Victoria", "Brampton", "Kitchener", "London", "Oshawa", "Barrie", "Sherbrooke", "Guelph", "Moncton", "Kelowna", "Sudbury", "Trois-Rivières"],
-        "JP": ["Tokyo", "Osaka", "Kyoto", "Yokohama", "Nagoya", "Sapporo", "Fukuoka", "Kobe", "Kawasaki", "Saitama", "Hiroshima", "Sendai", "Chiba", "Sakai", "Niigata", "Hamamatsu", "Hachioji", "Higashihiroshima", "Okayama", "Kagoshima"],
-        "BR": ["São Paulo", "Rio de Janeiro", "Brasília", "Salvador", "Fortaleza", "Belo Horizonte", "Manaus", "Curitiba", "Recife", "Porto Alegre", "Belém", "Goiânia", "Guarulhos", "Campinas", "São Luís", "São Gonçalo", "Maceió", "Duque de Caxias", "Natal", "Teresina"],
-        "IT": ["Rome", "Milan", "Naples", "Turin", "Florence", "Venice", "Bologna", "Genoa", "Bari", "Palermo", "Verona", "Catania", "Syracuse", "Padua", "Taranto", "Brescia", "Prato", "Reggio Calabria", "Modena", "Cagliari"],
-        "ES": ["Madrid", "Barcelona", "Valencia", "Seville", "Bilbao", "Málaga", "Murcia", "Palma", "Las Palmas", "Zaragoza", "Alicante", "Córdoba", "Valladolid", "Vigo", "Gijón", "Hospitalet", "Vitoria", "Elche", "Terrassa", "Oviedo"],
-        "MX": ["Mexico City", "Guadalajara", "Monterrey", "Cancún", "Puebla", "Tijuana", "Ciudad Juárez", "Torreón", "Toluca", "Chihuahua", "Durango", "Saltillo", "Acapulco", "Morelia", "Veracruz", "Tampico", "Tulum", "Oaxaca", "Guadalupe", "Mazatlán"],
-        "CN": ["Beijing", "Shanghai", "Guangzhou", "Shenzhen", "Chengdu", "Hangzhou", "Wuhan", "Nanjing", "Xi'an", "Chongqing", "Suzhou", "Tianjin", "Kunming", "Qingdao", "Dalian", "Harbin", "Jinan", "Shenyang", "Changchun", "Ningbo"],
-        "NL": ["Amsterdam", "Rotterdam", "The Hague", "Utrecht", "Eindhoven", "Groningen", "Tilburg", "Almere", "Breda", "Nijmegen", "Enschede", "Haarlem", "Arnhem", "Maastricht", "Zaanstad", "Zwolle", "Leeuwarden", "Leiden", "Delft", "Alkmaar"],
-        "SG": ["Singapore"],
-        "AE": ["Dubai", "Abu Dhabi", "Sharjah", "Al Ain", "Ajman", "Ras Al Khaimah", "Fujairah", "Umm Al Quwain", "Khor Fakkan", "Jebel Ali"],
-        "ZA": ["Johannesburg", "Cape Town", "Durban", "Pretoria", "Port Elizabeth", "Bloemfontein", "East London", "Polokwane", "Pietermaritzburg", "Nelspruit", "Kimberley", "George", "Middelburg", "Rustenburg", "Worcester", "Standerton", "Bethlehem", "Mmabatho", "Klerksdorp", "Mossel Bay"],
-        "MA": ["Casablanca", "Rabat", "Marrakech", "Fes", "Tangier", "Agadir", "Meknes", "Oujda", "Kenitra", "Tetouan", "Safi", "El Jadid", "Nador", "Beni Mellal", "Errachidia", "Taza", "Ksar El Kebir", "Guercif", "Tiflet", "Ouarzazate"],
-        "PE": ["Lima", "Arequipa", "Cusco", "Trujillo", "Chiclayo", "Iquitos", "Piura", "Tacna", "Pucallpa", "Sullana", ""],  # Peru cities
-        "AR": ["Buenos Aires", "Córdoba", "Rosario", "Mendoza", "La Plata", "Tucumán", "Mar del Plata", "Salta", "Santa Fe", "Corrientes", "Bahía Blanca", "Posadas", "San Juan", "Resistencia", "Neuquén", "Venado Tuerto", "Villa Lugano", "San Miguel de Tucumán", "Pilar", ""],
-        "CL": ["Santiago", "Valparaíso", "Concepción", "La Serena", "Antofagasta", "Viña del Mar", "Rancagua", "Temuco", "Puerto Montt", "La Reina", ""],
-        "CO": ["Bogotá", "Medellín", "Cali", "Barranquilla", "Cartagena", "Cúcuta", "Soacha", "Soledad", "Bucaramanga", "Pereira", "Santa Marta", "Ibagué", "Pasto", "Manizales", "Neiva", "Armenia", "Villavicencio", "Popayán", "Sincelejo", "Tunja"],
-        "TH": ["Bangkok", "Chiang Mai", "Phuket", "Pattaya", "Krabi", "Hua Hin", "Ayutthaya", "Khon Kaen", "Surat Thani", "Chonburi", "Nonthaburi", "Nakhon Ratchasima", "Udon Thani", "Sakhon Nakhon", "Phitsanulok", "Lampang", "Ubon Ratchathani", "Samut Prakan", "Ratchaburi", "Suphan Buri"],
-        "VN": ["Hanoi", "Ho Chi Minh City", "Da Nang", "Hai Phong", "Can Tho", "Bien Hoa", "Hue", "Thu Dau Mot", "Nha Trang", "Bac Ninh", "Ha Long", "Vung Tau", "Da Lat", "Quy Nhon", "Rach Gia", "Long Xuyen", "Thanh Hoa", "Thai Nguyen", "Yen Bai", "Cau River"],
-        "PH": ["Manila", "Quezon City", "Cebu City", "Davao City", "Makati", "Taguig", "Pasig", "Caloocan", "Bacoor", "Cavite City", "Iloilo City", "Bohol", "Zamboanga City", "Lapu-Lapu City", "Mandaluyong", "Malabon", "San Jose del Monte", "Batangas City", "Legazpi", "Puerto Princesa"],
-        "ID": ["Jakarta", "Surabaya", "Bandung", "Medan", "Semarang", "Tangerang", "Depok", "Palembang", "Makassar", "Bogor", "Bandar Lampung", "Padang", "Denpasar", "Samarinda", "Banjarmasin", "Malang", "Pontianak", "Yogyakarta", "Cirebon", "Bekasi"],
-        "MY": ["Kuala Lumpur", "George Town", "Johor Bahru", "Ipoh", "Shah Alam", "Petaling Jaya", "Kota Kinabalu", "Kuching", "Melaka", "Seremban", "Alor Setar", "Kuantan", "Kuala Terengganu", "Sibu", "Miri", "Sungai Petani", "Batu Pahat", "Kluang", "Tawau", "Sandakan"],
-        "NZ": ["Auckland", "Wellington", "Christchurch", "Hamilton", "Tauranga", "Napier-Hastings", "Palmerston North", "Rotorua", "New Plymouth", "Whangarei", "Dunedin", "Invercargill", "Nelson", "Hastings", "Upper Hutt", "Gisborne", "Timaru", "Blenheim", "Papakura", "Porirua"],
-        "EG": ["Cairo", "Alexandria", "Giza", "Luxor", "Aswan", "Mansoura", "Port Said", "Suez", "Tanta", "Zagazig", "Ismailia", "Faiyum", "Zagazig", "Sohag", "Qena", "Beni Suef", "Hurghada", "Marsa Alam", "Sharm El Sheikh", "Damanhur"],
-        "NG": ["Lagos", "Abuja", "Ibadan", "Kano", "Port Harcourt", "Benin City", "Maiduguri", "Zaria", "Aba", "Jos", "Ilorin", "Owerri", "Yenagoa", "Enugu", "Abuja", "Lagos Island", "Ikeja", "Surulere", "Victoria Island", "Ikoyi"],
-        "KE": ["Nairobi", "Mombasa", "Kisumu", "Nakuru", "Eldoret", "Thika", "Malindi", "Kitale", "Garissa", "Kapenguria", "Nyali", "Kisii", "Nyeri", "Meru", "Embu", "Naivasha", "Kericho", "Kakamega", "Migori", "Bungoma"],
-        "GR": ["Athens", "Thessaloniki", "Patras", "Heraklion", "Larissa", "Volos", "Ioannina", "Chania", "Kalamata", "Alexandroupoli", "Kavala", "Lamia", "Drama", "Trikala", "Serres", "Chios", "Rodos", "Kos", "Corfu", "Santorini"],
-        "TR": ["Istanbul", "Ankara", "Izmir", "Bursa", "Antalya", "Adana", "Gaziantep", "Konya", "Mersin", "Eskisehir", "Denizli", "Samsun", "Diyarbakir", "Kayseri", "Sivas", "Trabzon", "Urfa", "Malatya", "Erzurum", "Tekirdag"],
-        "RU": ["Moscow", "Saint Petersburg", "Novosibirsk", "Yekaterinburg", "Nizhny Novgorod", "Kazan", "Chelyabinsk", "Omsk", "Samara", "Rostov-on-Don", "Ufa", "Krasnoyarsk", "Voronezh", "Volgograd", "Krasnodar", "Saratov", "Tyumen", "Tolyatti", "Izhevsk", "Barnaul"],
-    }
-    
-    if country and country in cities_by_country:
-        return random.choice(cities_by_country[country])
-    
-    # Return random city from all cities if no country specified
-    all_cities = []
-    for cities in cities_by_country.values():
-        all_cities.extend(cities)
-    return random.choice(all_cities)
-
-def generate_zipcode(country=None, zip_from=10000, zip_to=99999):
+def generate_country(starts_with=None, rng=random, table=None):
+    """Generate country - unique names, from those matching starts_with if any do"""
+    return weighted_choice(country_choices(starts_with), table, rng)
+
+def generate_city(country=None, rng=random, table=None):
+    """Generate city based on country selection, or from all cities if none is given"""
+    return weighted_choice(city_choices(country), table, rng)
+
+def generate_zipcode(country=None, zip_from=10000, zip_to=99999, rng=random):
     """Generate zipcode based on from/to range"""
     # Convert to integers in case they come as strings
     zip_from = int(zip_from) if zip_from else 10000
@@ -976,11 +2144,474 @@ def generate_zipcode(country=None, zip_from=10000, zip_to=99999):
         zip_from, zip_to = zip_to, zip_from
     
     # Generate random zipcode within range
-    zip_code = random.randint(zip_from, zip_to)
+    zip_code = rng.randint(zip_from, zip_to)
     return str(zip_code)
 
-def generate_street():
-    return f"{random.randint(100, 9999)} {random.choice(US_STREETS)}"
+def generate_street(rng=random):
+    return f"{rng.randint(100, 9999)} {rng.choice(US_STREETS)}"
+
+def generate_text(length=5, rng=random):
+    return " ".join(rng.choice(TEXT_WORDS) for _ in range(length))
+
+# ============ Batch Generators ============
+# Each batch generator draws the random numbers for all N rows with a single
+# NumPy call and formats them in bulk, avoiding per-value interpreter overhead.
+
+def generate_batch(type_id: str, n: int, options: dict, rng=random) -> List[str]:
+    """Generate n values of the specified type"""
+    return compile_batch(type_id, options, rng)(n)
+
+def compile_batch(type_id: str, options: dict, rng=random):
+    """Bind options and an RNG to a type's batch generator once; returns a callable taking n"""
+    options = {k: v for k, v in options.items() if v is not None}
+    batch_fn = BATCH_GENERATORS.get(type_id) if np is not None else None
+    if batch_fn is None:
+        generate = compile_generator(type_id, options, rng)
+        return lambda n: [generate() for _ in range(n)]
+    # The NumPy generator is seeded from rng, so seeded requests stay reproducible
+    return lambda n: batch_fn(n, options, np.random.default_rng(rng.getrandbits(128)))
 
-def generate_text(length=5):
-    return " ".join(random.choice(TEXT_WORDS) for _ in range(length))
+def _np_digits(values, width):
+    """Zero-padded ASCII digit matrix (n, width) for an integer array"""
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    return (values[:, None] // powers % 10).astype(np.uint8) + 48
+
+def _np_hex(values, width, uppercase=False):
+    """Zero-padded ASCII hex matrix (n, width) for an integer array"""
+    table = np.frombuffer(b"0123456789ABCDEF" if uppercase else b"0123456789abcdef", dtype=np.uint8)
+    shifts = np.arange(width - 1, -1, -1, dtype=np.int64) * 4
+    return table[(values[:, None] >> shifts) & 0xF]
+
+def _np_literal(text, n):
+    """Constant ASCII column block repeated for n rows"""
+    return np.broadcast_to(np.frombuffer(text.encode("ascii"), dtype=np.uint8), (n, len(text)))
+
+def _np_join(parts):
+    """Concatenate ASCII column blocks into a fixed-width StringColumn"""
+    return StringColumn.from_fixed_width(np.hstack(parts))
+
+def _np_unpadded(matrix):
+    """A zero-padded digit matrix paired with a mask that drops its leading zeros"""
+    mask = np.ones(matrix.shape, dtype=bool)
+    mask[:, :-1] = np.cumsum(matrix[:, :-1] != ord("0"), axis=1) > 0
+    return matrix, mask
+
+def _np_join_masked(parts):
+    """Like _np_join, but (matrix, mask) parts only keep their masked bytes, so widths vary"""
+    parts = [part if isinstance(part, tuple) else (part, np.ones(part.shape, dtype=bool)) for part in parts]
+    return StringColumn.from_masked(np.hstack([matrix for matrix, _ in parts]), np.hstack([mask for _, mask in parts]))
+
+def batch_uuid(n, options, rng):
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    hexed = _np_hex(raw.reshape(-1).astype(np.int64), 2).reshape(n, 32)
+    dash = _np_literal("-", n)
+    return _np_join([hexed[:, :8], dash, hexed[:, 8:12], dash, hexed[:, 12:16], dash, hexed[:, 16:20], dash, hexed[:, 20:]])
+
+def batch_password(n, options, rng):
+    chars = ""
+    if options.get("uppercase", True):
+        chars += "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    if options.get("lowercase", True):
+        chars += "abcdefghijklmnopqrstuvwxyz"
+    if options.get("numbers", True):
+        chars += "0123456789"
+    if options.get("special", False):
+        chars += "!@#$%^&*()_+-=[]{}|;:,.<>?"
+    if not chars:
+        chars = "abcdefghijklmnopqrstuvwxyz"
+    length = options.get("length", 16)
+    if length <= 0:
+        return [""] * n
+    table = np.frombuffer(chars.encode("ascii"), dtype=np.uint8)
+    return _np_join([table[rng.integers(0, len(chars), size=(n, length))]])
+
+def batch_imei(n, options, rng):
+    brand = options.get("brand", "Generic")
+    if brand == "Generic":
+        tac = rng.integers(35, 87, size=n)
+    else:
+        tac = np.full(n, int(IMEI_BRANDS.get(brand, "35")))
+    body = rng.integers(0, 10, size=(n, 12))
+    digits = np.hstack([tac[:, None] // 10, tac[:, None] % 10, body])
+    check = luhn_check_digits(digits)
+    if not options.get("valid_checksum", True):
+        check = wrong_check_digit(check)
+    return _np_join([(digits + 48).astype(np.uint8), (check[:, None] + 48).astype(np.uint8)])
+
+def batch_mac_address(n, options, rng):
+    octets = _np_hex(rng.integers(0, 256, size=n * 6), 2, options.get("uppercase", True)).reshape(n, 12)
+    separator = options.get("separator", ":")
+    parts = []
+    for i in range(6):
+        if i and separator:
+            parts.append(_np_literal(separator, n))
+        parts.append(octets[:, 2 * i:2 * i + 2])
+    return _np_join(parts)
+
+def compile_digit_format(spec: dict):
+    """Split a locale format whose fields are all integer ranges into literal text and
+    (range, width) digit fields for batch rendering; None if a field is not a range"""
+    if not spec["format"].isascii():
+        return None
+    pieces = []
+    for i, piece in enumerate(re.split(r"\{(\w+)\}", spec["format"])):
+        if i % 2 == 0:
+            if piece:
+                pieces.append(piece)
+            continue
+        values = spec["fields"][piece]
+        if not isinstance(values, range) or values.step != 1:
+            return None
+        pieces.append((values, len(str(values[-1]))))
+    return pieces
+
+PHONE_DIGIT_FORMATS = {country: compile_digit_format(spec) for country, spec in PHONE_FORMATS.items()}
+DEFAULT_PHONE_DIGIT_FORMAT = compile_digit_format(DEFAULT_PHONE_FORMAT)
+
+def batch_digit_format(pieces, n, rng, head=""):
+    """Render a compiled digit format for n rows; fields whose values vary in width drop leading zeros"""
+    parts = [_np_literal(head, n)] if head else []
+    for piece in pieces:
+        if isinstance(piece, str):
+            parts.append(_np_literal(piece, n))
+            continue
+        values, width = piece
+        digits = _np_digits(rng.integers(values.start, values.stop, size=n, dtype=np.int64), width)
+        parts.append(digits if len(str(values.start)) == width else _np_unpadded(digits))
+    if any(isinstance(part, tuple) for part in parts):
+        return _np_join_masked(parts)
+    return _np_join(parts)
+
+def batch_phone(n, options, rng):
+    country = options.get("country", "US")
+    code = COUNTRIES.get(country, COUNTRIES["US"])["code"]
+    head = f"{code} " if options.get("include_code", True) else ""
+    pieces = PHONE_DIGIT_FORMATS.get(country, DEFAULT_PHONE_DIGIT_FORMAT)
+    if pieces is None:
+        values = batch_locale_format(PHONE_TEMPLATES.get(country, DEFAULT_PHONE_TEMPLATE), n, rng)
+        return [head + value for value in values] if head else values
+    return batch_digit_format(pieces, n, rng, head)
+
+def _np_choice(values, n, rng):
+    """n draws from a sequence by index; ranges come back as ints without materializing them"""
+    idx = rng.integers(0, len(values), size=n, dtype=np.int64)
+    if isinstance(values, range):
+        return (values.start + idx * values.step).tolist()
+    return np.array(values, dtype=object)[idx].tolist()
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def _dictionary(values: tuple) -> StringColumn:
+    return StringColumn.from_strings(values)
+
+def _np_dictionary(values, n, rng, table=None):
+    """n draws from a tuple of strings, dictionary-encoded; table (an AliasTable) weights the draws"""
+    codes = table.draw_batch(n, rng) if table is not None else rng.integers(0, len(values), size=n, dtype=np.int32)
+    return DictionaryColumn(codes, _dictionary(tuple(values)))
+
+def batch_locale_format(compiled, n, rng):
+    template, fields = compiled
+    return [template % row for row in zip(*[_np_choice(values, n, rng) for values in fields])]
+
+def batch_address(n, options, rng):
+    return batch_locale_format(ADDRESS_TEMPLATES.get(options.get("country", "US"), DEFAULT_ADDRESS_TEMPLATE), n, rng)
+
+def batch_city(n, options, rng):
+    cities = city_choices(options.get("country"))
+    return _np_dictionary(cities, n, rng, choice_table("city", cities, options))
+
+def batch_country(n, options, rng):
+    countries = country_choices(options.get("starts_with"))
+    return _np_dictionary(countries, n, rng, choice_table("country", countries, options))
+
+def batch_job(n, options, rng):
+    jobs = job_choices(options.get("seniority", "any"))
+    return _np_dictionary(jobs, n, rng, choice_table("job", jobs, options))
+
+@lru_cache(maxsize=FILTER_CACHE_SIZE)
+def company_names(starts_with=None):
+    """Every name generate_company can produce, indexed by adjective * len(COMPANY_KINDS) + kind"""
+    names = [adj.capitalize() + " " + kind for adj in USERNAME_ADJ for kind in COMPANY_KINDS]
+    if starts_with:
+        names = [name if starts_with.strip().upper() in name.upper() else starts_with + name for name in names]
+    return tuple(names)
+
+def batch_company(n, options, rng):
+    return _np_dictionary(company_names(options.get("starts_with")), n, rng)
+
+def batch_pattern(n, options, rng):
+    return compile_pattern(options.get("template") or DEFAULT_PATTERN).batch(n, rng)
+
+def batch_zipcode(n, options, rng):
+    zip_from = options.get("from", 10000)
+    zip_to = options.get("to", 99999)
+    zip_from = int(zip_from) if zip_from else 10000
+    zip_to = int(zip_to) if zip_to else 99999
+    if zip_from > zip_to:
+        zip_from, zip_to = zip_to, zip_from
+    values = rng.integers(zip_from, zip_to + 1, size=n, dtype=np.int64)
+    if zip_from < 0:
+        return list(map(str, values.tolist()))
+    return _np_join_masked([_np_unpadded(_np_digits(values, len(str(zip_to))))])
+
+def batch_credit_card(n, options, rng):
+    card_type = options.get("card_type", "Random")
+    valid = options.get("valid", "valid") == "valid"
+    if card_type == "Random":
+        table = choice_table("credit_card", CARD_BRANDS, options)
+        picks = table.draw_batch(n, rng) if table is not None else rng.integers(0, len(CARD_BRANDS), size=n)
+        results = [None] * n
+        for i, name in enumerate(CARD_BRANDS):
+            rows = np.flatnonzero(picks == i)
+            for row, value in zip(rows.tolist(), _batch_card_numbers(name, len(rows), valid, rng)):
+                results[row] = value
+        return results
+    return _batch_card_numbers(card_type, n, valid, rng)
+
+def _batch_card_numbers(card_type, n, valid, rng):
+    if n == 0:
+        return []
+    config = CREDIT_CARD_TYPES.get(card_type, CREDIT_CARD_TYPES["Visa"])
+    prefixes = np.array([[int(d) for d in p] for p in config["prefixes"]])
+    length = config["length"]
+    body = rng.integers(0, 10, size=(n, length - 1 - prefixes.shape[1]))
+    digits = np.hstack([prefixes[rng.integers(0, len(prefixes), size=n)], body])
+    check = luhn_check_digits(digits)
+    if not valid:
+        check = wrong_check_digit(check)
+    cc = (np.hstack([digits, check[:, None]]) + 48).astype(np.uint8)
+    dash = _np_literal("-", n)
+    if card_type == "American Express":
+        return _np_join([cc[:, :4], dash, cc[:, 4:10], dash, cc[:, 10:]])
+    parts = []
+    for i in range(0, length, 4):
+        if i:
+            parts.append(dash)
+        parts.append(cc[:, i:i + 4])
+    return _np_join(parts)
+
+def batch_ssn(n, options, rng):
+    if options.get("country", "US") == "UK":
+        space = _np_literal(" ", n)
+        return _np_join([
+            _np_digits(rng.integers(10, 100, size=n), 2), space,
+            _np_digits(rng.integers(100000, 1000000, size=n), 6), space,
+            _np_digits(rng.integers(100000, 1000000, size=n), 6),
+        ])
+    dash = _np_literal("-", n)
+    return _np_join([
+        _np_digits(rng.integers(100, 1000, size=n), 3), dash,
+        _np_digits(rng.integers(10, 100, size=n), 2), dash,
+        _np_digits(rng.integers(1000, 10000, size=n), 4),
+    ])
+
+def batch_barcode(n, options, rng):
+    length = options.get("length", 13)
+    if length <= 0:
+        return [""] * n
+    if options.get("numeric_only", True):
+        digits = rng.integers(0, 10, size=(n, length), dtype=np.uint8)
+        if length >= 2:
+            digits[:, -1] = gs1_check_digits(digits[:, :-1])
+        return _np_join([digits + 48])
+    table = np.frombuffer(b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ", dtype=np.uint8)
+    return _np_join([table[rng.integers(0, len(table), size=(n, length))]])
+
+def batch_isbn(n, options, rng):
+    dash = _np_literal("-", n)
+    if options.get("format", "isbn13") == "isbn10":
+        digits = rng.integers(0, 10, size=(n, 9))
+        check = isbn10_check_digits(digits)
+        check_chars = np.frombuffer(b"0123456789X", dtype=np.uint8)[check]
+        ascii_digits = (digits + 48).astype(np.uint8)
+        return _np_join([ascii_digits[:, :1], dash, ascii_digits[:, 1:6], dash, ascii_digits[:, 6:], dash, check_chars[:, None]])
+    digits = np.hstack([np.broadcast_to(np.array([9, 7, 8]), (n, 3)), rng.integers(0, 10, size=(n, 9))])
+    check = gs1_check_digits(digits)
+    ascii_digits = (np.hstack([digits, check[:, None]]) + 48).astype(np.uint8)
+    return _np_join([ascii_digits[:, :3], dash, ascii_digits[:, 3:5], dash, ascii_digits[:, 5:10], dash, ascii_digits[:, 10:12], dash, ascii_digits[:, 12:]])
+
+def batch_ip(n, options, rng):
+    if options.get("version", "ipv4") == "ipv6":
+        groups = rng.integers(0, 65536, size=(n, 8))
+        colon = _np_literal(":", n)
+        return _np_join_masked([part for i in range(8) for part in ([colon] if i else []) + [_np_unpadded(_np_hex(groups[:, i], 4))]])
+    octets = rng.integers(0, 256, size=(n, 4))
+    octets[:, 0] = rng.integers(1, 256, size=n)
+    dot = _np_literal(".", n)
+    return _np_join_masked([part for i in range(4) for part in ([dot] if i else []) + [_np_unpadded(_np_digits(octets[:, i], 3))]])
+
+def batch_datetime(n, options, rng):
+    include_date = options.get("include_date", True)
+    include_time = options.get("include_time", True)
+    parts = []
+    if include_date:
+        dash = _np_literal("-", n)
+        parts += [
+            _np_digits(rng.integers(2020, 2026, size=n), 4), dash,
+            _np_digits(rng.integers(1, 13, size=n), 2), dash,
+            _np_digits(rng.integers(1, 29, size=n), 2),
+        ]
+    if include_time:
+        colon = _np_literal(":", n)
+        if include_date:
+            parts.append(_np_literal("T", n))
+        parts += [
+            _np_digits(rng.integers(0, 24, size=n), 2), colon,
+            _np_digits(rng.integers(0, 60, size=n), 2), colon,
+            _np_digits(rng.integers(0, 60, size=n), 2), _np_literal(".", n),
+            _np_digits(rng.integers(0, 1000, size=n), 3),
+        ]
+    if not parts:
+        return [""] * n
+    if options.get("include_timezone", False):
+        parts.append(_np_literal("Z", n))
+    return _np_join(parts)
+
+def batch_hex_color(n, options, rng):
+    hexed = _np_hex(rng.integers(0, 1 << 24, size=n), 6, options.get("uppercase", True))
+    return _np_join([_np_literal("#", n), hexed])
+
+def batch_rgb_color(n, options, rng):
+    min_value = options.get("min_value", 0)
+    max_value = options.get("max_value", 255)
+    channels = rng.integers(min_value, max_value + 1, size=(n, 3))
+    if min_value < 0:
+        return [f"rgb({r}, {g}, {b})" for r, g, b in channels.tolist()]
+    width = len(str(max_value))
+    comma = _np_literal(", ", n)
+    return _np_join_masked([
+        _np_literal("rgb(", n), _np_unpadded(_np_digits(channels[:, 0], width)), comma,
+        _np_unpadded(_np_digits(channels[:, 1], width)), comma,
+        _np_unpadded(_np_digits(channels[:, 2], width)), _np_literal(")", n),
+    ])
+
+BATCH_GENERATORS = {
+    "uuid": batch_uuid,
+    "password": batch_password,
+    "imei": batch_imei,
+    "mac_address": batch_mac_address,
+    "phone": batch_phone,
+    "address": batch_address,
+    "city": batch_city,
+    "country": batch_country,
+    "zipcode": batch_zipcode,
+    "credit_card": batch_credit_card,
+    "ssn": batch_ssn,
+    "barcode": batch_barcode,
+    "isbn": batch_isbn,
+    "ip": batch_ip,
+    "datetime": batch_datetime,
+    "hex_color": batch_hex_color,
+    "rgb_color": batch_rgb_color,
+    "company": batch_company,
+    "job": batch_job,
+    "pattern": batch_pattern,
+}
+
+# ============ Unique Value Spaces ============
+# Types whose values can be enumerated. Each factory takes the request options and
+# returns (size, decode): decode turns a list of indices in range(size) into values,
+# distinct indices giving distinct values. unique=true walks a seeded permutation of
+# the indices; types not listed here fall back to filtering out repeats (see iter_unique).
+
+def _product_space(template, fields):
+    """Every combination of field values, rendered with a %-template"""
+    fields = [f if isinstance(f, range) else tuple(dict.fromkeys(f)) for f in fields]
+    size = math.prod(len(f) for f in fields)
+    
+    def decode(indices):
+        results = []
+        for index in indices:
+            values = []
+            for field in reversed(fields):
+                index, i = divmod(index, len(field))
+                values.append(field[i])
+            results.append(template % tuple(reversed(values)))
+        return results
+    return size, decode
+
+def _zipcode_space(options):
+    zip_from = int(options.get("from")) if options.get("from") else 10000
+    zip_to = int(options.get("to")) if options.get("to") else 99999
+    if zip_from > zip_to:
+        zip_from, zip_to = zip_to, zip_from
+    return _product_space("%s", [range(zip_from, zip_to + 1)])
+
+def _username_space(options):
+    prefix = (options.get("prefix") or "").replace("%", "%%")
+    style = options.get("style", "name_year")
+    if style == "name_year":
+        return _product_space(prefix + "%s%s", [USERNAME_NAMES, range(1, 100)])
+    elif style == "adj_noun":
+        return _product_space(prefix + "%s_%s", [USERNAME_ADJ, USERNAME_NOUN])
+    elif style == "name_random":
+        return _product_space(prefix + "%s.%s", [USERNAME_NAMES, range(100, 1000)])
+    return _product_space(prefix + "mrx_%s", [USERNAME_NAMES])
+
+def _email_space(options):
+    domain = options.get("domain")
+    extension = options.get("extension")
+    if extension and not extension.startswith('.'):
+        extension = '.' + extension
+    if domain:
+        host = domain + (extension or "")
+    elif extension:
+        host = "example" + extension
+    else:
+        return _product_space("%s%s@%s", [EMAIL_NAMES, range(1, 1000), EMAIL_DOMAINS])
+    return _product_space("%s%s@" + host.replace("%", "%%"), [EMAIL_NAMES, range(1, 1000)])
+
+def _phone_space(options):
+    country = options.get("country", "US")
+    template, fields = PHONE_TEMPLATES.get(country, DEFAULT_PHONE_TEMPLATE)
+    if options.get("include_code", True):
+        template = COUNTRIES.get(country, COUNTRIES["US"])["code"] + " " + template
+    return _product_space(template, fields)
+
+def _address_space(options):
+    return _product_space(*ADDRESS_TEMPLATES.get(options.get("country", "US"), DEFAULT_ADDRESS_TEMPLATE))
+
+def _city_space(options):
+    country = options.get("country")
+    return _product_space("%s", [CITIES_BY_COUNTRY.get(country, ALL_CITIES) if country else ALL_CITIES])
+
+def _country_space(options):
+    return _product_space("%s", [country_choices(options.get("starts_with"))])
+
+def _job_space(options):
+    return _product_space("%s", [job_choices(options.get("seniority", "any"))])
+
+def _company_space(options):
+    return _product_space("%s", [company_names(options.get("starts_with"))])
+
+def _hex_color_space(options):
+    return _product_space("#%06X" if options.get("uppercase", True) else "#%06x", [range(1 << 24)])
+
+def _imei_space(options):
+    brand = options.get("brand", "Generic")
+    tacs = range(35, 87) if brand == "Generic" else [int(IMEI_BRANDS.get(brand, "35"))]
+    valid_checksum = options.get("valid_checksum", True)
+    
+    def decode(indices):
+        results = []
+        for index in indices:
+            tac, body = divmod(index, 10 ** 12)
+            imei = f"{tacs[tac]}{body:012d}"
+            results.append(imei + imei_check_digit(imei, valid_checksum))
+        return results
+    return len(tacs) * 10 ** 12, decode
+
+UNIQUE_SPACES = {
+    "zipcode": _zipcode_space,
+    "username": _username_space,
+    "email": _email_space,
+    "phone": _phone_space,
+    "address": _address_space,
+    "city": _city_space,
+    "country": _country_space,
+    "job": _job_space,
+    "company": _company_space,
+    "hex_color": _hex_color_space,
+    "imei": _imei_space,
+}
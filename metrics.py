@@ -0,0 +1,108 @@
+"""
+Metrics - counters and histograms in the Prometheus text exposition format
+
+Kept deliberately small: recording a sample is one dict lookup and one bisect
+under a lock, and all formatting happens when /metrics is scraped.
+"""
+
+import bisect
+import math
+import threading
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds, 0.5 ms .. 10 s
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in labels.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values=(), amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            yield self.name, dict(zip(self.labels, label_values)), value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> per-bucket counts (last one is +Inf), then the sum
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(label_values)
+            if counts is None:
+                counts = self._values[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[index] += 1
+            counts[-1] += value
+
+    def samples(self):
+        with self._lock:
+            values = sorted((k, list(v)) for k, v in self._values.items())
+        for label_values, counts in values:
+            labels = dict(zip(self.labels, label_values))
+            total = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                total += n
+                yield self.name + "_bucket", {**labels, "le": format_value(bound)}, total
+            yield self.name + "_count", labels, total
+            yield self.name + "_sum", labels, counts[-1]
+
+
+class Callback:
+    """Unlabelled counter or gauge whose value is read from fn() at scrape time"""
+
+    def __init__(self, name, help, kind, fn):
+        self.name, self.help, self.kind, self.fn = name, help, kind, fn
+
+    def samples(self):
+        yield self.name, {}, self.fn()
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(f"{name}{format_labels(labels)} {format_value(value)}" for name, labels, value in metric.samples())
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,286 @@
+"""
+Pattern templates - custom ID formats such as ORD-2024-#####-??
+
+Template syntax:
+    #           digit 0-9
+    ?           uppercase letter A-Z
+    @           lowercase letter a-z
+    ^           lowercase hex digit 0-9a-f
+    [A-F0-9_]   one character from a set; ranges like A-F are expanded
+    (ORD|INV)   one of several alternatives, each itself a template
+    {n} {m,n}   repeat the preceding character, class, set or group
+    \\x          the character x literally, e.g. \\# or \\{
+Anything else is literal text.
+
+A template is parsed once into a tree of nodes (cached by template string in
+compile_pattern). Each node draws single values with a random.Random and whole
+batches with a NumPy Generator: the batch path builds a uint8 matrix with one
+row per value, plus a mask of the bytes to keep when lengths vary, and returns
+it as a StringColumn.
+"""
+
+import string
+from functools import lru_cache
+
+from columns import StringColumn
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only Pattern.batch needs it
+    np = None
+
+CLASSES = {
+    "#": string.digits,
+    "?": string.ascii_uppercase,
+    "@": string.ascii_lowercase,
+    "^": string.digits + "abcdef",
+}
+
+# Limits that keep a template's values and its batch matrices small
+MAX_TEMPLATE_LENGTH = 256
+MAX_REPEAT = 256
+MAX_VALUE_BYTES = 1024
+
+
+class Literal:
+    def __init__(self, text):
+        self.text = text
+        self.encoded = text.encode()
+        self.width = len(self.encoded)
+
+    def generate(self, rng):
+        return self.text
+
+    def batch(self, n, rng):
+        matrix = np.broadcast_to(np.frombuffer(self.encoded, dtype=np.uint8), (n, self.width))
+        return matrix, None
+
+
+class CharSet:
+    """One character drawn uniformly from chars"""
+
+    def __init__(self, chars):
+        self.chars = chars
+        encoded = [c.encode() for c in chars]
+        self.width = max(map(len, encoded))
+        self._table = np.array([list(e.ljust(self.width, b"\0")) for e in encoded], dtype=np.uint8) if np else None
+        # Multi-byte characters leave unused padding bytes that the mask drops
+        self._lengths = np.array([len(e) for e in encoded]) if np and self.width > 1 else None
+
+    def generate(self, rng):
+        return rng.choice(self.chars)
+
+    def batch(self, n, rng):
+        picks = rng.integers(0, len(self.chars), size=n)
+        if self._lengths is None:
+            return self._table[picks], None
+        return self._table[picks], np.arange(self.width) < self._lengths[picks][:, None]
+
+
+class Sequence:
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.width = sum(node.width for node in nodes)
+
+    def generate(self, rng):
+        return "".join([node.generate(rng) for node in self.nodes])
+
+    def batch(self, n, rng):
+        return _hstack([node.batch(n, rng) for node in self.nodes], n)
+
+
+class Repeat:
+    def __init__(self, node, low, high):
+        self.node, self.low, self.high = node, low, high
+        self.width = node.width * high
+
+    def generate(self, rng):
+        count = self.low if self.low == self.high else rng.randint(self.low, self.high)
+        if isinstance(self.node, CharSet):
+            return "".join(rng.choices(self.node.chars, k=count))
+        return "".join([self.node.generate(rng) for _ in range(count)])
+
+    def batch(self, n, rng):
+        if isinstance(self.node, CharSet) and self.node._lengths is None:
+            # All the single-byte characters in one draw
+            parts = [(self.node._table[:, 0][rng.integers(0, len(self.node.chars), size=(n, self.high))], None)]
+            if self.low != self.high:
+                counts = rng.integers(self.low, self.high + 1, size=n)
+                parts = [(parts[0][0], np.arange(self.high) < counts[:, None])]
+            return _hstack(parts, n)
+        parts = [self.node.batch(n, rng) for _ in range(self.high)]
+        if self.low != self.high:
+            counts = rng.integers(self.low, self.high + 1, size=n)
+            parts = [(matrix, _and(mask, (i < counts)[:, None], matrix.shape)) for i, (matrix, mask) in enumerate(parts)]
+        return _hstack(parts, n)
+
+
+class Choice:
+    """One of several alternatives, drawn uniformly"""
+
+    def __init__(self, alternatives):
+        self.alternatives = alternatives
+        self.width = max(alt.width for alt in alternatives)
+
+    def generate(self, rng):
+        return rng.choice(self.alternatives).generate(rng)
+
+    def batch(self, n, rng):
+        # Each alternative is generated only for the rows that picked it, padded to one width
+        picks = rng.integers(0, len(self.alternatives), size=n)
+        matrix = np.zeros((n, self.width), dtype=np.uint8)
+        mask = np.zeros((n, self.width), dtype=bool)
+        fixed = True
+        for i, alt in enumerate(self.alternatives):
+            rows = np.flatnonzero(picks == i)
+            alt_matrix, alt_mask = alt.batch(len(rows), rng)
+            matrix[rows, :alt.width] = alt_matrix
+            mask[rows, :alt.width] = True if alt_mask is None else alt_mask
+            fixed = fixed and alt_mask is None and alt.width == self.width
+        return matrix, None if fixed else mask
+
+
+def _and(mask, keep, shape):
+    return np.broadcast_to(keep, shape) if mask is None else mask & keep
+
+
+def _hstack(parts, n):
+    """Join (matrix, mask) parts side by side; the mask stays None while every byte is kept"""
+    if not parts:
+        return np.empty((n, 0), dtype=np.uint8), None
+    matrix = np.hstack([m for m, _ in parts])
+    if all(mask is None for _, mask in parts):
+        return matrix, None
+    return matrix, np.hstack([np.ones(m.shape, dtype=bool) if mask is None else mask for m, mask in parts])
+
+
+class Pattern:
+    """A compiled template"""
+
+    def __init__(self, template, root):
+        self.template = template
+        self.root = root
+        # Most bytes one value can take
+        self.width = root.width
+
+    def generate(self, rng):
+        return self.root.generate(rng)
+
+    def batch(self, n, rng):
+        matrix, mask = self.root.batch(n, rng)
+        # Fixed-width columns decode as ASCII, so other templates keep a mask
+        if mask is None and matrix.shape[1] and self.template.isascii():
+            return StringColumn.from_fixed_width(matrix)
+        return StringColumn.from_masked(matrix, np.ones(matrix.shape, dtype=bool) if mask is None else mask)
+
+
+@lru_cache(maxsize=256)
+def compile_pattern(template):
+    """Parse a template into a Pattern; raises ValueError describing the first syntax error"""
+    if not template:
+        raise ValueError("template must not be empty")
+    if len(template) > MAX_TEMPLATE_LENGTH:
+        raise ValueError(f"template must be at most {MAX_TEMPLATE_LENGTH} characters")
+    parser = _Parser(template)
+    root = parser.alternation()
+    if parser.pos < len(template):
+        raise parser.error("unmatched )")
+    if root.width > MAX_VALUE_BYTES:
+        raise ValueError(f"template values may be up to {root.width} bytes; the limit is {MAX_VALUE_BYTES}")
+    return Pattern(template, root)
+
+
+class _Parser:
+    def __init__(self, template):
+        self.template = template
+        self.pos = 0
+
+    def error(self, message):
+        return ValueError(f"template error at position {self.pos}: {message}")
+
+    def peek(self):
+        return self.template[self.pos] if self.pos < len(self.template) else None
+
+    def alternation(self):
+        """Sequences separated by |"""
+        alternatives = [self.sequence()]
+        while self.peek() == "|":
+            self.pos += 1
+            alternatives.append(self.sequence())
+        return alternatives[0] if len(alternatives) == 1 else Choice(alternatives)
+
+    def sequence(self):
+        """Atoms up to the end, a | or a closing )"""
+        nodes = []
+        while self.peek() not in (None, "|", ")"):
+            node = self.repeat(self.atom())
+            # Merge neighbouring literals so "ORD-" is one node, not four
+            if isinstance(node, Literal) and nodes and isinstance(nodes[-1], Literal):
+                nodes[-1] = Literal(nodes[-1].text + node.text)
+            else:
+                nodes.append(node)
+        return nodes[0] if len(nodes) == 1 else Sequence(nodes)
+
+    def atom(self):
+        c = self.template[self.pos]
+        self.pos += 1
+        if c in CLASSES:
+            return CharSet(CLASSES[c])
+        if c == "\\":
+            if self.peek() is None:
+                raise self.error("\\ at the end of the template")
+            self.pos += 1
+            return Literal(self.template[self.pos - 1])
+        if c == "[":
+            return CharSet(self.char_set())
+        if c == "(":
+            node = self.alternation()
+            if self.peek() != ")":
+                raise self.error("( without a closing )")
+            self.pos += 1
+            return node
+        if c in "]{}":
+            raise self.error(f"unexpected {c}; write \\{c} for a literal")
+        return Literal(c)
+
+    def char_set(self):
+        chars = []
+        while self.peek() != "]":
+            if self.peek() is None:
+                raise self.error("[ without a closing ]")
+            c = self.template[self.pos]
+            if c == "\\" and self.pos + 1 < len(self.template):
+                self.pos += 1
+                c = self.template[self.pos]
+            self.pos += 1
+            if self.peek() == "-" and self.pos + 1 < len(self.template) and self.template[self.pos + 1] != "]":
+                end = self.template[self.pos + 1]
+                if ord(end) < ord(c):
+                    raise self.error(f"range {c}-{end} is reversed")
+                chars.extend(chr(code) for code in range(ord(c), ord(end) + 1))
+                self.pos += 2
+            else:
+                chars.append(c)
+        self.pos += 1
+        if not chars:
+            raise self.error("empty character set")
+        return "".join(dict.fromkeys(chars))
+
+    def repeat(self, node):
+        if self.peek() != "{":
+            return node
+        end = self.template.find("}", self.pos)
+        if end < 0:
+            raise self.error("{ without a closing }")
+        spec = self.template[self.pos + 1:end]
+        low, _, high = spec.partition(",")
+        try:
+            low, high = int(low), int(high) if high else int(low)
+        except ValueError:
+            raise self.error(f"repeat count must be {{n}} or {{m,n}}, not {{{spec}}}")
+        if not 0 <= low <= high <= MAX_REPEAT:
+            raise self.error(f"repeat counts must satisfy 0 <= m <= n <= {MAX_REPEAT}")
+        self.pos = end + 1
+        if isinstance(node, Literal) and low == high:
+            return Literal(node.text * low)
+        return Repeat(node, low, high)
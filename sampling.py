@@ -0,0 +1,71 @@
+"""
+Weighted sampling - Walker/Vose alias tables
+
+An AliasTable is built once per weight vector in O(n) and then draws an index
+in O(1): one uniform number picks a column and its fractional part decides
+between the column's own index and its alias. Batch draws cost a single
+NumPy random call, the same as a uniform rng.integers.
+"""
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only draw_batch needs it
+    np = None
+
+
+class AliasTable:
+    """O(1) draws of indices 0..n-1 with probability proportional to weights"""
+
+    def __init__(self, weights):
+        weights = [float(w) for w in weights]
+        if not weights:
+            raise ValueError("weights must not be empty")
+        if any(not math.isfinite(w) or w < 0 for w in weights):
+            raise ValueError("weights must be finite and not negative")
+        total = math.fsum(weights)
+        if total <= 0:
+            raise ValueError("weights must not all be zero")
+        n = len(weights)
+        # Vose: scale to mean 1, then pair each short column with a long one that tops it up
+        scaled = [w * n / total for w in weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s], alias[s] = scaled[s], l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left over is 1 up to rounding error
+        self.prob = prob
+        self.alias = alias
+        self._arrays = None
+
+    def __len__(self):
+        return len(self.prob)
+
+    def draw(self, rng):
+        """One index, from a random.Random-like rng"""
+        n = len(self.prob)
+        u = rng.random() * n
+        # min() guards against u rounding up to n
+        i = min(int(u), n - 1)
+        return i if u - i < self.prob[i] else self.alias[i]
+
+    def draw_batch(self, n, rng):
+        """n indices as an int32 array, from a NumPy Generator"""
+        if self._arrays is None:
+            self._arrays = np.array(self.prob), np.array(self.alias, dtype=np.intp)
+        prob, alias = self._arrays
+        u = rng.random(n) * len(prob)
+        # intp indices gather fastest; codes are narrowed to int32 at the end
+        columns = np.minimum(u.astype(np.intp), len(prob) - 1)
+        return np.where(u - columns < prob[columns], columns, alias[columns]).astype(np.int32)
+
+
+def zipf_weights(n, exponent=1.0):
+    """Weight 1 / rank ** exponent for ranks 1..n"""
+    return [1.0 / rank ** exponent for rank in range(1, n + 1)]
@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from main import app
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def generate(client, **fields):
+    """POST /api/generate and return the values, failing on a non-200 response"""
+    response = client.post("/api/generate", json=fields)
+    assert response.status_code == 200, response.text
+    return response.json()["data"]
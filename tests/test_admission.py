@@ -0,0 +1,53 @@
+import pytest
+
+import main
+
+
+@pytest.fixture
+def busy_server():
+    """Hold every generation slot, as if MAX_CONCURRENT_GENERATIONS large requests were running"""
+    for _ in range(main.MAX_CONCURRENT_GENERATIONS):
+        main.acquire_generation_slot()
+    yield
+    for _ in range(main.MAX_CONCURRENT_GENERATIONS):
+        main._generation_slots.release()
+
+
+def test_small_requests_run_while_busy(client, busy_server):
+    small = {"type": "email", "count": main.INLINE_MAX_COUNT}
+    assert client.post("/api/generate", json=small).status_code == 200
+    assert client.post("/api/generate", json={**small, "stream": True}).status_code == 200
+    assert client.post("/api/export?format=csv", json=small).status_code == 200
+    records = {"count": main.INLINE_MAX_COUNT, "columns": [{"name": "email", "type": "email"}]}
+    assert client.post("/api/records?format=jsonl", json=records).status_code == 200
+
+
+def test_large_requests_are_rejected_while_busy(client, busy_server):
+    large = {"type": "email", "count": main.INLINE_MAX_COUNT + 1}
+    for response in (
+        client.post("/api/generate", json=large),
+        client.post("/api/generate", json={**large, "stream": True}),
+        client.post("/api/export?format=csv", json=large),
+    ):
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+
+
+def test_streams_release_their_slot(client):
+    for _ in range(main.MAX_CONCURRENT_GENERATIONS + 2):
+        response = client.post("/api/generate", json={"type": "email", "count": 5000, "stream": True})
+        assert response.status_code == 200
+
+
+def test_few_large_values_take_a_slot(client, busy_server):
+    for request in (
+        {"type": "password", "count": 50, "length": 1024},
+        {"type": "paragraph", "count": 50, "max_sentences": 100},
+    ):
+        assert client.post("/api/generate", json=request).status_code == 503
+        assert client.post("/api/generate", json={**request, "stream": True}).status_code == 503
+
+
+def test_large_batch_of_few_values_takes_a_slot(client, busy_server):
+    specs = [{"type": "password", "count": 10, "options": {"length": 1024}}]
+    assert client.post("/api/generate/batch", json={"specs": specs}).status_code == 503
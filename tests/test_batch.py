@@ -0,0 +1,85 @@
+import time
+
+import main
+
+
+def test_batch_returns_each_spec_by_key(client):
+    response = client.post("/api/generate/batch", json={"specs": [
+        {"type": "name", "count": 3},
+        {"type": "email", "count": 2, "options": {"domain": "acme"}},
+        {"key": "work_email", "type": "email", "count": 1, "options": {"domain": "corp"}},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results["name"]["data"]) == 3
+    assert all(v.endswith("@acme") for v in results["email"]["data"])
+    assert results["work_email"]["data"][0].endswith("@corp")
+
+
+def test_batch_of_more_large_specs_than_slots_succeeds(client):
+    specs = [{"key": f"spec{i}", "type": "email", "count": 500} for i in range(main.MAX_CONCURRENT_GENERATIONS + 2)]
+    response = client.post("/api/generate/batch", json={"specs": specs})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["success"], body["results"]
+    assert all(len(result["data"]) == 500 for result in body["results"].values())
+
+
+def test_batch_releases_its_slot(client):
+    specs = [{"key": f"spec{i}", "type": "uuid", "count": 500} for i in range(3)]
+    for _ in range(main.MAX_CONCURRENT_GENERATIONS + 1):
+        assert client.post("/api/generate/batch", json={"specs": specs}).status_code == 200
+
+
+def test_bad_spec_does_not_fail_the_rest(client):
+    response = client.post("/api/generate/batch", json={"specs": [
+        {"type": "name", "count": 2},
+        {"type": "nope", "count": 2},
+    ]})
+    body = response.json()
+    assert not body["success"]
+    assert len(body["results"]["name"]["data"]) == 2
+    assert body["results"]["nope"]["status"] == 400
+
+
+def test_seeded_batch_is_reproducible(client):
+    request = {"seed": 9, "specs": [{"type": "name", "count": 5}, {"type": "city", "count": 5}]}
+    first = client.post("/api/generate/batch", json=request).json()["results"]
+    assert client.post("/api/generate/batch", json=request).json()["results"] == first
+
+
+def test_request_fields_in_options_are_rejected(client):
+    options = [{"shards": 2}, {"stream": True}, {"profile": True}, {"count": 9}, {"type": "uuid"}]
+    specs = [{"key": f"spec{i}", "type": "name", "count": 2, "options": opts} for i, opts in enumerate(options)]
+    results = client.post("/api/generate/batch", json={"specs": specs}).json()["results"]
+    for i, opts in enumerate(options):
+        (name,) = opts
+        assert results[f"spec{i}"]["status"] == 400
+        assert name in results[f"spec{i}"]["error"]
+
+
+def test_seed_in_options_conflicts_with_batch_seed(client):
+    spec = {"type": "name", "count": 2, "options": {"seed": 1}}
+    assert "data" in client.post("/api/generate/batch", json={"specs": [spec]}).json()["results"]["name"]
+    result = client.post("/api/generate/batch", json={"seed": 9, "specs": [spec]}).json()["results"]["name"]
+    assert result["status"] == 400 and "seed" in result["error"]
+
+
+def test_batch_specs_run_concurrently(client, monkeypatch):
+    running, overlap, lock = [0], [0], main.threading.Lock()
+    generate_values = main.generate_values
+
+    def recording(*args):
+        with lock:
+            running[0] += 1
+            overlap[0] = max(overlap[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return generate_values(*args)
+
+    monkeypatch.setattr(main, "generate_values", recording)
+    specs = [{"key": f"spec{i}", "type": "uuid", "count": 500} for i in range(main.MAX_CONCURRENT_GENERATIONS)]
+    response = client.post("/api/generate/batch", json={"specs": specs})
+    assert response.json()["success"]
+    assert overlap[0] > 1
@@ -0,0 +1,89 @@
+import random
+
+import numpy as np
+import pytest
+
+import main
+from checksums import (
+    gs1_check_digit, gs1_check_digits, isbn10_check_char, isbn10_check_digits,
+    luhn_check_digit, luhn_check_digits,
+)
+from columns import as_list
+from conftest import generate
+
+
+# Reference validators, written straight from the specifications
+
+def luhn_valid(number):
+    total = 0
+    for i, c in enumerate(reversed(number)):
+        d = int(c) * (2 if i % 2 else 1)
+        total += d - 9 if d > 9 else d
+    return total % 10 == 0
+
+
+def gs1_valid(number):
+    return sum(int(c) * (3 if i % 2 else 1) for i, c in enumerate(reversed(number))) % 10 == 0
+
+
+def isbn10_valid(isbn):
+    return sum((10 - i) * (10 if c == "X" else int(c)) for i, c in enumerate(isbn)) % 11 == 0
+
+
+def digits_of(value):
+    return value.replace("-", "").replace(" ", "")
+
+
+def test_known_check_digits():
+    assert luhn_check_digit("7992739871") == 3
+    assert gs1_check_digit("400638133393") == 1
+    assert gs1_check_digit("03600029145") == 2
+    assert isbn10_check_char("030640615") == "2"
+    assert isbn10_check_char("080442957") == "X"
+
+
+def test_batch_check_digits_match_scalar_ones():
+    digits = np.random.default_rng(0).integers(0, 10, size=(500, 15))
+    payloads = ["".join(map(str, row)) for row in digits.tolist()]
+    assert luhn_check_digits(digits).tolist() == [luhn_check_digit(p) for p in payloads]
+    assert gs1_check_digits(digits).tolist() == [gs1_check_digit(p) for p in payloads]
+    checks = isbn10_check_digits(digits[:, :9].astype(np.uint8)).tolist()
+    assert ["X" if c == 10 else str(c) for c in checks] == [isbn10_check_char(p[:9]) for p in payloads]
+
+
+@pytest.fixture(params=["per_row", "batch"])
+def values(request):
+    """values(type_id, **options): 500 values from the per-row or the batch generator"""
+    def generate_values(type_id, **options):
+        rng = random.Random(1)
+        if request.param == "batch":
+            return as_list(main.compile_batch(type_id, options, rng)(500))
+        generate_value = main.compile_generator(type_id, options, rng)
+        return [generate_value() for _ in range(500)]
+    return generate_values
+
+
+@pytest.mark.parametrize("card_type", ["Random", "Visa", "Mastercard", "American Express"])
+def test_credit_cards_pass_luhn_unless_invalid(values, card_type):
+    assert all(luhn_valid(digits_of(v)) for v in values("credit_card", card_type=card_type, valid="valid"))
+    assert not any(luhn_valid(digits_of(v)) for v in values("credit_card", card_type=card_type, valid="invalid"))
+
+
+def test_imeis_pass_luhn_unless_invalid(values):
+    assert all(len(v) == 15 and luhn_valid(v) for v in values("imei", valid_checksum=True))
+    assert not any(luhn_valid(v) for v in values("imei", valid_checksum=False))
+
+
+@pytest.mark.parametrize("length", [8, 12, 13])
+def test_numeric_barcodes_carry_a_gs1_check_digit(values, length):
+    assert all(len(v) == length and gs1_valid(v) for v in values("barcode", length=length, numeric_only=True))
+
+
+def test_isbns_are_valid(values):
+    assert all(digits_of(v).startswith("978") and gs1_valid(digits_of(v)) for v in values("isbn", format="isbn13"))
+    assert all(len(digits_of(v)) == 10 and isbn10_valid(digits_of(v)) for v in values("isbn", format="isbn10"))
+
+
+def test_generated_credit_cards_validate(client):
+    cards = generate(client, type="credit_card", count=2000, seed=1, valid="valid")
+    assert all(luhn_valid(digits_of(v)) for v in cards)
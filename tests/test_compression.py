@@ -0,0 +1,22 @@
+import compression
+
+
+def test_wildcard_skips_refused_codings():
+    assert compression.negotiate("gzip;q=0, *", ("zstd", "gzip")) == "zstd"
+    assert compression.negotiate("gzip;q=0, *", ("gzip",)) is None
+    assert compression.negotiate("gzip; q=0, zstd;q=0, *;q=1", ("zstd", "gzip")) is None
+
+
+def test_named_and_wildcard_codings_are_allowed():
+    assert compression.negotiate("gzip, deflate", ("zstd", "gzip")) == "gzip"
+    assert compression.negotiate("*", ("zstd", "gzip")) == "zstd"
+    assert compression.negotiate("*;q=0", ("zstd", "gzip")) is None
+    assert compression.negotiate("", ("zstd", "gzip")) is None
+
+
+def test_responses_honour_refused_codings(client):
+    body = {"type": "email", "count": 500}
+    response = client.post("/api/generate", json=body, headers={"Accept-Encoding": "gzip;q=0, zstd;q=0, *"})
+    assert "content-encoding" not in response.headers
+    response = client.get("/api/types", headers={"Accept-Encoding": "gzip;q=0, zstd;q=0, *"})
+    assert "content-encoding" not in response.headers
@@ -0,0 +1,66 @@
+import csv
+import gzip
+import io
+import os
+import time
+
+import pytest
+
+import main
+from jobs import JobStore
+
+RECORDS = {"count": 5000, "seed": 1, "columns": [{"name": "email", "type": "email"}, {"name": "city", "type": "city"}]}
+
+
+@pytest.fixture
+def job_store(tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path), 1, 3600)
+    monkeypatch.setattr(main, "job_store", store)
+    yield store
+    store.shutdown()
+
+
+def wait_for(client, job_id, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        progress = client.get(f"/api/jobs/{job_id}").json()
+        if progress["status"] not in ("queued", "running"):
+            return progress
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_job_writes_the_records_file(client, job_store):
+    response = client.post("/api/jobs?format=csv", json=RECORDS)
+    assert response.status_code == 202
+    progress = wait_for(client, response.json()["id"])
+    assert progress["status"] == "done"
+    assert progress["rows_done"] == 5000 and progress["bytes"] > 0
+    download = client.get(response.json()["download_url"])
+    rows = list(csv.reader(io.StringIO(download.text)))
+    assert rows[0] == ["email", "city"] and len(rows) == 5001
+    records = client.post("/api/records", json=RECORDS).json()["data"]
+    assert [dict(zip(rows[0], row)) for row in rows[1:]] == records
+
+
+def test_gzipped_job(client, job_store):
+    job_id = client.post("/api/jobs?format=jsonl&gzip=true", json=RECORDS).json()["id"]
+    assert wait_for(client, job_id)["status"] == "done"
+    download = client.get(f"/api/jobs/{job_id}/download")
+    assert len(gzip.decompress(download.content).splitlines()) == 5000
+
+
+def test_deleting_a_finished_job_removes_it_and_its_file(client, job_store):
+    job_id = client.post("/api/jobs?format=csv", json=RECORDS).json()["id"]
+    assert wait_for(client, job_id)["status"] == "done"
+    path = job_store.jobs[job_id].path
+    response = client.delete(f"/api/jobs/{job_id}")
+    assert response.status_code == 200
+    assert response.json()["id"] == job_id
+    assert not os.path.exists(path)
+    assert client.get(f"/api/jobs/{job_id}").status_code == 404
+
+
+def test_unknown_job_is_404(client, job_store):
+    assert client.get("/api/jobs/nope").status_code == 404
+    assert client.delete("/api/jobs/nope").status_code == 404
@@ -0,0 +1,30 @@
+import random
+import re
+
+import pytest
+
+import main
+from columns import as_list
+
+
+def shapes(values):
+    return {re.sub(r"\d", "9", value) for value in values}
+
+
+@pytest.mark.parametrize("country", [*main.PHONE_FORMATS, "DE"])
+@pytest.mark.parametrize("include_code", [True, False])
+def test_batch_phones_follow_the_per_row_formats(country, include_code):
+    options = {"country": country, "include_code": include_code}
+    rng = random.Random(3)
+    per_row = main.compile_generator("phone", options, rng)
+    batch = main.compile_batch("phone", options, rng)
+    assert shapes(as_list(batch(2000))) == shapes(per_row() for _ in range(2000))
+
+
+def test_batch_phones_pick_up_new_countries(monkeypatch):
+    spec = {"format": "0{area}/{number}", "fields": {"area": range(30, 90), "number": range(100000, 1000000)}}
+    monkeypatch.setitem(main.PHONE_FORMATS, "DE", spec)
+    monkeypatch.setitem(main.PHONE_TEMPLATES, "DE", main.compile_locale_format(spec))
+    monkeypatch.setitem(main.PHONE_DIGIT_FORMATS, "DE", main.compile_digit_format(spec))
+    values = as_list(main.compile_batch("phone", {"country": "DE"}, random.Random(1))(1000))
+    assert all(re.fullmatch(r"\+49 0\d\d/\d{6}", value) for value in values)
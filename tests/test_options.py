@@ -0,0 +1,31 @@
+import pytest
+
+
+@pytest.mark.parametrize("fields", [
+    {"type": "password", "length": 2_000_000},
+    {"type": "password", "length": -1},
+    {"type": "barcode", "length": 65},
+    {"type": "paragraph", "max_sentences": 101},
+    {"type": "paragraph", "min_sentences": 101, "max_sentences": 101},
+    {"type": "paragraph", "min_sentences": 5, "max_sentences": 2},
+])
+def test_out_of_range_size_options_are_rejected(client, fields):
+    response = client.post("/api/generate", json={**fields, "count": 2})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("fields", [
+    {"type": "password", "length": 1024},
+    {"type": "password", "length": 0},
+    {"type": "barcode", "length": 64},
+    {"type": "paragraph", "min_sentences": 100, "max_sentences": 100},
+])
+def test_size_options_at_the_limit_are_accepted(client, fields):
+    response = client.post("/api/generate", json={**fields, "count": 2})
+    assert response.status_code == 200
+
+
+def test_limits_apply_to_record_columns(client):
+    response = client.post("/api/records", json={"count": 2, "columns": [{"name": "p", "type": "password", "options": {"length": 5000}}]})
+    assert response.status_code == 400
+    assert "length" in response.json()["detail"]
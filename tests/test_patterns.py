@@ -0,0 +1,79 @@
+import random
+import re
+
+import numpy as np
+import pytest
+
+from columns import as_list
+from conftest import generate
+from patterns import compile_pattern
+
+# Each template with the regular expression its values must match
+TEMPLATES = [
+    ("ORD-2024-#####-??", r"ORD-2024-\d{5}-[A-Z]{2}"),
+    ("@@@-^^^^", r"[a-z]{3}-[0-9a-f]{4}"),
+    ("[A-F0-9_]{8}", r"[A-F0-9_]{8}"),
+    ("(ORD|INV|CREDIT)-#{2,6}", r"(ORD|INV|CREDIT)-\d{2,6}"),
+    ("(A(B|CC)|#){3}", r"(A(B|CC)|\d){3}"),
+    ("\\#\\{#\\}\\\\", r"#\{\d\}\\"),
+    ("x{0,2}y{3}", r"x{0,2}yyy"),
+    ("[é-ë]{1,3}ü", r"[éêë]{1,3}ü"),
+    ("[-a]#", r"[-a]\d"),
+]
+
+
+@pytest.mark.parametrize("template, pattern", TEMPLATES)
+def test_per_row_values_match_the_template(template, pattern):
+    compiled = compile_pattern(template)
+    rng = random.Random(1)
+    assert all(re.fullmatch(pattern, compiled.generate(rng)) for _ in range(500))
+
+
+@pytest.mark.parametrize("template, pattern", TEMPLATES)
+def test_batch_values_match_the_template(template, pattern):
+    values = as_list(compile_pattern(template).batch(2000, np.random.default_rng(1)))
+    assert len(values) == 2000
+    assert all(re.fullmatch(pattern, value) for value in values)
+
+
+def test_variable_parts_cover_their_range():
+    values = set(as_list(compile_pattern("(ORD|INV)#{1,2}").batch(5000, np.random.default_rng(2))))
+    assert {len(v) for v in values} == {4, 5}
+    assert {v[:3] for v in values} == {"ORD", "INV"}
+
+
+def test_pattern_type_over_the_api(client):
+    values = generate(client, type="pattern", count=2000, seed=1, template="ID-#{4}")
+    assert all(re.fullmatch(r"ID-\d{4}", v) for v in values)
+    assert generate(client, type="pattern", count=5, seed=1, template="ID-#{4}") == values[:5]
+
+
+@pytest.mark.parametrize("fields", [{}, {"template": ""}])
+def test_default_template(client, fields):
+    assert all(re.fullmatch(r"ORD-\d{4}-[A-Z]{2}", v) for v in generate(client, type="pattern", count=10, **fields))
+
+
+@pytest.mark.parametrize("template, position, message", [
+    ("AB(CD", 5, "( without a closing )"),
+    ("AB)CD", 2, "unmatched )"),
+    ("#{3", 1, "{ without a closing }"),
+    ("#{x}", 1, "repeat count"),
+    ("#{5,2}", 1, "0 <= m <= n"),
+    ("[abc", 4, "[ without a closing ]"),
+    ("[]", 2, "empty character set"),
+    ("[z-a]", 2, "reversed"),
+    ("ab}", 3, "unexpected }"),
+    ("ab\\", 3, "\\ at the end"),
+])
+def test_malformed_templates_return_400_with_the_position(client, template, position, message):
+    response = client.post("/api/generate", json={"type": "pattern", "count": 5, "template": template})
+    assert response.status_code == 400
+    detail = response.json()["detail"]
+    assert f"position {position}:" in detail
+    assert message in detail
+
+
+@pytest.mark.parametrize("template", ["#" * 300, "#{256}#{256}#{256}#{256}#{256}"])
+def test_oversized_templates_are_rejected(client, template):
+    response = client.post("/api/generate", json={"type": "pattern", "count": 5, "template": template})
+    assert response.status_code == 400
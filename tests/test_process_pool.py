@@ -0,0 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import main
+
+
+def test_concurrent_first_use_creates_one_pool(monkeypatch):
+    created = []
+
+    class CountingPool:
+        def __init__(self, max_workers):
+            created.append(self)
+
+        def shutdown(self, cancel_futures=False):
+            pass
+
+    main.shutdown_process_pool()
+    monkeypatch.setattr(main, "ProcessPoolExecutor", CountingPool)
+    with ThreadPoolExecutor(max_workers=16) as threads:
+        pools = list(threads.map(lambda _: main.get_process_pool(), range(64)))
+    main.shutdown_process_pool()
+    assert len(created) == 1
+    assert all(pool is created[0] for pool in pools)
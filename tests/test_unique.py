@@ -0,0 +1,79 @@
+import pytest
+
+import main
+from conftest import generate
+from unique import FeistelPermutation, UniqueSpaceExhausted, iter_unique
+
+
+@pytest.mark.parametrize("fields", [
+    {"type": "zipcode", "from": 10, "to": 2000},
+    {"type": "email"},
+    {"type": "city", "country": "US"},
+    {"type": "country"},
+    {"type": "job"},
+    {"type": "company"},
+    {"type": "uuid"},
+    {"type": "name"},
+])
+def test_unique_values_are_distinct(client, fields):
+    space = main.UNIQUE_SPACES.get(fields["type"])
+    options = {k: v for k, v in fields.items() if k != "type"}
+    count = min(space(options)[0], 1500) if space else 500
+    values = generate(client, **fields, count=count, unique=True)
+    assert len(values) == count
+    assert len(set(values)) == count
+
+
+@pytest.mark.parametrize("fields", [
+    {"type": "zipcode", "from": 10, "to": 20},
+    {"type": "city", "country": "SG"},
+    {"type": "country"},
+    {"type": "job", "seniority": "senior"},
+    {"type": "company"},
+])
+def test_exhausting_an_enumerable_space_fails_at_once(client, fields, monkeypatch):
+    # Filtering would only give up after this many repeats; enumerable spaces never get that far
+    monkeypatch.setattr(main, "UNIQUE_MAX_RETRIES", 10 ** 9)
+    options = {k: v for k, v in fields.items() if k != "type"}
+    size = main.UNIQUE_SPACES[fields["type"]](options)[0]
+    assert len(generate(client, **fields, count=size, unique=True)) == size
+    response = client.post("/api/generate", json={**fields, "count": size + 1, "unique": True})
+    assert response.status_code == 400
+    assert str(size) in response.json()["detail"]
+
+
+def test_exhausting_a_filtered_space_returns_400(client, monkeypatch):
+    monkeypatch.setattr(main, "UNIQUE_MAX_RETRIES", 100)
+    # Sentences come from a few hundred word combinations, far fewer than 100000
+    response = client.post("/api/generate", json={"type": "sentence", "count": 100000, "unique": True})
+    assert response.status_code == 400
+
+
+def test_unique_shards_concatenate_to_the_whole(client):
+    fields = {"type": "email", "count": 3000, "seed": 5, "unique": True}
+    whole = generate(client, **fields)
+    assert sum([generate(client, **fields, shard=k, shards=2) for k in range(2)], []) == whole
+
+
+def test_feistel_permutation_is_a_bijection():
+    for size in (1, 2, 7, 1000, 4097):
+        permutation = FeistelPermutation(size, "key")
+        assert sorted(permutation.take(0, size)) == list(range(size))
+        assert permutation.take(size - 1, 1) == [permutation(size - 1)]
+    with pytest.raises(UniqueSpaceExhausted):
+        FeistelPermutation(10, "key").take(5, 6)
+
+
+class Collides(str):
+    """Distinct strings that all share one hash"""
+
+    def __hash__(self):
+        return 1
+
+
+def test_iter_unique_keeps_values_whose_hashes_collide():
+    values = [Collides("a"), Collides("b"), Collides("a"), Collides("c")]
+    distinct = iter_unique(lambda n: values, max_retries=10, batch_size=len(values))
+    assert [next(distinct) for _ in range(3)] == ["a", "b", "c"]
+    with pytest.raises(UniqueSpaceExhausted):
+        next(distinct)
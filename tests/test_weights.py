@@ -0,0 +1,100 @@
+import collections
+import math
+import random
+
+import pytest
+
+import main
+from columns import as_list
+from conftest import generate
+
+
+def probabilities(table):
+    """Exact probability of each index under an alias table"""
+    n = len(table.prob)
+    p = [prob / n for prob in table.prob]
+    for i, (prob, alias) in enumerate(zip(table.prob, table.alias)):
+        if alias != i:
+            p[alias] += (1 - prob) / n
+    return p
+
+
+def value_probabilities(values, table):
+    totals = collections.defaultdict(float)
+    for value, p in zip(values, probabilities(table)):
+        totals[value] += p
+    return totals
+
+
+def test_alias_table_matches_its_weights():
+    weights = [5, 0, 1, 3, 1]
+    table = main.AliasTable(weights)
+    for p, w in zip(probabilities(table), weights):
+        assert math.isclose(p, w / sum(weights))
+
+
+@pytest.mark.parametrize("distribution", ["zipf", "realistic"])
+def test_repeated_city_names_are_weighted_once(distribution):
+    cities = main.city_choices()
+    assert len(set(cities)) < len(cities)
+    distinct = list(dict.fromkeys(cities))
+    if distribution == "zipf":
+        expected = dict(zip(distinct, main.zipf_weights(len(distinct))))
+    else:
+        pack = main.WEIGHT_PACKS["realistic"]["city"]
+        expected = {city: pack.get(city, 0) for city in distinct}
+    total = sum(expected.values())
+    actual = value_probabilities(cities, main.choice_table("city", cities, {"distribution": distribution}))
+    for city in distinct:
+        assert math.isclose(actual[city], expected[city] / total, abs_tol=1e-12), city
+
+
+def test_weights_override_single_values():
+    table = main.choice_table("country", main.COUNTRIES_LIST, {"distribution": "uniform", "weights": {"Japan": 0, "Peru": 1000}})
+    actual = value_probabilities(main.COUNTRIES_LIST, table)
+    assert actual["Japan"] == 0
+    assert actual["Peru"] > 0.9
+
+
+@pytest.mark.parametrize("count", [50, 2000])
+def test_unknown_weight_keys_are_rejected(client, count):
+    response = client.post("/api/generate", json={"type": "city", "count": count, "country": "US", "weights": {"Chicgo": 5}})
+    assert response.status_code == 400
+    assert "Chicgo" in response.json()["detail"]
+
+
+def test_weights_must_be_numbers(client):
+    response = client.post("/api/generate", json={"type": "job", "count": 5, "weights": {main.JOB_TITLES[0]: "lots"}})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("exponent", [0, -1.5])
+def test_zipf_exponent_must_be_positive(client, exponent):
+    request = {"type": "country", "count": 5, "distribution": "zipf", "zipf_exponent": exponent}
+    response = client.post("/api/generate", json=request)
+    assert response.status_code == 400
+    assert "zipf_exponent" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("exponent", [math.nan, math.inf, "2"])
+def test_zipf_exponent_must_be_a_finite_number(exponent):
+    with pytest.raises(ValueError, match="zipf_exponent"):
+        main.choice_table("country", main.COUNTRIES_LIST, {"distribution": "zipf", "zipf_exponent": exponent})
+
+
+def test_unknown_distribution_is_rejected(client):
+    response = client.post("/api/generate", json={"type": "country", "count": 5, "distribution": "lumpy"})
+    assert response.status_code == 400
+
+
+def test_weighted_batches_follow_the_weights():
+    options = {"weights": {"Visa": 1, "Mastercard": 0, "American Express": 3}}
+    cards = as_list(main.compile_batch("credit_card", options, random.Random(1))(20000))
+    amex = sum(len(card) == 17 for card in cards)
+    assert not any(card.startswith(("5", "2")) for card in cards)
+    assert abs(amex / len(cards) - 0.75) < 0.02
+
+
+def test_uniform_output_is_unchanged_by_weights_support(client):
+    plain = generate(client, type="city", count=2000, seed=3)
+    assert generate(client, type="city", count=2000, seed=3, distribution="uniform") == plain
@@ -0,0 +1,100 @@
+import csv
+import io
+import json
+import sqlite3
+import sys
+
+import pytest
+
+import cli
+
+COLUMNS = [
+    {"name": "email", "type": "email"},
+    {"name": "city", "type": "city"},
+    # Backslashes, tabs and quotes must survive COPY escaping and SQL quoting
+    {"name": "code", "type": "pattern", "options": {"template": "a\\\\b\t'#\"(x|y)"}},
+]
+RECORDS = {"count": 3000, "seed": 11, "columns": COLUMNS}
+
+
+@pytest.fixture
+def expected(client):
+    response = client.post("/api/records", json=RECORDS)
+    assert response.status_code == 200
+    return [tuple(row[c["name"]] for c in COLUMNS) for row in response.json()["data"]]
+
+
+def unescape_copy(field):
+    if field == "\\N":
+        return None
+    escapes = {"\\": "\\", "t": "\t", "n": "\n", "r": "\r"}
+    out, chars = [], iter(field)
+    for c in chars:
+        out.append(escapes[next(chars)] if c == "\\" else c)
+    return "".join(out)
+
+
+def read_copy(text):
+    return [tuple(map(unescape_copy, line.split("\t"))) for line in text.splitlines()]
+
+
+def read_sqlite(path, table="test_data"):
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute(f'SELECT * FROM "{table}" ORDER BY rowid').fetchall()
+    finally:
+        connection.close()
+
+
+def test_sqlite_export_loads(client, expected, tmp_path):
+    response = client.post("/api/records?format=sqlite&table=people", json=RECORDS)
+    assert response.status_code == 200
+    path = tmp_path / "people.db"
+    path.write_bytes(response.content)
+    assert read_sqlite(path, "people") == expected
+
+
+def test_copy_export_round_trips(client, expected):
+    response = client.post("/api/records?format=copy", json=RECORDS)
+    assert read_copy(response.text) == expected
+
+
+def test_csv_export_round_trips(client, expected):
+    response = client.post("/api/records?format=csv", json=RECORDS)
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == [c["name"] for c in COLUMNS]
+    assert [tuple(row) for row in rows[1:]] == expected
+
+
+def run_cli(monkeypatch, *args):
+    monkeypatch.setattr(sys, "argv", ["cli.py", *map(str, args)])
+    cli.main()
+
+
+@pytest.fixture
+def schema(tmp_path):
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps(RECORDS))
+    return path
+
+
+def test_cli_writes_sqlite(monkeypatch, schema, expected, tmp_path):
+    out = tmp_path / "out.db"
+    run_cli(monkeypatch, "--schema", schema, "--out", out)
+    assert read_sqlite(out) == expected
+
+
+def test_cli_writes_copy(monkeypatch, schema, expected, tmp_path):
+    out = tmp_path / "out.copy"
+    run_cli(monkeypatch, "--schema", schema, "--out", out)
+    assert read_copy(out.read_text()) == expected
+
+
+def test_cli_refuses_to_overwrite_without_force(monkeypatch, schema, expected, tmp_path):
+    out = tmp_path / "out.db"
+    out.write_bytes(b"keep me")
+    with pytest.raises(SystemExit):
+        run_cli(monkeypatch, "--schema", schema, "--out", out)
+    assert out.read_bytes() == b"keep me"
+    run_cli(monkeypatch, "--schema", schema, "--out", out, "--force")
+    assert read_sqlite(out) == expected
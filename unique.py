@@ -0,0 +1,93 @@
+"""
+Unique value generation
+
+Two strategies, picked per type by the caller:
+
+- FeistelPermutation maps row positions onto a bounded value space one-to-one,
+  so row i's value depends only on i and distinctness costs no memory at all.
+- iter_unique filters an ordinary value stream through a set of the values seen
+  so far, for types whose value space cannot be enumerated.
+"""
+
+import hashlib
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; permutations fall back to a per-index loop
+    np = None
+
+FEISTEL_ROUNDS = 4
+_MASK64 = (1 << 64) - 1
+_GOLDEN64 = 0x9E3779B97F4A7C15
+
+
+class UniqueSpaceExhausted(ValueError):
+    """Raised when no further distinct values can be generated"""
+
+
+class FeistelPermutation:
+    """Keyed bijection on range(size)
+
+    A balanced Feistel network permutes the smallest even-width power of two
+    that covers size; results outside the range are fed through again (cycle
+    walking) until they land inside it, which keeps the mapping one-to-one.
+    """
+
+    def __init__(self, size, key):
+        if size > 1 << 64:
+            raise ValueError("Value space is too large to permute")
+        self.size = size
+        self.half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self.half_mask = (1 << self.half_bits) - 1
+        self.round_keys = [
+            int.from_bytes(hashlib.blake2b(f"{key}:{r}".encode(), digest_size=8).digest(), "big")
+            for r in range(FEISTEL_ROUNDS)
+        ]
+
+    def _permute(self, x):
+        # Works on Python ints and on NumPy uint64 arrays alike
+        left, right = x >> self.half_bits, x & self.half_mask
+        for k in self.round_keys:
+            mixed = ((right ^ k) * _GOLDEN64 & _MASK64) >> (64 - self.half_bits)
+            left, right = right, left ^ mixed
+        return (left << self.half_bits) | right
+
+    def __call__(self, index):
+        x = self._permute(index)
+        while x >= self.size:
+            x = self._permute(x)
+        return x
+
+    def take(self, start, n):
+        """Permuted values of positions start .. start + n - 1, as a list of ints"""
+        if start + n > self.size:
+            raise UniqueSpaceExhausted(f"Only {self.size} unique values exist")
+        if np is None:
+            return [self(i) for i in range(start, start + n)]
+        x = self._permute(np.arange(start, start + n, dtype=np.uint64))
+        outside = x >= self.size
+        while outside.any():
+            x[outside] = self._permute(x[outside])
+            outside = x >= self.size
+        return x.tolist()
+
+
+def iter_unique(draw, max_retries, batch_size=1024):
+    """Yield the distinct values of an endless draw(n) stream, in order
+
+    Values themselves are kept, not their hashes, so two distinct values that
+    happen to hash alike are both yielded. After max_retries duplicates in a row
+    the space is treated as used up and UniqueSpaceExhausted is raised.
+    """
+    seen = set()
+    misses = 0
+    while True:
+        for value in draw(batch_size):
+            if value in seen:
+                misses += 1
+                if misses > max_retries:
+                    raise UniqueSpaceExhausted(f"Could not generate more than {len(seen)} unique values")
+                continue
+            seen.add(value)
+            misses = 0
+            yield value